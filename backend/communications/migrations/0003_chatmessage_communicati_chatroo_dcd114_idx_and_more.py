@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('communications', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='chatmessage',
+            index=models.Index(fields=['chatroom', 'created_at'], name='communicati_chatroo_dcd114_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['thread', 'created_at'], name='communicati_thread__b19666_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-19 08:30
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('communications', '0003_chatmessage_communicati_chatroo_dcd114_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='chatmessage',
+            index=models.Index(fields=['created_at'], name='communicati_created_bd8432_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['created_at'], name='communicati_created_a4ebd4_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='supportchatmessage',
+            index=models.Index(fields=['created_at'], name='communicati_created_ebccc9_idx'),
+        ),
+    ]
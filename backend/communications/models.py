@@ -18,6 +18,10 @@ class ChatMessage(TimeStampedModel):
 
     class Meta:
         ordering = ["created_at"]
+        indexes = [
+            models.Index(fields=["created_at"]),
+            models.Index(fields=["chatroom", "created_at"]),
+        ]
 
     def __str__(self):
         return f"Message by {self.author_user.username} in {self.chatroom.unit.title}"
@@ -59,6 +63,10 @@ class Message(TimeStampedModel):
 
     class Meta:
         ordering = ["created_at"]
+        indexes = [
+            models.Index(fields=["created_at"]),
+            models.Index(fields=["thread", "created_at"]),
+        ]
 
 
 class SupportChatSession(TimeStampedModel):
@@ -77,3 +85,4 @@ class SupportChatMessage(TimeStampedModel):
 
     class Meta:
         ordering = ["created_at"]
+        indexes = [models.Index(fields=["created_at"])]
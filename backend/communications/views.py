@@ -25,6 +25,8 @@ class CourseChatroomViewSet(viewsets.ReadOnlyModelViewSet):
 class ChatMessageViewSet(viewsets.ModelViewSet):
     queryset = ChatMessage.objects.all()
     serializer_class = ChatMessageSerializer
+    page_size = 100
+    max_page_size = 500
 
     def perform_create(self, serializer):
         serializer.save(author_user=self.request.user)
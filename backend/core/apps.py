@@ -9,3 +9,6 @@ class CoreConfig(AppConfig):
         # Register signal handlers
         from . import audit  # noqa: F401
         from . import auth_signals  # noqa: F401
+        from .catalogue import connect_signals
+
+        connect_signals()
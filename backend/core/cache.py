@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from django.core.cache import cache
+
+DEFAULT_TIMEOUT = 300
+
+
+def _version_key(namespace: str, scope) -> str:
+    return f"{namespace}:version:{scope}"
+
+
+def get_version(namespace: str, scope) -> int:
+    """Current version counter for a cache namespace/scope pair."""
+    key = _version_key(namespace, scope)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, 1, timeout=None)
+        version = cache.get(key, 1)
+    return version
+
+
+def bump_version(namespace: str, scope) -> None:
+    """
+    Invalidate every entry cached under the namespace/scope by moving its
+    version counter forward; stale entries simply expire.
+    """
+    key = _version_key(namespace, scope)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 2, timeout=None)
+
+
+def versioned_key(namespace: str, scope, *parts) -> str:
+    suffix = ":".join(str(part) for part in parts)
+    return f"{namespace}:{scope}:v{get_version(namespace, scope)}:{suffix}"
@@ -0,0 +1,126 @@
+"""
+Two-tier cache for near-static catalogue data (programmes, curriculum units,
+term offerings, departments, resource tags, fee structures).
+
+Entries live in a small per-process LRU in front of the shared ``default``
+cache (Redis when ``REDIS_URL`` is set). Keys carry the version counter of
+every model they were built from; a save or delete of any catalogue row
+bumps that model's counter, so invalidation is a single increment that every
+worker sees on its next read, and superseded entries simply age out.
+"""
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from .cache import DEFAULT_TIMEOUT, _version_key, bump_version
+
+NAMESPACE = "catalogue"
+CATALOGUE_MODELS = (
+    "learning.Programme",
+    "learning.CurriculumUnit",
+    "learning.TermOffering",
+    "core.Department",
+    "repository.ResourceTag",
+    "finance.FeeStructure",
+)
+
+MISSING = object()
+
+
+class LocalLRU:
+    """Thread-safe, size-bounded in-process cache; the least recently used entry is dropped first."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=MISSING):
+        with self._lock:
+            if key not in self._entries:
+                return default
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def set(self, key, value) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+local_cache = LocalLRU(getattr(settings, "CATALOGUE_LOCAL_CACHE_SIZE", 512))
+
+
+def _label(model) -> str:
+    return model if isinstance(model, str) else model._meta.label
+
+
+def catalogue_versions(models) -> tuple:
+    """Current version of each model's catalogue entries, read from the shared tier in one round trip."""
+    labels = [_label(model) for model in models]
+    keys = {label: _version_key(NAMESPACE, label) for label in labels}
+    found = cache.get_many(list(keys.values()))
+    versions = []
+    for label in labels:
+        version = found.get(keys[label])
+        if version is None:
+            cache.add(keys[label], 1, timeout=None)
+            version = cache.get(keys[label], 1)
+        versions.append(version)
+    return tuple(versions)
+
+
+def catalogue_key(models, *parts) -> str:
+    versions = ".".join(f"{_label(model)}={version}" for model, version in zip(models, catalogue_versions(models)))
+    suffix = ":".join(str(part) for part in parts)
+    return f"{NAMESPACE}:{versions}:{suffix}"
+
+
+def catalogue_get(key, default=MISSING):
+    """Reads ``key`` from the local LRU, then the shared cache (refilling the LRU on a shared hit)."""
+    value = local_cache.get(key)
+    if value is not MISSING:
+        return value
+    value = cache.get(key, MISSING)
+    if value is MISSING:
+        return default
+    local_cache.set(key, value)
+    return value
+
+
+def catalogue_set(key, value, timeout: int = DEFAULT_TIMEOUT) -> None:
+    cache.set(key, value, timeout)
+    local_cache.set(key, value)
+
+
+def invalidate_catalogue(model) -> None:
+    """Drops every cached entry built from ``model`` on every worker."""
+    bump_version(NAMESPACE, _label(model))
+
+
+def _invalidate(sender, **kwargs):
+    # After commit, so a concurrent read cannot cache pre-change rows under the new version.
+    transaction.on_commit(lambda: invalidate_catalogue(sender))
+
+
+def connect_signals() -> None:
+    for label in CATALOGUE_MODELS:
+        model = apps.get_model(label)
+        post_save.connect(_invalidate, sender=model, dispatch_uid=f"catalogue-save-{label}")
+        post_delete.connect(_invalidate, sender=model, dispatch_uid=f"catalogue-delete-{label}")
@@ -1,10 +1,22 @@
 from __future__ import annotations
 
+import re
+
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
 from django.utils.deprecation import MiddlewareMixin
 
 from . import state
 from .audit import log_api_request
 
+try:  # optional dependency
+    import brotli
+except ImportError:  # pragma: no cover - exercised only without brotli installed
+    brotli = None
+
+re_accepts_brotli = re.compile(r"\bbr\b")
+
 
 class RequestAuditMiddleware(MiddlewareMixin):
     def process_request(self, request):
@@ -32,3 +44,40 @@ class RequestAuditMiddleware(MiddlewareMixin):
     def process_exception(self, request, exception):
         state.clear()
         return None
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    Compresses responses of at least ``RESPONSE_COMPRESSION_MIN_BYTES``
+    (default 1 KiB): brotli when the client accepts it and the ``brotli``
+    package is installed, gzip otherwise. Smaller bodies are sent as they
+    are since the framing overhead outweighs the saving.
+
+    Brotli output cannot carry the random padding Django adds to gzip
+    against BREACH, so requests that send cookies (the credentials a
+    cross-site attacker can ride on) always get gzip. Bearer-token and
+    anonymous requests may use brotli.
+    """
+
+    def process_response(self, request, response):
+        min_bytes = getattr(settings, "RESPONSE_COMPRESSION_MIN_BYTES", 1024)
+        if not response.streaming and len(response.content) < min_bytes:
+            return response
+        if response.has_header("Content-Encoding"):
+            return response
+
+        accepts = request.META.get("HTTP_ACCEPT_ENCODING", "")
+        if brotli is None or response.streaming or request.COOKIES or not re_accepts_brotli.search(accepts):
+            return super().process_response(request, response)
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        compressed = brotli.compress(response.content, quality=getattr(settings, "BROTLI_QUALITY", 5))
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response.headers["Content-Length"] = str(len(compressed))
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = "br"
+        return response
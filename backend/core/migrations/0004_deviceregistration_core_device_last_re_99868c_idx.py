@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 08:30
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_processingwatermark'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='deviceregistration',
+            index=models.Index(fields=['last_registered_at'], name='core_device_last_re_99868c_idx'),
+        ),
+    ]
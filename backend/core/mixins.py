@@ -1,4 +1,13 @@
-from django.core.exceptions import FieldError
+import hashlib
+
+from django.core.exceptions import FieldError, ValidationError
+from django.db.models import Count, Max
+from django.http import Http404
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+from .catalogue import MISSING, catalogue_get, catalogue_key, catalogue_set
 
 
 def _model_has_field(model, field_name: str) -> bool:
@@ -89,6 +98,112 @@ def scope_queryset_to_user(user, qs, *, view=None):
     return filtered_qs if filtered_qs is not None else qs
 
 
+class SparseFieldsViewMixin:
+    """
+    Narrows list and detail querysets to the fields a SparseFieldsMixin
+    serializer will render for this request's ``?fields``/``?expand``.
+    """
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+        if getattr(self, "action", None) in ("list", "retrieve"):
+            qs = self.get_serializer().prepare_queryset(qs)
+        return qs
+
+
+class CatalogueCacheMixin:
+    """
+    Serves list and detail responses of catalogue viewsets from the catalogue
+    cache (see ``core.catalogue``). Entries are keyed by the request URL and
+    the versions of ``catalogue_models``, so any save or delete of those
+    models refreshes them; only successful responses are cached.
+    """
+
+    catalogue_models = ()
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(lambda: super(CatalogueCacheMixin, self).list(request, *args, **kwargs))
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(lambda: super(CatalogueCacheMixin, self).retrieve(request, *args, **kwargs))
+
+    def cached_response(self, respond, models=None):
+        key = catalogue_key(
+            models or self.catalogue_models,
+            type(self).__name__,
+            self.action,
+            self.request.get_host(),
+            self.request.get_full_path(),
+        )
+        data = catalogue_get(key)
+        if data is not MISSING:
+            return Response(data)
+        response = respond()
+        if response.status_code == 200:
+            catalogue_set(key, response.data)
+        return response
+
+
+class ConditionalGetMixin:
+    """
+    ETag/Last-Modified for read-heavy list and detail endpoints.
+
+    The validators come from one ``Max(updated_at)``/``Count`` aggregate over
+    the (filtered) queryset, so an unchanged resource is answered with 304
+    before any row is loaded or serialised. Count catches deletions that the
+    timestamp alone would miss. ``last_modified_related`` names timestamps of
+    related rows the response also renders (e.g. ``"tags__updated_at"``), so
+    editing those moves the validators too. Other actions can use
+    ``conditional_response`` with their own queryset.
+    """
+
+    last_modified_field = "updated_at"
+    last_modified_related = ()
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            self.filter_queryset(self.get_queryset()), lambda: super(ConditionalGetMixin, self).list(request, *args, **kwargs)
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset()).filter(**{self.lookup_field: self.lookup_value()})
+        return self.conditional_response(
+            queryset, lambda: super(ConditionalGetMixin, self).retrieve(request, *args, **kwargs)
+        )
+
+    def lookup_value(self):
+        """The URL lookup converted to the lookup field's type; 404 when it cannot be, as ``get_object()`` would."""
+        model = self.get_queryset().model
+        field = model._meta.pk if self.lookup_field == "pk" else model._meta.get_field(self.lookup_field)
+        try:
+            return field.to_python(self.kwargs[self.lookup_url_kwarg or self.lookup_field])
+        except (TypeError, ValueError, ValidationError):
+            raise Http404
+
+    def conditional_response(self, queryset, respond):
+        """Returns 304 when the client's validators still match ``queryset``, else ``respond()`` with validators set."""
+        related = {f"related_{index}": Max(field) for index, field in enumerate(self.last_modified_related)}
+        stats = queryset.order_by().aggregate(
+            changed=Max(self.last_modified_field), total=Count("pk", distinct=bool(related)), **related
+        )
+        changed = max((stats[name] for name in ("changed", *related) if stats[name]), default=None)
+        digest = hashlib.md5(
+            f"{self.request.get_full_path()}|{stats['total']}|{changed.isoformat() if changed else ''}".encode(),
+            usedforsecurity=False,
+        ).hexdigest()
+        etag = f'"{digest}"'
+        last_modified = changed.timestamp() if changed else None
+
+        response = get_conditional_response(self.request._request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = respond()
+        if response.status_code in (200, 304):
+            response["ETag"] = etag
+            if last_modified is not None:
+                response["Last-Modified"] = http_date(last_modified)
+        return response
+
+
 class ScopedListMixin:
     """
     Apply per-user scoping to list endpoints. Combine with object-level permissions.
@@ -90,7 +90,20 @@ class DeviceRegistration(TimeStampedModel):
 
     class Meta:
         ordering = ["-last_registered_at"]
-        indexes = [models.Index(fields=["user", "platform"])]
+        indexes = [models.Index(fields=["user", "platform"]), models.Index(fields=["last_registered_at"])]
 
     def __str__(self):
         return f"{self.user_id} - {self.platform}"
+
+
+class ProcessingWatermark(models.Model):
+    """
+    Highest source row id consumed by a named incremental processor, advanced
+    in the same transaction as the work it covers so reruns are idempotent.
+    """
+    name = models.CharField(max_length=100, unique=True)
+    last_id = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} @ {self.last_id}"
@@ -0,0 +1,181 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import OrderingFilter
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+class StandardResultsSetPagination(PageNumberPagination):
+    """
+    Offset (page number) pagination. Only for views whose clients need to
+    jump to an arbitrary page; everything else uses ``KeysetPagination``.
+    """
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 200
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor (keyset) pagination, the default for every list endpoint. Pages
+    are fetched with ``WHERE <ordering field> < cursor`` instead of OFFSET,
+    so deep pages cost the same as the first and rows inserted meanwhile do
+    not shift pages.
+
+    The ordering is the view's ``ordering`` (or the one OrderingFilter
+    resolves), else the queryset's own ``order_by``, else the model's
+    ``Meta.ordering``, and finally ``-pk``; it is kept as resolved, and the
+    primary key is appended as a tie-breaker so pages are deterministic.
+    Only when the leading field cannot hold a cursor (a related path or a
+    nullable column) does paging fall back to the primary key. Client
+    orderings are limited to indexed columns by ``IndexedOrderingFilter``.
+    Views may cap pages with ``page_size`` and ``max_page_size`` attributes.
+    """
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 200
+    ordering = "-pk"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = getattr(view, "page_size", None) or type(self).page_size
+        self.max_page_size = getattr(view, "max_page_size", None) or type(self).max_page_size
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_ordering(self, request, queryset, view):
+        ordering = None
+        if view is not None and any(
+            issubclass(backend, OrderingFilter) for backend in getattr(view, "filter_backends", ())
+        ):
+            ordering = self._filter_ordering(request, queryset, view)
+        if not ordering and view is not None:
+            ordering = getattr(view, "ordering", None)
+        if not ordering:
+            ordering = queryset.query.order_by or queryset.model._meta.ordering
+        if isinstance(ordering, str):
+            ordering = (ordering,)
+        return self._stable(queryset, tuple(ordering or ()))
+
+    def _filter_ordering(self, request, queryset, view):
+        for backend in view.filter_backends:
+            if issubclass(backend, OrderingFilter):
+                ordering = backend().get_ordering(request, queryset, view)
+                # OrderingFilter falls back to every serializer field; only
+                # honour an ordering the client or the view actually chose.
+                if ordering and (request.query_params.get(backend.ordering_param) or getattr(view, "ordering", None)):
+                    return ordering
+        return None
+
+    def _stable(self, queryset, ordering):
+        model = queryset.model
+        if not ordering or not isinstance(ordering[0], str):
+            return (self.ordering,)
+        ordering = tuple(_cursor_name(model, item) for item in ordering)
+        first = ordering[0]
+        tie_break = "-pk" if first.startswith("-") else "pk"
+        if not _is_cursor_field(model, first.lstrip("-")):
+            # A related path or nullable column cannot hold a cursor position.
+            return (tie_break,)
+        if any(item.lstrip("-") in ("pk", model._meta.pk.name) for item in ordering):
+            return ordering
+        return (*ordering, tie_break)
+
+
+class IndexedOrderingFilter(OrderingFilter):
+    """
+    OrderingFilter that only offers orderings an index can serve (see
+    ``_is_indexed``), so keyset pages stay cheap at any depth, and rejects
+    anything else in ``?ordering=`` with 400 instead of ignoring it.
+    """
+
+    def get_valid_fields(self, queryset, view, context=None):
+        filtered = _equality_filters(queryset)
+        return [
+            (name, label)
+            for name, label in super().get_valid_fields(queryset, view, context or {})
+            if _is_indexed(queryset.model, name, filtered)
+        ]
+
+    def get_ordering(self, request, queryset, view):
+        params = request.query_params.get(self.ordering_param)
+        if params:
+            valid = {name for name, _ in self.get_valid_fields(queryset, view, {"request": request})}
+            unsupported = [term for term in (part.strip() for part in params.split(",")) if term.lstrip("-") not in valid]
+            if unsupported:
+                raise ValidationError({
+                    self.ordering_param: f"Unsupported ordering {', '.join(unsupported)}; "
+                    f"expected one of: {', '.join(sorted(valid)) or 'none'}."
+                })
+        return super().get_ordering(request, queryset, view)
+
+
+def _cursor_name(model, item):
+    """Foreign keys order and compare by their column (``goal_id``), which is also what a cursor can store."""
+    name = item.lstrip("-")
+    try:
+        field = model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return item
+    if getattr(field, "concrete", False) and field.many_to_one:
+        return item[: len(item) - len(name)] + field.attname
+    return item
+
+
+def _is_cursor_field(model, name) -> bool:
+    if name == "pk":
+        return True
+    if "__" in name or "?" in name:
+        return False
+    try:
+        field = model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return False
+    return getattr(field, "concrete", False) and not field.null and not field.many_to_many
+
+
+def _equality_filters(queryset) -> set:
+    """Names of the local fields ``queryset`` pins to one value with ANDed ``exact`` lookups."""
+    names = set()
+    nodes = [queryset.query.where]
+    while nodes:
+        node = nodes.pop()
+        if getattr(node, "negated", False):
+            continue
+        if hasattr(node, "children"):
+            if node.connector == "AND":
+                nodes.extend(node.children)
+            continue
+        target = getattr(getattr(node, "lhs", None), "target", None)
+        if getattr(node, "lookup_name", None) == "exact" and target is not None and target.model is queryset.model:
+            names.add(target.name)
+    return names
+
+
+def _index_columns(model):
+    """Column lists of every index on the model, unique ones included."""
+    meta = model._meta
+    yield from (index.fields for index in meta.indexes)
+    yield from meta.unique_together
+    yield from (constraint.fields for constraint in meta.constraints if getattr(constraint, "fields", None))
+
+
+def _is_indexed(model, name, filtered=()) -> bool:
+    """
+    True when ``name`` is a local, non-null column an index can walk in
+    order: the pk, a unique, indexed or foreign key column, or one preceded
+    in a composite index only by foreign keys that the queryset filters on
+    with equality (``filtered``), as the per-owner lists do.
+    """
+    if not _is_cursor_field(model, name):
+        return False
+    if name == "pk":
+        return True
+    field = model._meta.get_field(name)
+    if field.primary_key or field.unique or field.db_index:
+        return True
+    for index in _index_columns(model):
+        columns = [model._meta.get_field(column.lstrip("-")).name for column in index]
+        if field.name in columns and all(
+            model._meta.get_field(column).is_relation and column in filtered
+            for column in columns[: columns.index(field.name)]
+        ):
+            return True
+    return False
@@ -1,5 +1,7 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
 from core.models import CalendarEvent, Department, DeviceRegistration
 from users.models import HOD
 
@@ -42,4 +44,118 @@ class CalendarEventSerializer(serializers.ModelSerializer):
 class DeviceRegistrationSerializer(serializers.ModelSerializer):
     class Meta:
         model = DeviceRegistration
-        fields = ["platform", "push_token", "app_id"]
\ No newline at end of file
+        fields = ["platform", "push_token", "app_id"]
+
+class SparseFieldsMixin:
+    """
+    Lets clients ask for less: ``?fields=id,title`` keeps only those fields
+    and ``?expand=user`` picks which relations in ``Meta.expandable_fields``
+    are nested in full; the others collapse to primary keys. Without
+    ``?expand`` the relations in ``Meta.default_expand`` stay nested, so
+    existing clients get the same payload.
+
+    ``expandable_fields`` maps a field to how its relation is loaded,
+    ``"select"`` or ``"prefetch"``. ``method_field_sources`` lists the model
+    paths each SerializerMethodField reads (empty for annotations); a kept
+    method field without an entry disables ``only()``.
+
+    Only the top-level serializer built with a request in its context reads
+    the parameters; nested serializers render as declared.
+    """
+
+    fields_param = "fields"
+    expand_param = "expand"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        meta = getattr(self, "Meta", None)
+        expandable = getattr(meta, "expandable_fields", {})
+        request = kwargs.get("context", {}).get("request")
+        params = getattr(request, "query_params", {})
+
+        self.expanded = set(getattr(meta, "default_expand", ()))
+        if self.expand_param in params:
+            self.expanded = set(_split(params[self.expand_param])) & set(expandable)
+        requested = _split(params.get(self.fields_param, ""))
+        if requested:
+            for name in set(self.fields) - set(requested):
+                self.fields.pop(name)
+
+        for name, loading in expandable.items():
+            if name in self.fields and name not in self.expanded:
+                source = self.fields[name].source
+                self.fields[name] = serializers.PrimaryKeyRelatedField(
+                    read_only=True, many=loading == "prefetch", **({"source": source} if source != name else {})
+                )
+
+    def wants(self, name: str) -> bool:
+        """True when ``name`` is in the output (and, for relations, expanded)."""
+        if name not in self.fields:
+            return False
+        return name in self.expanded or name not in getattr(self.Meta, "expandable_fields", {})
+
+    def prepare_queryset(self, queryset, prefetches=None):
+        """
+        Loads what the kept fields need and nothing else: ``only()`` over
+        their columns, ``select_related`` for followed foreign keys and
+        ``prefetch_related`` for to-many relations (``prefetches`` supplies
+        a custom Prefetch per expanded relation; collapsed ones fetch ids).
+        """
+        meta = self.Meta
+        model = queryset.model
+        expandable = getattr(meta, "expandable_fields", {})
+        method_sources = getattr(meta, "method_field_sources", {})
+        prefetches = prefetches or {}
+        columns, selects, restrict = set(), set(), True
+
+        for name, field in self.fields.items():
+            if isinstance(field, serializers.SerializerMethodField):
+                if name not in method_sources:
+                    restrict = False
+                paths = [path.replace(".", "__") for path in method_sources.get(name, ())]
+            elif field.source == "*":
+                restrict = False
+                continue
+            else:
+                paths = [field.source.replace(".", "__")]
+
+            for path in paths:
+                head, _, rest = path.partition("__")
+                loading = expandable.get(head)
+                if loading == "prefetch" or _is_to_many(model, head):
+                    if name in self.expanded:
+                        queryset = queryset.prefetch_related(prefetches.get(head, head))
+                    else:
+                        queryset = queryset.prefetch_related(_id_prefetch(model, head))
+                    continue
+                columns.add(path)
+                relation = path.rpartition("__")[0]
+                if relation:
+                    selects.add(relation)
+                elif loading == "select" and name in self.expanded:
+                    selects.add(path)
+
+        if selects:
+            queryset = queryset.select_related(*selects)
+        if restrict:
+            queryset = queryset.only(*columns)
+        return queryset
+
+
+def _split(value: str) -> list:
+    return [part.strip() for part in value.split(",") if part.strip()]
+
+
+def _is_to_many(model, name) -> bool:
+    try:
+        field = model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return False
+    return field.is_relation and (field.one_to_many or field.many_to_many)
+
+
+def _id_prefetch(model, name):
+    """Prefetch of just the related primary keys (plus the join column for reverse foreign keys)."""
+    field = model._meta.get_field(name)
+    columns = ["pk", field.field.attname] if field.one_to_many else ["pk"]
+    return Prefetch(name, queryset=field.related_model.objects.only(*columns))
@@ -1,13 +1,16 @@
 from .calendar import (
     upsert_calendar_event,
+    upsert_calendar_events,
     upsert_calendar_events_for_users,
     remove_calendar_events_for_source,
 )
-from .notifications import notify_users
+from .notifications import notify_each, notify_users
 
 __all__ = [
     "upsert_calendar_event",
+    "upsert_calendar_events",
     "upsert_calendar_events_for_users",
     "remove_calendar_events_for_source",
+    "notify_each",
     "notify_users",
 ]
@@ -86,5 +86,28 @@ def upsert_calendar_events_for_users(
     return events
 
 
+def upsert_calendar_events(events: Iterable[CalendarEvent], batch_size: int = 500) -> int:
+    """
+    Bulk counterpart of ``upsert_calendar_event`` for unsaved CalendarEvent
+    instances: inserts or, on an (owner, source) conflict, overwrites each
+    event with one statement per ``batch_size`` rows. Returns the row count.
+    """
+    events = [event for event in events if event.owner_user_id]
+    for event in events:
+        event.source_id = str(event.source_id)
+        event.start_at = _normalize_datetime(event.start_at)
+        event.end_at = _normalize_datetime(event.end_at) if event.end_at else event.start_at + timedelta(minutes=30)
+    CalendarEvent.objects.bulk_create(
+        events,
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=["owner_user", "source_type", "source_id"],
+        update_fields=[
+            "title", "description", "start_at", "end_at", "timezone_hint", "metadata", "is_active", "updated_at",
+        ],
+    )
+    return len(events)
+
+
 def remove_calendar_events_for_source(source_type: str, source_id: str):
     CalendarEvent.objects.filter(source_type=source_type, source_id=str(source_id)).delete()
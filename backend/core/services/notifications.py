@@ -1,23 +1,36 @@
 from typing import Iterable
 
+from django.utils import timezone
+
 from notifications.models import Notification
 
 
-def notify_users(users: Iterable, title: str, body: str, kind: str = "info"):
-    payload = []
+def notify_users(users: Iterable, title: str, body: str, kind: str = "info", data: dict = None):
+    """Queues one in-app notification per distinct user with a single insert."""
     seen = set()
+    messages = []
     for user in users:
         user_id = getattr(user, "id", None)
         if not user_id or user_id in seen:
             continue
         seen.add(user_id)
-        payload.append(
-            Notification(
-                user=user,
-                title=title,
-                body=body,
-                kind=kind,
-            )
+        messages.append((user_id, title, body, data))
+    notify_each(messages, kind=kind)
+
+
+def notify_each(messages: Iterable[tuple], kind: str = "info", batch_size: int = 500):
+    """Queues one in-app notification per ``(user_id, title, body, data)`` message, ``batch_size`` rows per insert."""
+    send_at = timezone.now()
+    payload = [
+        Notification(
+            user_id=user_id,
+            type=kind,
+            channel=Notification.Channel.IN_APP,
+            payload={"title": title, "body": body, **(data or {})},
+            send_at=send_at,
         )
+        for user_id, title, body, data in messages
+        if user_id
+    ]
     if payload:
-        Notification.objects.bulk_create(payload, ignore_conflicts=True)
+        Notification.objects.bulk_create(payload, batch_size=batch_size, ignore_conflicts=True)
@@ -0,0 +1,31 @@
+import re
+from datetime import date
+
+TRIMESTERS_PER_YEAR = 3
+_MONTHS_PER_TRIMESTER = 12 // TRIMESTERS_PER_YEAR
+_TERM_PATTERN = re.compile(rf"\d{{4}}-[1-{TRIMESTERS_PER_YEAR}]")
+
+
+def trimester_for_date(value: date) -> int:
+    """Trimester (1-3) containing the date: Jan-Apr, May-Aug, Sep-Dec."""
+    return (value.month - 1) // _MONTHS_PER_TRIMESTER + 1
+
+
+def term_for_date(value: date) -> str:
+    """Term label in the ``"<year>-<trimester>"`` format used by progress models, e.g. ``"2025-3"``."""
+    return f"{value.year}-{trimester_for_date(value)}"
+
+
+def is_valid_term(term) -> bool:
+    return isinstance(term, str) and _TERM_PATTERN.fullmatch(term) is not None
+
+
+def term_bounds(term: str) -> tuple[date, date]:
+    """First day of the term and first day after it, e.g. ``"2025-2"`` -> (2025-05-01, 2025-09-01)."""
+    if not is_valid_term(term):
+        raise ValueError(f"Invalid term {term!r}; expected '<year>-<trimester>', e.g. '2025-2'.")
+    year, trimester = (int(part) for part in term.split("-"))
+    start = date(year, (trimester - 1) * _MONTHS_PER_TRIMESTER + 1, 1)
+    if trimester == TRIMESTERS_PER_YEAR:
+        return start, date(year + 1, 1, 1)
+    return start, date(year, trimester * _MONTHS_PER_TRIMESTER + 1, 1)
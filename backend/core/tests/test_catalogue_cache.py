@@ -0,0 +1,72 @@
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+
+from core.catalogue import MISSING, LocalLRU, catalogue_versions, local_cache
+from finance.models import FeeStructure
+from learning.models import CurriculumUnit, Programme
+from users.models import User
+
+
+class LocalLRUTests(SimpleTestCase):
+
+    def test_least_recently_used_entry_is_evicted(self):
+        lru = LocalLRU(2)
+        lru.set('a', 1)
+        lru.set('b', 2)
+        lru.get('a')
+        lru.set('c', 3)
+        self.assertEqual((lru.get('a'), lru.get('b'), lru.get('c')), (1, MISSING, 3))
+
+
+class CatalogueCacheTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        local_cache.clear()
+        self.programme = Programme.objects.create(
+            name='Test Programme', code='TP', award_level='Diploma', duration_years=2, trimesters_per_year=3
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(username='student', role=User.Roles.STUDENT))
+
+    def test_saves_and_deletes_bump_the_model_version(self):
+        before = catalogue_versions([Programme, CurriculumUnit])
+        self.programme.name = 'Renamed'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.programme.save()
+            # Nothing is bumped until the write commits.
+            self.assertEqual(catalogue_versions([Programme, CurriculumUnit]), before)
+        after = catalogue_versions([Programme, CurriculumUnit])
+        self.assertEqual((after[0], after[1]), (before[0] + 1, before[1]))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.programme.delete()
+        self.assertEqual(catalogue_versions([Programme])[0], before[0] + 2)
+
+    def test_list_reads_through_the_cache(self):
+        self.client.get('/api/learning/programmes/')
+        # Only the conditional-GET aggregate runs; the page comes from the cache.
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/learning/programmes/')
+        self.assertEqual([row['code'] for row in response.data['results']], ['TP'])
+
+        self.programme.name = 'Renamed'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.programme.save()
+        response = self.client.get('/api/learning/programmes/')
+        self.assertEqual(response.data['results'][0]['name'], 'Renamed')
+
+    def test_curriculum_and_fee_structures_are_invalidated_by_their_models(self):
+        url = f'/api/learning/programmes/{self.programme.pk}/curriculum/'
+        self.assertEqual(self.client.get(url).data, [])
+        with self.captureOnCommitCallbacks(execute=True):
+            CurriculumUnit.objects.create(programme=self.programme, code='U1', title='Unit 1', credit_hours=3)
+        self.assertEqual([unit['code'] for unit in self.client.get(url).data], ['U1'])
+
+        self.assertEqual(self.client.get('/api/finance/fee-structures/').data['results'], [])
+        with self.captureOnCommitCallbacks(execute=True):
+            FeeStructure.objects.create(
+                programme=self.programme, academic_year=2025, trimester=1,
+                line_items=[{'item': 'Tuition', 'amount': '100.00'}],
+            )
+        self.assertEqual(len(self.client.get('/api/finance/fee-structures/').data['results']), 1)
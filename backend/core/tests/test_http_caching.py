@@ -0,0 +1,121 @@
+import gzip
+from unittest import skipUnless
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from core.catalogue import local_cache
+from core.middleware import brotli
+from learning.models import CurriculumUnit, Department, Programme
+from repository.models import LibraryAsset, ResourceTag
+from users.models import User
+
+
+class ConditionalGetTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        local_cache.clear()
+        department = Department.objects.create(name='Test Department', code='TD')
+        self.programme = Programme.objects.create(
+            department=department,
+            name='Test Programme',
+            code='TP',
+            award_level='Diploma',
+            duration_years=2,
+            trimesters_per_year=3
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(username='student', role=User.Roles.STUDENT))
+
+    def test_unchanged_list_is_not_modified_without_serialising(self):
+        response = self.client.get('/api/learning/programmes/')
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        self.assertTrue(response.has_header('Last-Modified'))
+
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/learning/programmes/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+        Programme.objects.create(name='Other', code='OP', award_level='Diploma', duration_years=2, trimesters_per_year=3)
+        response = self.client.get('/api/learning/programmes/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_detail_and_curriculum_have_their_own_validators(self):
+        detail = self.client.get(f'/api/learning/programmes/{self.programme.pk}/')
+        self.assertEqual(
+            self.client.get(f'/api/learning/programmes/{self.programme.pk}/', HTTP_IF_NONE_MATCH=detail['ETag']).status_code,
+            304,
+        )
+
+        url = f'/api/learning/programmes/{self.programme.pk}/curriculum/'
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        with self.captureOnCommitCallbacks(execute=True):
+            CurriculumUnit.objects.create(programme=self.programme, code='U1', title='Unit 1', credit_hours=3)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 1)
+
+
+    def test_non_numeric_pk_is_not_found(self):
+        for url in (
+            '/api/learning/programmes/abc/',
+            '/api/learning/programmes/abc/curriculum/',
+            '/api/repository/assets/abc/',
+            '/api/finance/fee-structures/abc/',
+        ):
+            self.assertEqual(self.client.get(url).status_code, 404, url)
+
+    def test_library_asset_validators_follow_tags(self):
+        asset = LibraryAsset.objects.create(title='Notes', type='pdf', url='https://example.com/notes.pdf')
+        tag = ResourceTag.objects.create(name='revision')
+        url = f'/api/repository/assets/{asset.pk}/'
+        etag = self.client.get(url)['ETag']
+
+        asset.tags.add(tag)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['name'] for row in response.data['tags']], ['revision'])
+
+        etag = response['ETag']
+        ResourceTag.objects.filter(pk=tag.pk).update(name='exam revision', updated_at=tag.updated_at.replace(year=2100))
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['tags'][0]['name'], 'exam revision')
+
+
+class CompressionTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        local_cache.clear()
+        for index in range(30):
+            Programme.objects.create(
+                name=f'Programme {index}', code=f'P{index}', award_level='Diploma', duration_years=2, trimesters_per_year=3
+            )
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(username='student', role=User.Roles.STUDENT))
+
+    def test_large_responses_are_gzipped(self):
+        response = self.client.get('/api/learning/programmes/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn(b'Programme 29', gzip.decompress(response.content))
+        self.assertTrue(response['ETag'].startswith('W/'))
+
+    @override_settings(RESPONSE_COMPRESSION_MIN_BYTES=1024 * 1024)
+    def test_small_responses_are_left_alone(self):
+        response = self.client.get('/api/learning/programmes/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    @skipUnless(brotli, 'brotli is not installed')
+    def test_cookie_requests_are_not_brotli_compressed(self):
+        response = self.client.get('/api/learning/programmes/', HTTP_ACCEPT_ENCODING='br, gzip')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.client.cookies['sessionid'] = 'secret'
+        response = self.client.get('/api/learning/programmes/', HTTP_ACCEPT_ENCODING='br, gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
@@ -0,0 +1,74 @@
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.pagination import KeysetPagination, _is_indexed
+from learning.achievement_models import AchievementCategory, StudentAchievement, TermProgress
+from learning.goals_models import LearningMilestone
+from notifications.models import Notification
+from users.models import User
+
+
+class KeysetPaginationTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='student', role=User.Roles.STUDENT)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_list_endpoints_page_with_cursors(self):
+        notifications = [
+            Notification.objects.create(
+                user=self.user, type='info', channel='in_app', payload={'n': index}, send_at=timezone.now()
+            )
+            for index in range(25)
+        ]
+        response = self.client.get('/api/notifications/')
+        self.assertEqual(response.status_code, 200)
+        # The view caps its pages at 20; newest first.
+        self.assertEqual(len(response.data['results']), 20)
+        self.assertEqual(response.data['results'][0]['id'], notifications[-1].pk)
+        self.assertIsNone(response.data['previous'])
+
+        # Rows inserted between requests do not shift the next page.
+        Notification.objects.create(user=self.user, type='info', channel='in_app', payload={}, send_at=timezone.now())
+        response = self.client.get(response.data['next'])
+        self.assertEqual([row['id'] for row in response.data['results']], [n.pk for n in reversed(notifications[:5])])
+        self.assertIsNone(response.data['next'])
+
+        response = self.client.get('/api/notifications/', {'page_size': 500})
+        self.assertEqual(len(response.data['results']), 26)
+
+    def test_resolved_ordering_is_kept_with_a_pk_tie_break(self):
+        paginator = KeysetPagination()
+        categories = AchievementCategory.objects.all()
+        self.assertEqual(paginator.get_ordering(None, categories, None), ('name', 'pk'))
+        self.assertEqual(paginator.get_ordering(None, categories.order_by('-description'), None), ('-description', '-pk'))
+        self.assertEqual(
+            paginator.get_ordering(None, Notification.objects.order_by('-created_at'), None), ('-created_at', '-pk')
+        )
+        self.assertEqual(paginator.get_ordering(None, User.objects.order_by('id'), None), ('id',))
+        # Meta orderings survive, foreign keys by column; nullable leading columns cannot hold a cursor.
+        self.assertEqual(paginator.get_ordering(None, TermProgress.objects.all(), None), ('-term', '-pk'))
+        self.assertEqual(paginator.get_ordering(None, LearningMilestone.objects.all(), None), ('goal_id', 'order', 'pk'))
+        self.assertEqual(paginator.get_ordering(None, Notification.objects.order_by('-user'), None), ('-pk',))
+
+    def test_client_orderings_are_limited_to_indexed_columns(self):
+        for index in range(3):
+            Notification.objects.create(
+                user=self.user, type=f'type{index}', channel='in_app', payload={}, send_at=timezone.now()
+            )
+        response = self.client.get('/api/notifications/', {'ordering': 'created_at'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['type'] for row in response.data['results']], ['type0', 'type1', 'type2'])
+
+        response = self.client.get('/api/notifications/', {'ordering': '-type'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('created_at', response.data['ordering'])
+
+    def test_ordering_indexes_cover_the_model_orderings(self):
+        # created_at follows user in the notification index, so it only counts once the user is pinned.
+        self.assertFalse(_is_indexed(Notification, 'created_at'))
+        self.assertTrue(_is_indexed(Notification, 'created_at', {'user'}))
+        for model in (TermProgress, LearningMilestone, StudentAchievement):
+            self.assertTrue(_is_indexed(model, model._meta.ordering[0].lstrip('-')), model)
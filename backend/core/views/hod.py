@@ -2,11 +2,15 @@ from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.db.models import Count
+from core.cache import DEFAULT_TIMEOUT, versioned_key
 from core.models import Department
+from core.pagination import StandardResultsSetPagination
 from learning.models import Programme, Registration, CurriculumUnit, LecturerAssignment
-from finance.models import FinanceStatus, FinanceThreshold
-from users.models import HOD, Student
+from learning.services.registrations import bulk_approve_registrations
+from finance.services import ELIGIBILITY_CACHE_NAMESPACE, eligible_students_queryset
+from users.models import HOD
 from users.serializers import StudentSerializer
 from core.serializers import HODSerializer
 
@@ -21,34 +25,31 @@ class HODViewSet(viewsets.ReadOnlyModelViewSet):
     def eligibles(self, request, pk=None):
         hod = self.get_object()
         department = hod.department
-
-        # Get programmes in the HOD's department
-        programmes = department.programmes.all()
-
-        # Get the latest finance thresholds for those programmes
-        thresholds = FinanceThreshold.objects.filter(programme__in=programmes).distinct('programme').order_by('programme', '-academic_year', '-trimester')
-
-        # Get students who have met the threshold
-        eligible_students = Student.objects.none()
-        for threshold in thresholds:
-            students_in_programme = Student.objects.filter(programme=threshold.programme)
-            finance_statuses = FinanceStatus.objects.filter(
-                student__in=students_in_programme,
-                academic_year=threshold.academic_year,
-                trimester=threshold.trimester,
-                total_paid__gte=threshold.threshold_amount
-            )
-            eligible_students |= students_in_programme.filter(id__in=finance_statuses.values('student_id'))
-
-        serializer = StudentSerializer(eligible_students, many=True)
-        return Response(serializer.data)
+        if department is None:
+            return Response({'detail': 'HOD is not assigned to a department.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        paginator = StandardResultsSetPagination()
+        cache_key = versioned_key(
+            ELIGIBILITY_CACHE_NAMESPACE,
+            department.pk,
+            request.query_params.get(paginator.page_query_param, 1),
+            paginator.get_page_size(request),
+        )
+        payload = cache.get(cache_key)
+        if payload is None:
+            page = paginator.paginate_queryset(eligible_students_queryset(department), request, view=self)
+            payload = paginator.get_paginated_response(StudentSerializer(page, many=True).data).data
+            cache.set(cache_key, payload, timeout=DEFAULT_TIMEOUT)
+        return Response(payload)
 
     @action(detail=False, methods=['post'])
     def approve_registrations(self, request):
         registration_ids = request.data.get('registration_ids', [])
-        registrations = Registration.objects.filter(id__in=registration_ids)
-        registrations.update(status=Registration.Status.APPROVED)
-        return Response({'detail': f'{len(registrations)} registrations approved.'})
+        if not isinstance(registration_ids, list):
+            return Response({'detail': 'registration_ids must be a list.'}, status=status.HTTP_400_BAD_REQUEST)
+        results = bulk_approve_registrations(registration_ids, request.user)
+        approved = sum(1 for row in results if row['result'] == 'approved')
+        return Response({'detail': f'{approved} registrations approved.', 'results': results})
 
 
 class DepartmentViewSet(viewsets.ModelViewSet):
@@ -36,6 +36,7 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "core.middleware.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -107,9 +108,11 @@ REST_FRAMEWORK = {
     "DEFAULT_FILTER_BACKENDS": [
         "django_filters.rest_framework.DjangoFilterBackend",
         "rest_framework.filters.SearchFilter",
-        "rest_framework.filters.OrderingFilter",
+        "core.pagination.IndexedOrderingFilter",
     ],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    "DEFAULT_PAGINATION_CLASS": "core.pagination.KeysetPagination",
+    "PAGE_SIZE": 50,
 }
 
 # Media files (for Resource.file) – dev-friendly defaults
@@ -134,3 +137,74 @@ SIMPLE_JWT = {
     "UPDATE_LAST_LOGIN": True,
     "AUTH_HEADER_TYPES": ("Bearer",),
 }
+
+from celery.schedules import crontab
+
+# Celery – background jobs (finance analytics materialisation, etc.)
+CELERY_BROKER_URL = os.environ.get("CELERY_BROKER_URL", "redis://localhost:6379/0")
+CELERY_RESULT_BACKEND = os.environ.get("CELERY_RESULT_BACKEND", CELERY_BROKER_URL)
+CELERY_TASK_ALWAYS_EAGER = os.environ.get("CELERY_TASK_ALWAYS_EAGER", "0") == "1"
+CELERY_BEAT_SCHEDULE = {
+    "materialise-finance-analytics": {
+        "task": "finance.tasks.materialise_finance_analytics",
+        "schedule": timedelta(hours=1),
+    },
+    "rollup-activity-logs": {
+        "task": "learning.tasks.rollup_activity_logs",
+        "schedule": timedelta(minutes=5),
+    },
+    "prune-expired-activity-logs": {
+        "task": "learning.tasks.prune_expired_activity_logs",
+        "schedule": timedelta(days=1),
+    },
+    "evaluate-learning-milestones": {
+        "task": "learning.tasks.evaluate_learning_milestones",
+        "schedule": crontab(hour=2, minute=0),
+    },
+    "auto-approve-achievement-claims": {
+        "task": "learning.tasks.auto_approve_achievement_claims",
+        "schedule": timedelta(minutes=15),
+    },
+    "snapshot-star-balances": {
+        "task": "rewards.tasks.snapshot_star_balances",
+        "schedule": crontab(hour=0, minute=30),
+    },
+}
+
+# Activity rollups only consume logs at least this old, so rows committed late behind a lower id are not skipped
+ACTIVITY_ROLLUP_SETTLE_SECONDS = int(os.environ.get("ACTIVITY_ROLLUP_SETTLE_SECONDS", "120"))
+
+# Raw ActivityLog rows older than this are pruned once rolled up (0 disables pruning)
+ACTIVITY_LOG_RETENTION_DAYS = int(os.environ.get("ACTIVITY_LOG_RETENTION_DAYS", "400"))
+
+# Existing account recorded as approver when auto_approve_conditions approve a claim;
+# auto-approval refuses to run until it is set
+ACHIEVEMENT_AUTO_APPROVER_USERNAME = os.environ.get("ACHIEVEMENT_AUTO_APPROVER_USERNAME", "")
+
+# Shared cache: Redis when REDIS_URL is set, otherwise per-process memory
+# (fine for a single worker; cache versions are not shared across processes).
+REDIS_URL = os.environ.get("REDIS_URL", "")
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# Entries kept in each process's LRU in front of the shared catalogue cache
+CATALOGUE_LOCAL_CACHE_SIZE = int(os.environ.get("CATALOGUE_LOCAL_CACHE_SIZE", "512"))
+
+# Responses smaller than this are not gzip/brotli compressed
+RESPONSE_COMPRESSION_MIN_BYTES = int(os.environ.get("RESPONSE_COMPRESSION_MIN_BYTES", "1024"))
+
+# Redis sorted sets for rewards leaderboards; unset keeps them in process memory
+LEADERBOARD_REDIS_URL = os.environ.get("LEADERBOARD_REDIS_URL", "")
+# Seconds an in-process board is trusted before reloading; each worker only sees its own writes
+LEADERBOARD_MEMORY_TTL = int(os.environ.get("LEADERBOARD_MEMORY_TTL", "60"))
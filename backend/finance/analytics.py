@@ -0,0 +1,166 @@
+"""
+Vectorised finance analytics: balance aging, payment velocity and projected
+shortfall per programme for a term.
+
+Rows are pulled with ``values_list`` into columnar NumPy arrays and grouped
+with ``bincount`` so the cost stays linear in the number of rows with no
+per-row Python work beyond the initial fetch.
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+import numpy as np
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import FinanceAnalyticsSnapshot, FinanceStatus, Payment
+
+# Lower edges (in days) of the 31-60, 61-90 and 90+ buckets; 0-30 is implicit.
+AGING_EDGES = np.array([31, 61, 91])
+AGING_LABELS = ("0-30", "31-60", "61-90", "90+")
+VELOCITY_WINDOW_DAYS = 30
+DEFAULT_HORIZON_DAYS = 30
+
+_SECONDS_PER_DAY = 86400.0
+
+
+def _epoch_seconds(values):
+    return np.fromiter((value.timestamp() for value in values), dtype=np.float64, count=len(values))
+
+
+def _status_columns(academic_year: int, trimester: int):
+    rows = list(
+        FinanceStatus.objects.filter(
+            academic_year=academic_year,
+            trimester=trimester,
+            student__programme__isnull=False,
+        ).values_list('student__programme_id', 'total_due', 'total_paid', 'created_at')
+    )
+    if not rows:
+        return None
+    programme_ids, total_due, total_paid, created_at = zip(*rows)
+    return {
+        'programme_id': np.array(programme_ids, dtype=np.int64),
+        'total_due': np.array(total_due, dtype=np.float64),
+        'total_paid': np.array(total_paid, dtype=np.float64),
+        'created_at': _epoch_seconds(created_at),
+    }
+
+
+def _recent_payment_columns(academic_year: int, trimester: int, since):
+    rows = list(
+        Payment.objects.annotate(paid_on=Coalesce(F('paid_at'), F('created_at')))
+        .filter(
+            academic_year=academic_year,
+            trimester=trimester,
+            student__programme__isnull=False,
+            paid_on__gte=since,
+        )
+        .values_list('student__programme_id', 'amount')
+    )
+    if not rows:
+        return np.array([], dtype=np.int64), np.array([], dtype=np.float64)
+    programme_ids, amounts = zip(*rows)
+    return np.array(programme_ids, dtype=np.int64), np.array(amounts, dtype=np.float64)
+
+
+def compute_term_analytics(academic_year: int, trimester: int, *, as_of=None, horizon_days: int = DEFAULT_HORIZON_DAYS):
+    """
+    Returns one dict per programme with aging buckets, velocity and projected shortfall.
+
+    Aging is measured from when the term's FinanceStatus row was raised.
+    Velocity is the average amount paid per day over the last
+    ``VELOCITY_WINDOW_DAYS``; the projected shortfall is the outstanding balance
+    left after ``horizon_days`` more days at that velocity.
+    """
+    as_of = as_of or timezone.now()
+    columns = _status_columns(academic_year, trimester)
+    if columns is None:
+        return []
+
+    programmes, programme_index = np.unique(columns['programme_id'], return_inverse=True)
+    n_programmes = len(programmes)
+    n_buckets = len(AGING_LABELS)
+
+    balance = np.clip(columns['total_due'] - columns['total_paid'], 0, None)
+    outstanding = balance > 0
+    age_days = (as_of.timestamp() - columns['created_at']) / _SECONDS_PER_DAY
+    bucket = np.digitize(age_days, AGING_EDGES)
+
+    # Flatten (programme, bucket) into one index so a single bincount groups both.
+    cell = programme_index[outstanding] * n_buckets + bucket[outstanding]
+    aging_count = np.bincount(cell, minlength=n_programmes * n_buckets).reshape(n_programmes, n_buckets)
+    aging_amount = np.bincount(
+        cell, weights=balance[outstanding], minlength=n_programmes * n_buckets
+    ).reshape(n_programmes, n_buckets)
+
+    student_count = np.bincount(programme_index, minlength=n_programmes)
+    outstanding_students = np.bincount(programme_index, weights=outstanding, minlength=n_programmes)
+    due_sum = np.bincount(programme_index, weights=columns['total_due'], minlength=n_programmes)
+    paid_sum = np.bincount(programme_index, weights=columns['total_paid'], minlength=n_programmes)
+    balance_sum = np.bincount(programme_index, weights=balance, minlength=n_programmes)
+
+    payment_programmes, payment_amounts = _recent_payment_columns(
+        academic_year, trimester, as_of - timedelta(days=VELOCITY_WINDOW_DAYS)
+    )
+    recent = np.zeros(n_programmes)
+    if payment_programmes.size:
+        # Payments may come from programmes with no status row; drop those.
+        positions = np.searchsorted(programmes, payment_programmes)
+        positions = np.clip(positions, 0, n_programmes - 1)
+        known = programmes[positions] == payment_programmes
+        recent = np.bincount(positions[known], weights=payment_amounts[known], minlength=n_programmes)
+    velocity = recent / VELOCITY_WINDOW_DAYS
+    shortfall = np.clip(balance_sum - velocity * horizon_days, 0, None)
+
+    return [
+        {
+            'programme_id': int(programmes[i]),
+            'student_count': int(student_count[i]),
+            'outstanding_students': int(outstanding_students[i]),
+            'total_due': _money(due_sum[i]),
+            'total_paid': _money(paid_sum[i]),
+            'outstanding': _money(balance_sum[i]),
+            'aging': {
+                label: {'count': int(aging_count[i, b]), 'amount': str(_money(aging_amount[i, b]))}
+                for b, label in enumerate(AGING_LABELS)
+            },
+            'velocity_per_day': _money(velocity[i]),
+            'projected_shortfall': _money(shortfall[i]),
+        }
+        for i in range(n_programmes)
+    ]
+
+
+def _money(value) -> Decimal:
+    return Decimal(str(round(float(value), 2))).quantize(Decimal('0.01'))
+
+
+def materialise_term_analytics(academic_year: int, trimester: int, *, as_of=None, horizon_days: int = DEFAULT_HORIZON_DAYS):
+    """
+    Recomputes and stores the term's analytics, replacing any previous snapshot.
+    """
+    as_of = as_of or timezone.now()
+    results = compute_term_analytics(academic_year, trimester, as_of=as_of, horizon_days=horizon_days)
+    snapshots = [
+        FinanceAnalyticsSnapshot(
+            academic_year=academic_year,
+            trimester=trimester,
+            as_of=as_of,
+            horizon_days=horizon_days,
+            **row,
+        )
+        for row in results
+    ]
+    with transaction.atomic():
+        FinanceAnalyticsSnapshot.objects.filter(academic_year=academic_year, trimester=trimester).delete()
+        FinanceAnalyticsSnapshot.objects.bulk_create(snapshots)
+    return snapshots
+
+
+def terms_with_activity():
+    return list(
+        FinanceStatus.objects.values_list('academic_year', 'trimester').distinct().order_by('academic_year', 'trimester')
+    )
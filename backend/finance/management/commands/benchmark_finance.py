@@ -0,0 +1,216 @@
+import json
+import random
+import time
+import tracemalloc
+from decimal import Decimal
+
+import numpy as np
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, setup_test_environment, teardown_test_environment
+from rest_framework.test import APIClient
+
+from core.models import Department
+from finance.models import FeeStructure, FinanceStatus, FinanceThreshold, Payment
+from finance.services import derive_status, update_finance_status
+from learning.models import Programme
+from users.models import HOD, Student, User
+
+ACADEMIC_YEAR = 2025
+TRIMESTER = 1
+FEE_PER_TERM = Decimal("1000.00")
+BATCH_SIZE = 5000
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the finance hot paths (update_finance_status, RecordPaymentView, "
+        "FinanceReportView, HODViewSet.eligibles) against generated datasets in a "
+        "throwaway database and print JSON with latency percentiles, query counts and peak memory."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", default="1000,10000,100000", help="Comma-separated student counts.")
+        parser.add_argument("--iterations", type=int, default=50, help="Timed iterations per benchmark.")
+        parser.add_argument("--report-iterations", type=int, default=5, help="Timed iterations for the full CSV report.")
+        parser.add_argument("--max-payments", type=int, default=4, help="Upper bound of payments per student.")
+        parser.add_argument("--seed", type=int, default=2025)
+        parser.add_argument("--output", help="Write the JSON report to this file instead of stdout.")
+
+    def handle(self, *args, **options):
+        try:
+            sizes = [int(size) for size in options["sizes"].split(",") if size.strip()]
+        except ValueError:
+            raise CommandError("--sizes must be a comma-separated list of integers.")
+
+        setup_test_environment()
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            results = []
+            for size in sizes:
+                self.stderr.write(f"Benchmarking {size} students...")
+                results.append(self._run_size(size, options))
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        report = json.dumps({"database": connection.vendor, "results": results}, indent=2)
+        if options.get("output"):
+            with open(options["output"], "w") as fh:
+                fh.write(report)
+            self.stderr.write(self.style.SUCCESS(f"Wrote {options['output']}"))
+        else:
+            self.stdout.write(report)
+
+    def _run_size(self, size, options):
+        rng = random.Random(options["seed"] + size)
+        dataset = self._generate(size, options["max_payments"], rng)
+        iterations = options["iterations"]
+        students = dataset["student_ids"]
+
+        client = APIClient()
+        client.force_authenticate(dataset["staff"])
+
+        def record_payment():
+            return client.post(
+                "/api/finance/record-payment/",
+                {
+                    "student": rng.choice(students),
+                    "academic_year": ACADEMIC_YEAR,
+                    "trimester": TRIMESTER,
+                    "amount": "50.00",
+                },
+                format="json",
+            )
+
+        def eligibles():
+            cache.clear()
+            return client.get(f"/api/core/api/hods/{dataset['hod_id']}/eligibles/")
+
+        benchmarks = {
+            "update_finance_status": (
+                lambda: update_finance_status(rng.choice(students), ACADEMIC_YEAR, TRIMESTER),
+                iterations,
+            ),
+            "record_payment_view": (record_payment, iterations),
+            "finance_report_view": (
+                lambda: client.get("/api/finance/report/", {"programme_id": dataset["programme_id"]}),
+                options["report_iterations"],
+            ),
+            "hod_eligibles": (eligibles, iterations),
+        }
+        return {
+            "students": size,
+            "payments": dataset["payments"],
+            "benchmarks": {name: self._measure(name, fn, count) for name, (fn, count) in benchmarks.items()},
+        }
+
+    def _measure(self, name, benchmark, iterations):
+        def fn():
+            # Timing an error response would report a failing endpoint as fast.
+            result = benchmark()
+            status_code = getattr(result, "status_code", None)
+            if status_code is not None and not 200 <= status_code < 300:
+                raise CommandError(f"{name} returned HTTP {status_code}; aborting the benchmark.")
+
+        fn()  # warm-up
+
+        with CaptureQueriesContext(connection) as ctx:
+            fn()
+        queries = len(ctx.captured_queries)
+
+        tracemalloc.start()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        timings = np.empty(iterations)
+        for i in range(iterations):
+            start = time.perf_counter()
+            fn()
+            timings[i] = (time.perf_counter() - start) * 1000
+        p50, p95, p99 = np.percentile(timings, [50, 95, 99])
+        return {
+            "iterations": iterations,
+            "p50_ms": round(float(p50), 3),
+            "p95_ms": round(float(p95), 3),
+            "p99_ms": round(float(p99), 3),
+            "max_ms": round(float(timings.max()), 3),
+            "queries": queries,
+            "peak_memory_kb": round(peak / 1024, 1),
+        }
+
+    def _generate(self, size, max_payments, rng):
+        # Each size starts from an empty dataset so results are comparable.
+        for model in (Payment, FinanceStatus, FinanceThreshold, FeeStructure, Student, HOD, Programme, Department):
+            model.objects.all().delete()
+        User.objects.all().delete()
+
+        department = Department.objects.create(name="Benchmark Department", code=f"BD{size}")
+        programme = Programme.objects.create(
+            department=department,
+            name="Benchmark Programme",
+            code=f"BP{size}",
+            award_level="Diploma",
+            duration_years=3,
+            trimesters_per_year=3,
+        )
+        hod_user = User.objects.create(username=f"bench-hod-{size}", role=User.Roles.HOD)
+        HOD.objects.create(user=hod_user, department=department)
+        staff = User.objects.create(username=f"bench-bursar-{size}", role=User.Roles.FINANCE, is_staff=True)
+        FeeStructure.objects.create(
+            programme=programme,
+            academic_year=ACADEMIC_YEAR,
+            trimester=TRIMESTER,
+            line_items=[{"name": "Tuition", "amount": str(FEE_PER_TERM)}],
+        )
+        FinanceThreshold.objects.create(
+            programme=programme,
+            academic_year=ACADEMIC_YEAR,
+            trimester=TRIMESTER,
+            threshold_amount=FEE_PER_TERM * Decimal("0.6"),
+        )
+
+        users = User.objects.bulk_create(
+            [User(username=f"bench-student-{size}-{i}", role=User.Roles.STUDENT, password="!") for i in range(size)],
+            batch_size=BATCH_SIZE,
+        )
+        Student.objects.bulk_create(
+            [
+                Student(user=user, programme=programme, year=1, trimester=TRIMESTER, trimester_label="T1", cohort_year=ACADEMIC_YEAR)
+                for user in users
+            ],
+            batch_size=BATCH_SIZE,
+        )
+
+        payments, statuses = [], []
+        for user in users:
+            total_paid = Decimal("0")
+            for _ in range(rng.randint(0, max_payments)):
+                amount = Decimal(rng.randrange(50, 400))
+                total_paid += amount
+                payments.append(Payment(student_id=user.pk, academic_year=ACADEMIC_YEAR, trimester=TRIMESTER, amount=amount))
+            status, clearance = derive_status(FEE_PER_TERM, total_paid)
+            statuses.append(
+                FinanceStatus(
+                    student_id=user.pk,
+                    academic_year=ACADEMIC_YEAR,
+                    trimester=TRIMESTER,
+                    total_due=FEE_PER_TERM,
+                    total_paid=total_paid,
+                    status=status,
+                    clearance_status=clearance,
+                )
+            )
+        Payment.objects.bulk_create(payments, batch_size=BATCH_SIZE)
+        FinanceStatus.objects.bulk_create(statuses, batch_size=BATCH_SIZE)
+
+        return {
+            "student_ids": [user.pk for user in users],
+            "payments": len(payments),
+            "programme_id": programme.pk,
+            "hod_id": hod_user.pk,
+            "staff": staff,
+        }
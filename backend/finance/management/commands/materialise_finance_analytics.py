@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from finance.analytics import DEFAULT_HORIZON_DAYS, materialise_term_analytics, terms_with_activity
+
+
+class Command(BaseCommand):
+    help = "Recompute per-programme aging, velocity and shortfall analytics for one or all terms."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--year", type=int, help="Academic year to materialise (requires --trimester).")
+        parser.add_argument("--trimester", type=int, help="Trimester to materialise (requires --year).")
+        parser.add_argument("--horizon-days", type=int, default=DEFAULT_HORIZON_DAYS)
+
+    def handle(self, *args, **options):
+        year, trimester = options.get("year"), options.get("trimester")
+        if (year is None) != (trimester is None):
+            raise CommandError("--year and --trimester must be given together.")
+
+        terms = [(year, trimester)] if year is not None else terms_with_activity()
+        for academic_year, term in terms:
+            snapshots = materialise_term_analytics(academic_year, term, horizon_days=options["horizon_days"])
+            self.stdout.write(f"{academic_year}/T{term}: {len(snapshots)} programme snapshot(s)")
+        self.stdout.write(self.style.SUCCESS("Finance analytics materialised."))
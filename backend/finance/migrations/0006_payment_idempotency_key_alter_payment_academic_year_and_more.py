@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0005_payment_academic_year_payment_trimester'),
+        ('users', '0002_student_stars'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='payment',
+            name='idempotency_key',
+            field=models.CharField(blank=True, max_length=64, null=True, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='payment',
+            name='academic_year',
+            field=models.IntegerField(),
+        ),
+        migrations.AlterField(
+            model_name='payment',
+            name='trimester',
+            field=models.IntegerField(),
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['student', 'academic_year', 'trimester'], name='finance_pay_student_daa7f8_idx'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:08
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0006_payment_idempotency_key_alter_payment_academic_year_and_more'),
+        ('learning', '0003_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FinanceAnalyticsSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('academic_year', models.IntegerField()),
+                ('trimester', models.IntegerField()),
+                ('as_of', models.DateTimeField()),
+                ('horizon_days', models.IntegerField()),
+                ('student_count', models.IntegerField(default=0)),
+                ('outstanding_students', models.IntegerField(default=0)),
+                ('total_due', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=14)),
+                ('total_paid', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=14)),
+                ('outstanding', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=14)),
+                ('aging', models.JSONField(default=dict)),
+                ('velocity_per_day', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=14)),
+                ('projected_shortfall', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=14)),
+                ('programme', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='finance_analytics', to='learning.programme')),
+            ],
+            options={
+                'unique_together': {('programme', 'academic_year', 'trimester')},
+            },
+        ),
+    ]
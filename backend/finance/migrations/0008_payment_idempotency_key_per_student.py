@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 08:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0007_financeanalyticssnapshot'),
+        ('users', '0002_student_stars'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='payment',
+            name='idempotency_key',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='payment',
+            constraint=models.UniqueConstraint(condition=models.Q(('idempotency_key__isnull', False)), fields=('student', 'idempotency_key'), name='finance_payment_student_idempotency_key'),
+        ),
+    ]
@@ -23,6 +23,19 @@ class Payment(TimeStampedModel):
     method = models.CharField(max_length=50, blank=True)
     ref = models.CharField(max_length=100, blank=True)
     paid_at = models.DateTimeField(null=True, blank=True)
+    idempotency_key = models.CharField(max_length=64, null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["student", "academic_year", "trimester"]),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["student", "idempotency_key"],
+                condition=models.Q(idempotency_key__isnull=False),
+                name="finance_payment_student_idempotency_key",
+            ),
+        ]
 
     def __str__(self):
         return f"Payment of {self.amount} for {self.student.user.username} for {self.academic_year}/T{self.trimester}"
@@ -68,3 +81,26 @@ class FinanceStatus(TimeStampedModel):
 
     def __str__(self):
         return f"Finance status for {self.student.user.username} for {self.academic_year}/T{self.trimester} is {self.status}"
+
+
+class FinanceAnalyticsSnapshot(TimeStampedModel):
+    """Materialised per-programme analytics for a term, refreshed by `finance.analytics`."""
+    programme = models.ForeignKey(Programme, on_delete=models.CASCADE, related_name="finance_analytics")
+    academic_year = models.IntegerField()
+    trimester = models.IntegerField()
+    as_of = models.DateTimeField()
+    horizon_days = models.IntegerField()
+    student_count = models.IntegerField(default=0)
+    outstanding_students = models.IntegerField(default=0)
+    total_due = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0"))
+    total_paid = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0"))
+    outstanding = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0"))
+    aging = models.JSONField(default=dict)
+    velocity_per_day = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0"))
+    projected_shortfall = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0"))
+
+    class Meta:
+        unique_together = ("programme", "academic_year", "trimester")
+
+    def __str__(self):
+        return f"Finance analytics for {self.programme.code} {self.academic_year}/T{self.trimester}"
@@ -1,6 +1,6 @@
 from rest_framework import serializers
 
-from .models import FeeStructure, Payment, FinanceThreshold, FinanceStatus
+from .models import FeeStructure, Payment, FinanceThreshold, FinanceStatus, FinanceAnalyticsSnapshot
 
 
 class FeeStructureSerializer(serializers.ModelSerializer):
@@ -13,6 +13,10 @@ class PaymentSerializer(serializers.ModelSerializer):
     class Meta:
         model = Payment
         fields = "__all__"
+        read_only_fields = ["idempotency_key"]
+        extra_kwargs = {"student": {"required": True, "allow_null": False}}
+        # (student, idempotency_key) uniqueness is enforced by record_payment, which replays instead of failing.
+        validators = []
 
 
 class FinanceThresholdSerializer(serializers.ModelSerializer):
@@ -24,4 +28,26 @@ class FinanceThresholdSerializer(serializers.ModelSerializer):
 class FinanceStatusSerializer(serializers.ModelSerializer):
     class Meta:
         model = FinanceStatus
-        fields = "__all__"
\ No newline at end of file
+        fields = "__all__"
+
+
+class FinanceAnalyticsSnapshotSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = FinanceAnalyticsSnapshot
+        fields = "__all__"
+
+
+class ClearanceCheckSerializer(serializers.Serializer):
+    MAX_STUDENTS = 1000
+
+    academic_year = serializers.IntegerField()
+    trimester = serializers.IntegerField()
+    student_ids = serializers.ListField(
+        child=serializers.IntegerField(), required=False, max_length=MAX_STUDENTS
+    )
+    unit = serializers.IntegerField(required=False)
+
+    def validate(self, attrs):
+        if not attrs.get("student_ids") and attrs.get("unit") is None:
+            raise serializers.ValidationError("Provide either student_ids or unit.")
+        return attrs
@@ -1,13 +1,55 @@
 from decimal import Decimal
-from django.db.models import Sum
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import F, OuterRef, Subquery, Sum
 
-from .models import FinanceStatus, FeeStructure, Payment
+from .models import FinanceStatus, FinanceThreshold, FeeStructure, Payment
 from users.models import Student
 
+
+def derive_status(total_due: Decimal, total_paid: Decimal):
+    """
+    Returns the (status, clearance_status) pair for the given term totals.
+    """
+    if total_due > 0:
+        if total_paid >= total_due:
+            return FinanceStatus.Status.PAID, FinanceStatus.Clearance.CLEARED_FOR_EXAMS
+        if total_paid > 0:
+            # 60/40 rule
+            if total_paid >= (total_due * Decimal("0.6")):
+                return FinanceStatus.Status.PARTIAL, FinanceStatus.Clearance.CLEARED_FOR_REGISTRATION
+            return FinanceStatus.Status.PARTIAL, FinanceStatus.Clearance.BLOCKED
+        return FinanceStatus.Status.PENDING, FinanceStatus.Clearance.BLOCKED
+    # total_due is 0
+    return FinanceStatus.Status.PAID, FinanceStatus.Clearance.CLEARED_FOR_EXAMS
+
+
+def _fee_structure_total(programme, academic_year: int, trimester: int) -> Decimal:
+    try:
+        fee_structure = FeeStructure.objects.get(
+            programme=programme,
+            academic_year=academic_year,
+            trimester=trimester,
+        )
+    except FeeStructure.DoesNotExist:
+        return Decimal("0")
+    # Assuming line_items is a list of dicts with 'amount' key
+    return sum((Decimal(item['amount']) for item in fee_structure.line_items), Decimal("0"))
+
+
+def _term_paid(student, academic_year: int, trimester: int) -> Decimal:
+    return Payment.objects.filter(
+        student=student,
+        academic_year=academic_year,
+        trimester=trimester,
+    ).aggregate(total=Sum('amount'))['total'] or Decimal("0")
+
+
 def update_finance_status(student_id: int, academic_year: int, trimester: int):
     """
     Updates the finance status for a student for a given term.
-    This should be triggered after a payment is made.
+    Re-aggregates every payment for the term, so it doubles as the repair path
+    for rows maintained incrementally by `record_payment`.
     """
     try:
         student = Student.objects.get(pk=student_id)
@@ -23,45 +65,184 @@ def update_finance_status(student_id: int, academic_year: int, trimester: int):
     )
 
     # Get the total due amount from the fee structure
-    try:
-        fee_structure = FeeStructure.objects.get(
-            programme=programme,
-            academic_year=academic_year,
-            trimester=trimester,
-        )
-        # Assuming line_items is a list of dicts with 'amount' key
-        total_due = sum(Decimal(item['amount']) for item in fee_structure.line_items)
-    except FeeStructure.DoesNotExist:
-        total_due = Decimal("0")
+    total_due = _fee_structure_total(programme, academic_year, trimester)
 
     # Calculate the total paid amount
-    total_paid = Payment.objects.filter(
-        student=student,
-        academic_year=academic_year,
-        trimester=trimester
-    ).aggregate(total=Sum('amount'))['total'] or Decimal("0")
-    
+    total_paid = _term_paid(student, academic_year, trimester)
+
     finance_status.total_due = total_due
     finance_status.total_paid = total_paid
+    finance_status.status, finance_status.clearance_status = derive_status(total_due, total_paid)
+    finance_status.save()
 
-    if total_due > 0:
-        if total_paid >= total_due:
-            finance_status.status = FinanceStatus.Status.PAID
-            finance_status.clearance_status = FinanceStatus.Clearance.CLEARED_FOR_EXAMS
-        elif total_paid > 0:
-            finance_status.status = FinanceStatus.Status.PARTIAL
-            # 60/40 rule
-            if total_paid >= (total_due * Decimal("0.6")):
-                finance_status.clearance_status = FinanceStatus.Clearance.CLEARED_FOR_REGISTRATION
-            else:
-                finance_status.clearance_status = FinanceStatus.Clearance.BLOCKED
-        else:
-            finance_status.status = FinanceStatus.Status.PENDING
-            finance_status.clearance_status = FinanceStatus.Clearance.BLOCKED
-    else: # total_due is 0
-        finance_status.status = FinanceStatus.Status.PAID
-        finance_status.clearance_status = FinanceStatus.Clearance.CLEARED_FOR_EXAMS
+    return finance_status
 
-    finance_status.save()
 
-    return finance_status
\ No newline at end of file
+class IdempotencyKeyReused(ValueError):
+    """Raised when an idempotency key is replayed with a different payment than the one it recorded."""
+
+
+def _replayed_payment(student, idempotency_key, fields: dict):
+    """The student's payment recorded under ``idempotency_key``, checked against the retried ``fields``."""
+    existing = Payment.objects.filter(student=student, idempotency_key=idempotency_key).first()
+    if existing is not None and any(getattr(existing, name) != value for name, value in fields.items()):
+        raise IdempotencyKeyReused("Idempotency-Key was already used for a different payment.")
+    return existing
+
+
+def record_payment(
+    *,
+    student: Student,
+    academic_year: int,
+    trimester: int,
+    amount: Decimal,
+    idempotency_key: str = None,
+    **payment_fields,
+):
+    """
+    Records a payment and applies it to the term's FinanceStatus in one transaction.
+
+    The status row is locked with SELECT ... FOR UPDATE and `total_paid` is
+    incremented with an F() expression, so concurrent payments for the same
+    student serialise on that row instead of overwriting each other.
+    Returns a ``(payment, created)`` tuple; when `idempotency_key` matches an
+    earlier payment of the same student, that payment is returned with
+    ``created=False``, or IdempotencyKeyReused is raised if it differs.
+    """
+    fields = {"academic_year": academic_year, "trimester": trimester, "amount": amount, **payment_fields}
+    if idempotency_key:
+        existing = _replayed_payment(student, idempotency_key, fields)
+        if existing is not None:
+            return existing, False
+
+    try:
+        with transaction.atomic():
+            finance_status, created = FinanceStatus.objects.select_for_update().get_or_create(
+                student=student,
+                academic_year=academic_year,
+                trimester=trimester,
+            )
+            if created:
+                # Payments recorded before the row existed count towards it from the start.
+                finance_status.total_due = _fee_structure_total(student.programme, academic_year, trimester)
+                finance_status.total_paid = _term_paid(student, academic_year, trimester)
+                finance_status.save(update_fields=['total_due', 'total_paid'])
+
+            # A retry holding the same key may have committed while we waited on the lock.
+            if idempotency_key:
+                existing = _replayed_payment(student, idempotency_key, fields)
+                if existing is not None:
+                    return existing, False
+
+            payment = Payment.objects.create(
+                student=student,
+                academic_year=academic_year,
+                trimester=trimester,
+                amount=amount,
+                idempotency_key=idempotency_key or None,
+                **payment_fields,
+            )
+            FinanceStatus.objects.filter(pk=finance_status.pk).update(total_paid=F('total_paid') + amount)
+            finance_status.refresh_from_db(fields=['total_paid'])
+
+            finance_status.status, finance_status.clearance_status = derive_status(
+                finance_status.total_due, finance_status.total_paid
+            )
+            finance_status.save(update_fields=['total_due', 'status', 'clearance_status', 'updated_at'])
+    except IntegrityError:
+        if idempotency_key:
+            existing = _replayed_payment(student, idempotency_key, fields)
+            if existing is not None:
+                return existing, False
+        raise
+
+    return payment, True
+
+
+ELIGIBILITY_CACHE_NAMESPACE = "hod-eligibles"
+
+
+def eligible_students_queryset(department):
+    """
+    Students in the department whose payments for their programme's latest
+    FinanceThreshold term meet the threshold amount.
+
+    The latest threshold and the matching FinanceStatus.total_paid are joined
+    through correlated subqueries, so the whole check runs as one SQL query
+    on SQLite and Postgres alike.
+    """
+    latest_threshold = FinanceThreshold.objects.filter(
+        programme=OuterRef('programme'),
+    ).order_by('-academic_year', '-trimester')
+    term_paid = FinanceStatus.objects.filter(
+        student=OuterRef('pk'),
+        academic_year=OuterRef('threshold_year'),
+        trimester=OuterRef('threshold_trimester'),
+    ).values('total_paid')[:1]
+
+    return (
+        Student.objects.filter(programme__department=department)
+        .annotate(
+            threshold_amount=Subquery(latest_threshold.values('threshold_amount')[:1]),
+            threshold_year=Subquery(latest_threshold.values('academic_year')[:1]),
+            threshold_trimester=Subquery(latest_threshold.values('trimester')[:1]),
+        )
+        .annotate(term_paid=Subquery(term_paid))
+        .filter(threshold_amount__isnull=False, term_paid__gte=F('threshold_amount'))
+        .select_related('user')
+        .order_by('user_id')
+    )
+
+
+CLEARANCE_CACHE_TIMEOUT = 60
+
+
+def clearance_cache_key(student_id, academic_year: int, trimester: int) -> str:
+    return f"finance:clearance:{student_id}:{academic_year}:{trimester}"
+
+
+def bulk_clearance(student_ids, academic_year: int, trimester: int):
+    """
+    Returns ``{student_id: clearance dict}`` for every requested student.
+
+    Entries are served from a short-TTL cache; misses are resolved with a single
+    FinanceStatus query and written back with set_many. Students without a
+    FinanceStatus row for the term are reported as pending and blocked.
+    """
+    keys = {clearance_cache_key(sid, academic_year, trimester): sid for sid in student_ids}
+    cached = cache.get_many(keys.keys())
+    results = {keys[key]: value for key, value in cached.items()}
+
+    missing = [sid for key, sid in keys.items() if key not in cached]
+    if missing:
+        rows = FinanceStatus.objects.filter(
+            student_id__in=missing,
+            academic_year=academic_year,
+            trimester=trimester,
+        ).values_list('student_id', 'status', 'clearance_status', 'total_due', 'total_paid')
+        found = {
+            student_id: {
+                'student_id': student_id,
+                'status': status_value,
+                'clearance_status': clearance,
+                'total_due': str(total_due),
+                'total_paid': str(total_paid),
+                'balance': str(total_due - total_paid),
+            }
+            for student_id, status_value, clearance, total_due, total_paid in rows
+        }
+        fresh = {}
+        for sid in missing:
+            entry = found.get(sid) or {
+                'student_id': sid,
+                'status': FinanceStatus.Status.PENDING,
+                'clearance_status': FinanceStatus.Clearance.BLOCKED,
+                'total_due': None,
+                'total_paid': None,
+                'balance': None,
+            }
+            results[sid] = entry
+            fresh[clearance_cache_key(sid, academic_year, trimester)] = entry
+        cache.set_many(fresh, timeout=CLEARANCE_CACHE_TIMEOUT)
+
+    return results
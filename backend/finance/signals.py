@@ -0,0 +1,46 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.cache import bump_version
+from learning.models import Programme
+from users.models import Student
+
+from .models import FinanceStatus, FinanceThreshold
+from .services import ELIGIBILITY_CACHE_NAMESPACE, clearance_cache_key
+
+
+def _invalidate_department(department_id):
+    if department_id is not None:
+        transaction.on_commit(lambda: bump_version(ELIGIBILITY_CACHE_NAMESPACE, department_id))
+
+
+@receiver(post_save, sender=FinanceStatus)
+@receiver(post_delete, sender=FinanceStatus)
+def finance_status_changed(sender, instance: FinanceStatus, **kwargs):
+    if instance.student_id is None:
+        return
+    # Drop the cached clearance only once the new status is visible, so a
+    # concurrent read cannot re-cache the old one.
+    key = clearance_cache_key(instance.student_id, instance.academic_year, instance.trimester)
+    transaction.on_commit(lambda: cache.delete(key))
+    department_id = (
+        Student.objects.filter(pk=instance.student_id)
+        .values_list('programme__department_id', flat=True)
+        .first()
+    )
+    _invalidate_department(department_id)
+
+
+@receiver(post_save, sender=FinanceThreshold)
+@receiver(post_delete, sender=FinanceThreshold)
+def finance_threshold_changed(sender, instance: FinanceThreshold, **kwargs):
+    if instance.programme_id is None:
+        return
+    department_id = (
+        Programme.objects.filter(pk=instance.programme_id)
+        .values_list('department_id', flat=True)
+        .first()
+    )
+    _invalidate_department(department_id)
@@ -0,0 +1,11 @@
+from celery import shared_task
+
+from .analytics import materialise_term_analytics, terms_with_activity
+
+
+@shared_task
+def materialise_finance_analytics(academic_year=None, trimester=None):
+    terms = [(academic_year, trimester)] if academic_year is not None else terms_with_activity()
+    for year, term in terms:
+        materialise_term_analytics(year, term)
+    return len(terms)
@@ -0,0 +1,75 @@
+from datetime import timedelta
+from decimal import Decimal
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from finance.analytics import compute_term_analytics, materialise_term_analytics
+from finance.models import FinanceStatus, Payment
+from learning.models import Department, Programme
+from users.models import User, Student
+
+
+class FinanceAnalyticsTests(TestCase):
+
+    def setUp(self):
+        self.department = Department.objects.create(name='Test Department', code='TD')
+        self.programme = Programme.objects.create(
+            department=self.department,
+            name='Test Programme',
+            code='TP',
+            award_level='Diploma',
+            duration_years=2,
+            trimesters_per_year=3
+        )
+        self.now = timezone.now()
+        # (days since the balance was raised, total due, total paid)
+        for index, (age, due, paid) in enumerate([(10, 1000, 400), (45, 1000, 0), (100, 1000, 200), (5, 1000, 1000)]):
+            student = self._student(f'student{index}')
+            status = FinanceStatus.objects.create(
+                student=student, academic_year=2025, trimester=1,
+                total_due=Decimal(due), total_paid=Decimal(paid),
+            )
+            FinanceStatus.objects.filter(pk=status.pk).update(created_at=self.now - timedelta(days=age))
+            if paid:
+                Payment.objects.create(
+                    student=student, academic_year=2025, trimester=1,
+                    amount=Decimal(paid), paid_at=self.now - timedelta(days=age // 2),
+                )
+
+    def _student(self, username):
+        user = User.objects.create_user(username=username, role=User.Roles.STUDENT)
+        return Student.objects.create(
+            user=user,
+            programme=self.programme,
+            year=1,
+            trimester=1,
+            trimester_label='T1',
+            cohort_year=2025
+        )
+
+    def test_aging_buckets_velocity_and_shortfall(self):
+        [row] = compute_term_analytics(2025, 1, as_of=self.now, horizon_days=30)
+
+        self.assertEqual(row['programme_id'], self.programme.pk)
+        self.assertEqual(row['student_count'], 4)
+        self.assertEqual(row['outstanding_students'], 3)
+        self.assertEqual(row['outstanding'], Decimal('2400.00'))
+        self.assertEqual(row['aging']['0-30'], {'count': 1, 'amount': '600.00'})
+        self.assertEqual(row['aging']['31-60'], {'count': 1, 'amount': '1000.00'})
+        self.assertEqual(row['aging']['61-90'], {'count': 0, 'amount': '0.00'})
+        self.assertEqual(row['aging']['90+'], {'count': 1, 'amount': '800.00'})
+        # Only the 400 and 1000 payments fall inside the 30-day window.
+        self.assertEqual(row['velocity_per_day'], Decimal('46.67'))
+        self.assertEqual(row['projected_shortfall'], Decimal('1000.00'))
+
+    def test_materialised_snapshots_are_served_by_api(self):
+        materialise_term_analytics(2025, 1, as_of=self.now)
+        materialise_term_analytics(2025, 1, as_of=self.now)
+
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user(username='bursar', role=User.Roles.FINANCE))
+        response = client.get('/api/finance/analytics/', {'academic_year': 2025, 'trimester': 1})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['outstanding'], '2400.00')
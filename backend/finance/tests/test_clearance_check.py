@@ -0,0 +1,81 @@
+from decimal import Decimal
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from finance.models import FinanceStatus
+from finance.services import record_payment
+from learning.models import CurriculumUnit, Department, Programme, Registration
+from users.models import User, Student
+
+
+class ClearanceCheckTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.department = Department.objects.create(name='Test Department', code='TD')
+        self.programme = Programme.objects.create(
+            department=self.department,
+            name='Test Programme',
+            code='TP',
+            award_level='Diploma',
+            duration_years=2,
+            trimesters_per_year=3
+        )
+        self.unit = CurriculumUnit.objects.create(programme=self.programme, code='TP101', title='Intro', credit_hours=3)
+        self.cleared = self._student('cleared', FinanceStatus.Clearance.CLEARED_FOR_EXAMS)
+        self.blocked = self._student('blocked', FinanceStatus.Clearance.BLOCKED)
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(username='invigilator', role=User.Roles.LECTURER))
+
+    def _student(self, username, clearance):
+        user = User.objects.create_user(username=username, role=User.Roles.STUDENT)
+        student = Student.objects.create(
+            user=user,
+            programme=self.programme,
+            year=1,
+            trimester=1,
+            trimester_label='T1',
+            cohort_year=2025
+        )
+        FinanceStatus.objects.create(student=student, academic_year=2025, trimester=1, clearance_status=clearance)
+        Registration.objects.create(student=student, unit=self.unit, academic_year=2025, trimester=1)
+        return student
+
+    def _check(self, **payload):
+        payload.update(academic_year=2025, trimester=1)
+        return self.client.post('/api/finance/clearance-check/', payload, format='json')
+
+    def test_check_by_student_ids(self):
+        response = self._check(student_ids=[self.cleared.pk, self.blocked.pk, 999999])
+        self.assertEqual(response.status_code, 200)
+        clearance = [row['clearance_status'] for row in response.data['results']]
+        self.assertEqual(clearance, ['cleared_for_exams', 'blocked', 'blocked'])
+
+    def test_check_by_unit(self):
+        response = self._check(unit=self.unit.pk)
+        self.assertEqual(
+            {row['student_id'] for row in response.data['results']},
+            {self.cleared.pk, self.blocked.pk},
+        )
+
+    def test_requires_students_or_unit(self):
+        self.assertEqual(self._check().status_code, 400)
+
+    def test_cached_lookup_skips_database(self):
+        ids = [self.cleared.pk, self.blocked.pk]
+        self._check(student_ids=ids)
+        with self.assertNumQueries(0):
+            response = self._check(student_ids=ids)
+        self.assertEqual(response.status_code, 200)
+
+    def test_payment_invalidates_cached_clearance(self):
+        self._check(student_ids=[self.blocked.pk])
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            record_payment(student=self.blocked, academic_year=2025, trimester=1, amount=Decimal('10.00'))
+            # Until the payment commits, readers keep the cached status.
+            self.assertEqual(self._check(student_ids=[self.blocked.pk]).data['results'][0]['total_paid'], '0.00')
+        for callback in callbacks:
+            callback()
+        response = self._check(student_ids=[self.blocked.pk])
+        self.assertEqual(response.data['results'][0]['total_paid'], '10.00')
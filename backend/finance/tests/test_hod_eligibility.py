@@ -0,0 +1,78 @@
+from decimal import Decimal
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from finance.models import FinanceStatus, FinanceThreshold
+from finance.services import eligible_students_queryset
+from learning.models import Department, Programme
+from users.models import HOD, User, Student
+
+
+class HODEligibilityTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.department = Department.objects.create(name='Test Department', code='TD')
+        self.programme = Programme.objects.create(
+            department=self.department,
+            name='Test Programme',
+            code='TP',
+            award_level='Diploma',
+            duration_years=2,
+            trimesters_per_year=3
+        )
+        hod_user = User.objects.create_user(username='hod', role=User.Roles.HOD)
+        self.hod = HOD.objects.create(user=hod_user, department=self.department)
+        # Older threshold must be ignored in favour of the latest term.
+        FinanceThreshold.objects.create(programme=self.programme, academic_year=2024, trimester=3, threshold_amount=Decimal('100'))
+        FinanceThreshold.objects.create(programme=self.programme, academic_year=2025, trimester=1, threshold_amount=Decimal('600'))
+
+        self.paid = self._student('paid', Decimal('600'))
+        self.short = self._student('short', Decimal('599'))
+        self.client = APIClient()
+        self.client.force_authenticate(hod_user)
+
+    def _student(self, username, total_paid):
+        user = User.objects.create_user(username=username, role=User.Roles.STUDENT)
+        student = Student.objects.create(
+            user=user,
+            programme=self.programme,
+            year=1,
+            trimester=1,
+            trimester_label='T1',
+            cohort_year=2025
+        )
+        FinanceStatus.objects.create(student=student, academic_year=2025, trimester=1, total_paid=total_paid)
+        return student
+
+    def _eligible_usernames(self):
+        response = self.client.get(f'/api/core/api/hods/{self.hod.pk}/eligibles/')
+        self.assertEqual(response.status_code, 200)
+        return [row['user']['username'] for row in response.data['results']]
+
+    def test_eligibility_runs_in_one_query(self):
+        with self.assertNumQueries(1):
+            students = list(eligible_students_queryset(self.department))
+        self.assertEqual([s.pk for s in students], [self.paid.pk])
+
+    def test_endpoint_is_paginated(self):
+        response = self.client.get(f'/api/core/api/hods/{self.hod.pk}/eligibles/')
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(self._eligible_usernames(), ['paid'])
+
+    def test_cache_invalidated_when_finance_status_changes(self):
+        self.assertEqual(self._eligible_usernames(), ['paid'])
+        status = FinanceStatus.objects.get(student=self.short)
+        status.total_paid = Decimal('700')
+        with self.captureOnCommitCallbacks(execute=True):
+            status.save()
+        self.assertEqual(self._eligible_usernames(), ['paid', 'short'])
+
+    def test_cache_invalidated_when_threshold_changes(self):
+        self.assertEqual(self._eligible_usernames(), ['paid'])
+        with self.captureOnCommitCallbacks(execute=True):
+            FinanceThreshold.objects.create(
+                programme=self.programme, academic_year=2025, trimester=2, threshold_amount=Decimal('50')
+            )
+        self.assertEqual(self._eligible_usernames(), [])
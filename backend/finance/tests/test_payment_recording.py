@@ -0,0 +1,108 @@
+from decimal import Decimal
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from finance.models import FeeStructure, FinanceStatus, Payment
+from finance.services import record_payment
+from learning.models import Department, Programme
+from users.models import User, Student
+
+
+class PaymentRecordingTests(TestCase):
+
+    def setUp(self):
+        self.department = Department.objects.create(name='Test Department', code='TD')
+        self.programme = Programme.objects.create(
+            department=self.department,
+            name='Test Programme',
+            code='TP',
+            award_level='Diploma',
+            duration_years=2,
+            trimesters_per_year=3
+        )
+        self.user = User.objects.create_user(username='teststudent', role=User.Roles.STUDENT)
+        self.student = Student.objects.create(
+            user=self.user,
+            programme=self.programme,
+            year=1,
+            trimester=1,
+            trimester_label='T1',
+            cohort_year=2025
+        )
+        FeeStructure.objects.create(
+            programme=self.programme,
+            academic_year=2025,
+            trimester=1,
+            line_items=[{'name': 'Tuition', 'amount': '1000.00'}]
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(username='bursar', role=User.Roles.FINANCE))
+
+    def test_record_payment_increments_total_and_derives_status(self):
+        record_payment(student=self.student, academic_year=2025, trimester=1, amount=Decimal('300.00'))
+        record_payment(student=self.student, academic_year=2025, trimester=1, amount=Decimal('300.00'))
+
+        status = FinanceStatus.objects.get(student=self.student)
+        self.assertEqual(status.total_due, Decimal('1000.00'))
+        self.assertEqual(status.total_paid, Decimal('600.00'))
+        self.assertEqual(status.status, FinanceStatus.Status.PARTIAL)
+        self.assertEqual(status.clearance_status, FinanceStatus.Clearance.CLEARED_FOR_REGISTRATION)
+
+    def test_new_status_row_counts_payments_recorded_before_it(self):
+        Payment.objects.create(student=self.student, academic_year=2025, trimester=1, amount=Decimal('500.00'))
+        self.assertFalse(FinanceStatus.objects.filter(student=self.student).exists())
+
+        record_payment(student=self.student, academic_year=2025, trimester=1, amount=Decimal('200.00'))
+
+        status = FinanceStatus.objects.get(student=self.student)
+        self.assertEqual(status.total_paid, Decimal('700.00'))
+        self.assertEqual(status.clearance_status, FinanceStatus.Clearance.CLEARED_FOR_REGISTRATION)
+
+    def test_record_payment_with_same_key_is_applied_once(self):
+        first, created = record_payment(
+            student=self.student, academic_year=2025, trimester=1, amount=Decimal('1000.00'), idempotency_key='abc'
+        )
+        self.assertTrue(created)
+        second, created = record_payment(
+            student=self.student, academic_year=2025, trimester=1, amount=Decimal('1000.00'), idempotency_key='abc'
+        )
+        self.assertFalse(created)
+        self.assertEqual(first.pk, second.pk)
+        self.assertEqual(Payment.objects.count(), 1)
+        self.assertEqual(FinanceStatus.objects.get(student=self.student).total_paid, Decimal('1000.00'))
+
+    def test_retried_request_returns_original_response(self):
+        payload = {'student': self.student.pk, 'academic_year': 2025, 'trimester': 1, 'amount': '250.00'}
+        first = self.client.post('/api/finance/record-payment/', payload, format='json', HTTP_IDEMPOTENCY_KEY='retry-1')
+        second = self.client.post('/api/finance/record-payment/', payload, format='json', HTTP_IDEMPOTENCY_KEY='retry-1')
+
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(second.status_code, 201)
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(second['Idempotent-Replayed'], 'true')
+        self.assertEqual(Payment.objects.count(), 1)
+        self.assertEqual(FinanceStatus.objects.get(student=self.student).total_paid, Decimal('250.00'))
+
+    def test_idempotency_keys_are_scoped_to_the_student(self):
+        other = Student.objects.create(
+            user=User.objects.create_user(username='other', role=User.Roles.STUDENT),
+            programme=self.programme, year=1, trimester=1, trimester_label='T1', cohort_year=2025,
+        )
+        record_payment(student=self.student, academic_year=2025, trimester=1, amount=Decimal('10.00'), idempotency_key='k')
+        payment, created = record_payment(
+            student=other, academic_year=2025, trimester=1, amount=Decimal('10.00'), idempotency_key='k'
+        )
+        self.assertTrue(created)
+        self.assertEqual(payment.student, other)
+
+    def test_key_reused_for_a_different_payment_is_rejected(self):
+        payload = {'student': self.student.pk, 'academic_year': 2025, 'trimester': 1, 'amount': '250.00'}
+        self.client.post('/api/finance/record-payment/', payload, format='json', HTTP_IDEMPOTENCY_KEY='retry-1')
+        response = self.client.post(
+            '/api/finance/record-payment/', {**payload, 'amount': '300.00'}, format='json', HTTP_IDEMPOTENCY_KEY='retry-1'
+        )
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(FinanceStatus.objects.get(student=self.student).total_paid, Decimal('250.00'))
+
+        response = self.client.post('/api/finance/record-payment/', {**payload, 'idempotency_key': 5}, format='json')
+        self.assertEqual(response.status_code, 400)
@@ -1,13 +1,15 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
-from .views import RecordPaymentView, FeeStructureViewSet, FinanceStatusViewSet, FinanceReportView
+from .views import ClearanceCheckView, RecordPaymentView, FeeStructureViewSet, FinanceStatusViewSet, FinanceReportView, FinanceAnalyticsViewSet
 
 router = DefaultRouter()
 router.register(r"fee-structures", FeeStructureViewSet, basename="fee-structure")
 router.register(r"status", FinanceStatusViewSet, basename="finance-status")
+router.register(r"analytics", FinanceAnalyticsViewSet, basename="finance-analytics")
 
 urlpatterns = router.urls + [
     path("record-payment/", RecordPaymentView.as_view(), name="record-payment"),
     path("report/", FinanceReportView.as_view(), name="finance-report"),
+    path("clearance-check/", ClearanceCheckView.as_view(), name="clearance-check"),
 ]
\ No newline at end of file
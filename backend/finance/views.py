@@ -1,15 +1,17 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework import status, viewsets
+from rest_framework import permissions, status, viewsets
 from decimal import Decimal
 from django_filters.rest_framework import DjangoFilterBackend
 import csv
 from django.http import HttpResponse
 
+from core.mixins import CatalogueCacheMixin, ConditionalGetMixin
+from learning.models import Registration
 from users.models import Student
-from .models import Payment, FinanceStatus, FeeStructure
-from .serializers import PaymentSerializer, FeeStructureSerializer, FinanceStatusSerializer
-from .services import update_finance_status
+from .models import Payment, FinanceStatus, FeeStructure, FinanceAnalyticsSnapshot
+from .serializers import ClearanceCheckSerializer, FinanceAnalyticsSnapshotSerializer, PaymentSerializer, FeeStructureSerializer, FinanceStatusSerializer
+from .services import IdempotencyKeyReused, bulk_clearance, record_payment
 
 
 class FinanceReportView(APIView):
@@ -50,9 +52,10 @@ class FinanceReportView(APIView):
             return Response({'detail': 'Invalid report format requested.'}, status=status.HTTP_400_BAD_REQUEST)
 
 
-class FeeStructureViewSet(viewsets.ReadOnlyModelViewSet):
+class FeeStructureViewSet(ConditionalGetMixin, CatalogueCacheMixin, viewsets.ReadOnlyModelViewSet):
     queryset = FeeStructure.objects.all()
     serializer_class = FeeStructureSerializer
+    catalogue_models = (FeeStructure,)
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['programme', 'academic_year', 'trimester']
 
@@ -64,18 +67,86 @@ class FinanceStatusViewSet(viewsets.ReadOnlyModelViewSet):
     filterset_fields = ['student', 'academic_year', 'trimester']
 
 
+class FinanceAnalyticsViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Serves the per-programme aging/velocity/shortfall snapshots materialised by
+    the `materialise_finance_analytics` task and management command.
+    """
+    queryset = FinanceAnalyticsSnapshot.objects.select_related('programme').order_by('programme__code')
+    serializer_class = FinanceAnalyticsSnapshotSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ['programme', 'academic_year', 'trimester']
+
+
 class RecordPaymentView(APIView):
+    """
+    Records a payment and updates the student's FinanceStatus atomically.
+
+    Clients may send an ``Idempotency-Key`` header (or ``idempotency_key`` in the
+    body); retrying with the same key for the same student returns the
+    original payment instead of recording it twice. Reusing a key for a
+    different payment is rejected with 422.
+    """
+
     def post(self, request):
+        idempotency_key = request.headers.get('Idempotency-Key') or request.data.get('idempotency_key')
+        if idempotency_key is not None and not isinstance(idempotency_key, str):
+            return Response({'detail': 'Idempotency-Key must be a string.'}, status=status.HTTP_400_BAD_REQUEST)
+        if idempotency_key and len(idempotency_key) > 64:
+            return Response({'detail': 'Idempotency-Key must be at most 64 characters.'}, status=status.HTTP_400_BAD_REQUEST)
+
         serializer = PaymentSerializer(data=request.data)
         if serializer.is_valid():
-            payment = serializer.save()
+            try:
+                payment, created = record_payment(idempotency_key=idempotency_key, **serializer.validated_data)
+            except IdempotencyKeyReused as exc:
+                return Response({'detail': str(exc)}, status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+            if not created:
+                return self._replay(payment)
+            return Response(PaymentSerializer(payment).data, status=status.HTTP_201_CREATED)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    def _replay(self, payment):
+        response = Response(PaymentSerializer(payment).data, status=status.HTTP_201_CREATED)
+        response['Idempotent-Replayed'] = 'true'
+        return response
 
-            # Update finance status
-            update_finance_status(
-                student_id=payment.student.id,
-                academic_year=payment.academic_year,
-                trimester=payment.trimester
+
+
+class ClearanceCheckView(APIView):
+    """
+    Bulk clearance lookup for exam-hall and registration gates.
+
+    POST either ``student_ids`` or a ``unit`` together with ``academic_year`` and
+    ``trimester``; the response lists the clearance of every student in one call.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        serializer = ClearanceCheckSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        academic_year = data['academic_year']
+        trimester = data['trimester']
+
+        if data.get('student_ids'):
+            student_ids = list(dict.fromkeys(data['student_ids']))
+        else:
+            student_ids = list(
+                Registration.objects.filter(
+                    unit_id=data['unit'],
+                    academic_year=academic_year,
+                    trimester=trimester,
+                )
+                .exclude(status=Registration.Status.REJECTED)
+                .values_list('student_id', flat=True)
+                .distinct()
             )
 
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
+        clearance = bulk_clearance(student_ids, academic_year, trimester)
+        return Response({
+            'academic_year': academic_year,
+            'trimester': trimester,
+            'results': [clearance[sid] for sid in student_ids],
+        })
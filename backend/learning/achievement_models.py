@@ -5,7 +5,7 @@ from core.models import TimeStampedModel
 
 class AchievementCategory(TimeStampedModel):
     """Categories for achievements like Attendance, Learning, Participation"""
-    name = models.CharField(max_length=100)
+    name = models.CharField(max_length=100, db_index=True)
     description = models.TextField(blank=True)
     icon = models.CharField(max_length=50, help_text="Icon identifier for the frontend")
     
@@ -30,11 +30,34 @@ class Achievement(TimeStampedModel):
     auto_approve_conditions = models.JSONField(null=True, blank=True, 
         help_text="Conditions for automatic approval in JSON format")
     voice_message = models.TextField(help_text="Encouraging message to speak when achievement is earned")
+    prerequisites = models.ManyToManyField("self", symmetrical=False, blank=True, related_name="unlocks",
+        help_text="Achievements that must be approved before this one can be claimed")
     
     def __str__(self):
         return self.name
 
 
+class AchievementPrerequisiteClosure(models.Model):
+    """
+    Transitive closure of ``Achievement.prerequisites``: one row per
+    (achievement, direct or indirect prerequisite) with the shortest path
+    length. Maintained by ``rebuild_prerequisite_closure`` whenever the
+    prerequisite graph changes, so availability checks never walk the graph.
+    """
+    achievement = models.ForeignKey(Achievement, on_delete=models.CASCADE, related_name="prerequisite_closure")
+    prerequisite = models.ForeignKey(Achievement, on_delete=models.CASCADE, related_name="dependant_closure")
+    depth = models.PositiveSmallIntegerField()
+
+    class Meta:
+        unique_together = ["achievement", "prerequisite"]
+        indexes = [
+            models.Index(fields=["prerequisite"]),
+        ]
+
+    def __str__(self):
+        return f"{self.achievement_id} requires {self.prerequisite_id} (depth {self.depth})"
+
+
 class StudentAchievement(TimeStampedModel):
     """Achievement instances earned by students"""
     student = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, 
@@ -51,6 +74,7 @@ class StudentAchievement(TimeStampedModel):
     
     class Meta:
         ordering = ["-created_at"]
+        indexes = [models.Index(fields=["created_at"])]
 
     def __str__(self):
         return f"{self.student.username} - {self.achievement.name}"
@@ -70,6 +94,7 @@ class RewardClaim(TimeStampedModel):
     
     class Meta:
         ordering = ["-created_at"]
+        indexes = [models.Index(fields=["created_at"])]
         constraints = [
             models.CheckConstraint(
                 check=models.Q(points_spent__gt=0),
@@ -93,10 +118,54 @@ class TermProgress(TimeStampedModel):
     class Meta:
         unique_together = ["student", "term"]
         ordering = ["-term"]
+        indexes = [models.Index(fields=["term"])]
 
     @property
     def available_points(self):
         return max(0, self.total_points_earned - self.total_points_spent)
 
     def __str__(self):
-        return f"{self.student.username} - {self.term}"
\ No newline at end of file
+        return f"{self.student.username} - {self.term}"
+
+class PointsLedgerEntry(models.Model):
+    """
+    Append-only record of every change to a student's term points.
+
+    Earned entries come from approved achievements (positive ``delta``), spent
+    entries from approved reward claims (negative ``delta``). TermProgress
+    totals are running balances over this ledger and can be rebuilt from it
+    with ``reconcile_points``. ``batch_id`` groups the entries written by one
+    approval so balances can be updated with a single statement per batch.
+    """
+    class Kind(models.TextChoices):
+        EARNED = "earned", "Earned"
+        SPENT = "spent", "Spent"
+        ADJUSTMENT = "adjustment", "Adjustment"
+
+    student = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE,
+        related_name="points_ledger", limit_choices_to={"role": "student"})
+    term = models.CharField(max_length=20)
+    kind = models.CharField(max_length=20, choices=Kind.choices)
+    delta = models.IntegerField()
+    student_achievement = models.OneToOneField(StudentAchievement, on_delete=models.SET_NULL,
+        null=True, blank=True, related_name="ledger_entry")
+    reward_claim = models.OneToOneField(RewardClaim, on_delete=models.SET_NULL,
+        null=True, blank=True, related_name="ledger_entry")
+    batch_id = models.UUIDField(db_index=True)
+    recorded_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL,
+        null=True, blank=True, related_name="recorded_ledger_entries")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["id"]
+        indexes = [
+            models.Index(fields=["student", "term"]),
+        ]
+
+    def save(self, *args, **kwargs):
+        if self.pk is not None:
+            raise ValueError("Ledger entries are append-only; record an adjustment instead.")
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f"{self.student_id} {self.term} {self.kind} {self.delta:+d}"
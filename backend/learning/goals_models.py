@@ -40,6 +40,7 @@ class LearningGoal(TimeStampedModel):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [models.Index(fields=['created_at'])]
         
     def __str__(self):
         return f"{self.student.user.username} - {self.title}"
@@ -72,6 +73,7 @@ class LearningMilestone(TimeStampedModel):
     
     class Meta:
         ordering = ['goal', 'order']
+        indexes = [models.Index(fields=['goal', 'order'])]
         
     def __str__(self):
         return f"{self.goal.student.user.username} - {self.title}"
@@ -108,6 +110,7 @@ class LearningSupport(TimeStampedModel):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [models.Index(fields=['created_at'])]
         
     def __str__(self):
         return f"{self.milestone.goal.student.user.username} - {self.support_type}"
@@ -142,6 +145,7 @@ class GoalReflection(TimeStampedModel):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [models.Index(fields=['created_at'])]
         
     def __str__(self):
         return f"{self.goal.student.user.username} - {self.created_at}"
\ No newline at end of file
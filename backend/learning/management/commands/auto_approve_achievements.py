@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from learning.services.auto_approval import auto_approve_claims
+
+
+class Command(BaseCommand):
+    help = "Approve pending achievement claims that meet their achievement's auto_approve_conditions."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--achievement", type=int, help="Only evaluate claims for this achievement.")
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        summary = auto_approve_claims(options.get("achievement"), batch_size=options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Checked {achievements} achievement(s): {evaluated} claim(s) evaluated, "
+                "{approved} approved, {invalid} achievement(s) with invalid conditions, "
+                "{invalid_terms} invalid term(s) skipped.".format(**summary)
+            )
+        )
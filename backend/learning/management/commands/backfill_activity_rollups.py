@@ -0,0 +1,26 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from learning.services.activity import process_daily_rollups, rebuild_daily_rollups
+
+
+class Command(BaseCommand):
+    help = "Rebuild ActivityDailyRollup rows for a day range from raw ActivityLog rows, then catch up on new logs."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--start", help="First day to rebuild (YYYY-MM-DD). Defaults to the retention window start.")
+        parser.add_argument("--end", help="Last day to rebuild (YYYY-MM-DD). Defaults to today.")
+
+    def handle(self, *args, **options):
+        try:
+            start = date.fromisoformat(options["start"]) if options.get("start") else None
+            end = date.fromisoformat(options["end"]) if options.get("end") else None
+        except ValueError as exc:
+            raise CommandError(f"Invalid date: {exc}")
+
+        written = rebuild_daily_rollups(start, end)
+        caught_up = process_daily_rollups()
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt {written} rollup row(s); folded in {caught_up} new activity log row(s).")
+        )
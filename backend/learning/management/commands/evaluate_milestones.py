@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from learning.services.milestones import evaluate_milestones
+
+
+class Command(BaseCommand):
+    help = "Evaluate open learning milestones and update goal progress."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--programme", type=int, help="Only evaluate goals in this programme.")
+
+    def handle(self, *args, **options):
+        summary = evaluate_milestones(options.get("programme"))
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Evaluated {evaluated} milestone(s): {completed} completed, "
+                "{goals_updated} goal(s) updated, {invalid} with invalid criteria, "
+                "{manual} without criteria left for manual completion.".format(**summary)
+            )
+        )
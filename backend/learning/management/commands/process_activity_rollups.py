@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from learning.services.activity import process_activity_rollups
+
+
+class Command(BaseCommand):
+    help = "Fold new ActivityLog rows into StudentProgress totals, streaks and activity scores."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--max-batches", type=int, help="Stop after this many batches (default: drain).")
+
+    def handle(self, *args, **options):
+        processed = process_activity_rollups(options["batch_size"], options.get("max_batches"))
+        self.stdout.write(self.style.SUCCESS(f"Rolled up {processed} activity log row(s)."))
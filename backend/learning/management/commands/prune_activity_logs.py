@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from learning.services.activity import prune_activity_logs
+
+
+class Command(BaseCommand):
+    help = "Delete raw ActivityLog rows past the retention period that have already been rolled up."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=getattr(settings, "ACTIVITY_LOG_RETENTION_DAYS", None),
+            help="Keep raw logs newer than this many days (default: ACTIVITY_LOG_RETENTION_DAYS).",
+        )
+        parser.add_argument("--dry-run", action="store_true", help="Only report how many rows would be deleted.")
+
+    def handle(self, *args, **options):
+        days = options.get("days")
+        if not days or days < 1:
+            raise CommandError("A positive --days value (or ACTIVITY_LOG_RETENTION_DAYS) is required.")
+        count = prune_activity_logs(days, dry_run=options["dry_run"])
+        verb = "Would delete" if options["dry_run"] else "Deleted"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {count} activity log row(s) older than {days} days."))
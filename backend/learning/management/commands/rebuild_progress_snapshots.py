@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from learning.services.progress import rebuild_progress_snapshots
+
+
+class Command(BaseCommand):
+    help = "Recompute UnitProgressSnapshot rows from registrations and submissions to repair drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--student",
+            type=int,
+            action="append",
+            dest="students",
+            help="Limit the rebuild to this student id (repeatable).",
+        )
+
+    def handle(self, *args, **options):
+        counts = rebuild_progress_snapshots(options.get("students"))
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Progress snapshots rebuilt: {created} created, {updated} updated, {deleted} deleted.".format(**counts)
+            )
+        )
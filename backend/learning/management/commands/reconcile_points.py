@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from learning.services.points import ledger_drift, reconcile_points
+
+
+class Command(BaseCommand):
+    help = "Rebuild TermProgress point balances from the points ledger."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--term", help="Only reconcile this term (e.g. 2025-1).")
+        parser.add_argument("--check", action="store_true", help="Report drifted balances without rewriting them.")
+
+    def handle(self, *args, **options):
+        drifted = ledger_drift(options.get("term"))
+        if options["check"]:
+            self.stdout.write(f"{drifted} balance(s) differ from the ledger.")
+            return
+        updated = reconcile_points(options.get("term"))
+        self.stdout.write(
+            self.style.SUCCESS(f"Reconciled {updated} balance(s); {drifted} had drifted from the ledger.")
+        )
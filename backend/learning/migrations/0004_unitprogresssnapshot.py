@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning', '0003_initial'),
+        ('users', '0002_student_stars'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UnitProgressSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('is_registered', models.BooleanField(default=False, help_text='Student has an approved registration for the unit')),
+                ('submission_count', models.PositiveIntegerField(default=0)),
+                ('graded_count', models.PositiveIntegerField(default=0)),
+                ('grade_sum', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('average_grade', models.FloatField(blank=True, null=True)),
+                ('completed', models.BooleanField(default=False)),
+                ('submissions', models.JSONField(blank=True, default=list)),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='unit_progress_snapshots', to='users.student')),
+                ('unit', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='progress_snapshots', to='learning.curriculumunit')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['student', 'is_registered', 'updated_at'], name='learning_un_student_354ac2_idx')],
+                'unique_together': {('student', 'unit')},
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning', '0004_unitprogresssnapshot'),
+        ('repository', '0001_initial'),
+        ('users', '0002_student_stars'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='activitylog',
+            name='client_id',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='activitylog',
+            name='occurred_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='activitylog',
+            constraint=models.UniqueConstraint(condition=models.Q(('client_id__isnull', False)), fields=('student', 'client_id'), name='unique_activity_client_id'),
+        ),
+    ]
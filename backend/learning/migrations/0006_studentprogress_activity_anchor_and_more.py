@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning', '0005_activitylog_client_id_activitylog_occurred_at_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='studentprogress',
+            name='activity_anchor',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='studentprogress',
+            name='activity_days',
+            field=models.BigIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning', '0006_studentprogress_activity_anchor_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActivityDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('activity_type', models.CharField(max_length=50)),
+                ('helper_type', models.CharField(blank=True, max_length=20)),
+                ('event_count', models.PositiveIntegerField(default=0)),
+                ('total_minutes', models.PositiveIntegerField(default=0)),
+                ('successful_count', models.PositiveIntegerField(default=0)),
+                ('needed_help_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('programme', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='activity_rollups', to='learning.programme')),
+            ],
+            options={
+                'ordering': ['day'],
+                'indexes': [models.Index(fields=['day', 'programme'], name='learning_ac_day_78b38a_idx')],
+                'unique_together': {('day', 'programme', 'activity_type', 'helper_type')},
+            },
+        ),
+    ]
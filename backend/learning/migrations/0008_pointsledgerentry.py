@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:26
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning', '0007_activitydailyrollup'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PointsLedgerEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=20)),
+                ('kind', models.CharField(choices=[('earned', 'Earned'), ('spent', 'Spent'), ('adjustment', 'Adjustment')], max_length=20)),
+                ('delta', models.IntegerField()),
+                ('batch_id', models.UUIDField(db_index=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('recorded_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='recorded_ledger_entries', to=settings.AUTH_USER_MODEL)),
+                ('reward_claim', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='ledger_entry', to='learning.rewardclaim')),
+                ('student', models.ForeignKey(limit_choices_to={'role': 'student'}, on_delete=django.db.models.deletion.CASCADE, related_name='points_ledger', to=settings.AUTH_USER_MODEL)),
+                ('student_achievement', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='ledger_entry', to='learning.studentachievement')),
+            ],
+            options={
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['student', 'term'], name='learning_po_student_41523b_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning', '0008_pointsledgerentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='achievement',
+            name='prerequisites',
+            field=models.ManyToManyField(blank=True, help_text='Achievements that must be approved before this one can be claimed', related_name='unlocks', to='learning.achievement'),
+        ),
+        migrations.CreateModel(
+            name='AchievementPrerequisiteClosure',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('depth', models.PositiveSmallIntegerField()),
+                ('achievement', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='prerequisite_closure', to='learning.achievement')),
+                ('prerequisite', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='dependant_closure', to='learning.achievement')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['prerequisite'], name='learning_ac_prerequ_c2bf17_idx')],
+                'unique_together': {('achievement', 'prerequisite')},
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning', '0009_achievement_prerequisites'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='achievementcategory',
+            name='name',
+            field=models.CharField(db_index=True, max_length=100),
+        ),
+    ]
@@ -0,0 +1,68 @@
+import uuid
+
+from django.db import migrations
+
+# Backfilled entries share one batch so the reverse migration can remove exactly them.
+BACKFILL_BATCH = uuid.UUID('5f0c2d1e-8a4b-4c3e-9d7f-0b1a2c3d4e5f')
+
+
+def backfill_ledger(apps, schema_editor):
+    PointsLedgerEntry = apps.get_model('learning', 'PointsLedgerEntry')
+    StudentAchievement = apps.get_model('learning', 'StudentAchievement')
+    RewardClaim = apps.get_model('learning', 'RewardClaim')
+
+    earned = (
+        StudentAchievement.objects.filter(approved_by__isnull=False, ledger_entry__isnull=True)
+        .values_list('id', 'student_id', 'term', 'points_earned', 'approved_by_id')
+        .iterator()
+    )
+    PointsLedgerEntry.objects.bulk_create(
+        (
+            PointsLedgerEntry(
+                student_id=student_id,
+                term=term,
+                kind='earned',
+                delta=points,
+                student_achievement_id=claim_id,
+                batch_id=BACKFILL_BATCH,
+                recorded_by_id=approver_id,
+            )
+            for claim_id, student_id, term, points, approver_id in earned
+        ),
+        batch_size=1000,
+    )
+    spent = (
+        RewardClaim.objects.filter(approved_by__isnull=False, ledger_entry__isnull=True)
+        .values_list('id', 'student_id', 'term', 'points_spent', 'approved_by_id')
+        .iterator()
+    )
+    PointsLedgerEntry.objects.bulk_create(
+        (
+            PointsLedgerEntry(
+                student_id=student_id,
+                term=term,
+                kind='spent',
+                delta=-points,
+                reward_claim_id=claim_id,
+                batch_id=BACKFILL_BATCH,
+                recorded_by_id=approver_id,
+            )
+            for claim_id, student_id, term, points, approver_id in spent
+        ),
+        batch_size=1000,
+    )
+
+
+def remove_backfill(apps, schema_editor):
+    apps.get_model('learning', 'PointsLedgerEntry').objects.filter(batch_id=BACKFILL_BATCH).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning', '0010_alter_achievementcategory_name'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_ledger, remove_backfill),
+    ]
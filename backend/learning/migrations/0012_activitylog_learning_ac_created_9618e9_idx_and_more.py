@@ -0,0 +1,73 @@
+# Generated by Django 5.2.18 on 2026-10-19 08:30
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning', '0011_backfill_points_ledger'),
+        ('repository', '0001_initial'),
+        ('users', '0003_userprovisionrequest_users_userp_created_2ff4b2_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['created_at'], name='learning_ac_created_9618e9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='completionrecord',
+            index=models.Index(fields=['completed_at'], name='learning_co_complet_28d48c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='courseschedule',
+            index=models.Index(fields=['day_of_week', 'start_time'], name='learning_co_day_of__8f2a95_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='coursesession',
+            index=models.Index(fields=['date', 'actual_start'], name='learning_co_date_8deb83_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='goalreflection',
+            index=models.Index(fields=['created_at'], name='learning_go_created_42bd38_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='learninggoal',
+            index=models.Index(fields=['created_at'], name='learning_le_created_8376f0_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='learningmilestone',
+            index=models.Index(fields=['goal', 'order'], name='learning_le_goal_id_7df261_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='learningsupport',
+            index=models.Index(fields=['created_at'], name='learning_le_created_59f3e4_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='rewardclaim',
+            index=models.Index(fields=['created_at'], name='learning_re_created_3a5c6e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sessionreminder',
+            index=models.Index(fields=['scheduled_for'], name='learning_se_schedul_a03f77_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentachievement',
+            index=models.Index(fields=['created_at'], name='learning_st_created_2aeb68_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentprogress',
+            index=models.Index(fields=['term'], name='learning_st_term_2103d9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='termprogress',
+            index=models.Index(fields=['term'], name='learning_te_term_1154ba_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='voiceattendance',
+            index=models.Index(fields=['created_at'], name='learning_vo_created_57a051_idx'),
+        ),
+    ]
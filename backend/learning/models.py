@@ -29,6 +29,12 @@ class CurriculumUnit(TimeStampedModel):
     def __str__(self):
         return f"{self.code} - {self.title}"
 
+    def clean(self):
+        from learning.services.curriculum import creates_unit_cycle
+
+        if creates_unit_cycle(self.pk, self.prereq_unit_id):
+            raise ValidationError({'prereq_unit': "This prerequisite would make the unit depend on itself."})
+
 class TermOffering(TimeStampedModel):
     programme = models.ForeignKey(Programme, on_delete=models.CASCADE, null=True, blank=True)
     unit = models.ForeignKey(CurriculumUnit, on_delete=models.CASCADE, null=True, blank=True)
@@ -56,6 +62,9 @@ class Registration(TimeStampedModel):
     academic_year = models.IntegerField()
     trimester = models.IntegerField()
     status = models.CharField(max_length=20, choices=Status.choices, default=Status.DRAFT)
+    approved_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL,
+        null=True, blank=True, related_name="approved_registrations")
+    approved_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         unique_together = ('student', 'unit', 'academic_year', 'trimester')
@@ -107,3 +116,28 @@ class Submission(TimeStampedModel):
 
     def __str__(self):
         return f"Submission by {self.student.user.username} for {self.assignment.title}"
+
+
+class UnitProgressSnapshot(TimeStampedModel):
+    """
+    Precomputed per-student, per-unit progress, kept current by the Submission and
+    Registration signals and repairable with `rebuild_progress_snapshots`.
+    """
+    student = models.ForeignKey('users.Student', on_delete=models.CASCADE, related_name='unit_progress_snapshots')
+    unit = models.ForeignKey(CurriculumUnit, on_delete=models.CASCADE, related_name='progress_snapshots')
+    is_registered = models.BooleanField(default=False, help_text="Student has an approved registration for the unit")
+    submission_count = models.PositiveIntegerField(default=0)
+    graded_count = models.PositiveIntegerField(default=0)
+    grade_sum = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    average_grade = models.FloatField(null=True, blank=True)
+    completed = models.BooleanField(default=False)
+    submissions = models.JSONField(default=list, blank=True)
+
+    class Meta:
+        unique_together = ('student', 'unit')
+        indexes = [
+            models.Index(fields=['student', 'is_registered', 'updated_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.student_id} progress for {self.unit_id}"
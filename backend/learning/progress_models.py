@@ -28,6 +28,9 @@ class StudentProgress(TimeStampedModel):
     total_time_spent = models.PositiveIntegerField(default=0, help_text="Total time spent in minutes")
     last_activity_at = models.DateTimeField(null=True)
     consecutive_days = models.PositiveIntegerField(default=0, help_text="Consecutive days of activity")
+    # Bit i set = active on activity_anchor - i days; maintained by the activity rollup processor
+    activity_days = models.BigIntegerField(default=0)
+    activity_anchor = models.DateField(null=True, blank=True)
     
     # Voice feedback
     latest_voice_feedback = models.FileField(upload_to='progress/voice/', blank=True)
@@ -36,6 +39,7 @@ class StudentProgress(TimeStampedModel):
     class Meta:
         unique_together = ['student', 'programme', 'term']
         ordering = ['-term', 'student__user__username']
+        indexes = [models.Index(fields=['term'])]
         
     def __str__(self):
         return f"{self.student.user.username} - {self.programme.code} ({self.term})"
@@ -78,9 +82,21 @@ class ActivityLog(TimeStampedModel):
     # Voice feedback
     voice_notes = models.FileField(upload_to='activity/voice/', blank=True)
     voice_notes_transcript = models.TextField(blank=True)
+
+    # Offline sync: client-generated event id and the time the event happened on the device
+    client_id = models.CharField(max_length=64, null=True, blank=True)
+    occurred_at = models.DateTimeField(null=True, blank=True)
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [models.Index(fields=['created_at'])]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['student', 'client_id'],
+                condition=models.Q(client_id__isnull=False),
+                name='unique_activity_client_id',
+            ),
+        ]
         
     def __str__(self):
         return f"{self.student.user.username} - {self.activity_type} ({self.created_at})"
@@ -118,6 +134,28 @@ class CompletionRecord(TimeStampedModel):
     class Meta:
         unique_together = ['student', 'programme', 'unit', 'resource']
         ordering = ['-completed_at']
+        indexes = [models.Index(fields=['completed_at'])]
         
     def __str__(self):
-        return f"{self.student.user.username} - {self.unit.title}"
\ No newline at end of file
+        return f"{self.student.user.username} - {self.unit.title}"
+
+
+class ActivityDailyRollup(models.Model):
+    """Per-day ActivityLog totals for admin analytics, filled incrementally from the log stream."""
+    day = models.DateField()
+    programme = models.ForeignKey('learning.Programme', on_delete=models.CASCADE, related_name='activity_rollups')
+    activity_type = models.CharField(max_length=50)
+    helper_type = models.CharField(max_length=20, blank=True)
+    event_count = models.PositiveIntegerField(default=0)
+    total_minutes = models.PositiveIntegerField(default=0)
+    successful_count = models.PositiveIntegerField(default=0)
+    needed_help_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ['day', 'programme', 'activity_type', 'helper_type']
+        indexes = [models.Index(fields=['day', 'programme'])]
+        ordering = ['day']
+
+    def __str__(self):
+        return f"{self.day} {self.programme_id} {self.activity_type}: {self.event_count}"
@@ -22,6 +22,8 @@ from .sessions import (
 from .progress import (
     StudentProgressSerializer,
     ActivityLogSerializer,
+    ActivityEventSerializer,
+    ActivityBatchSerializer,
     CompletionRecordSerializer,
     CompletionRecordListSerializer,
 )
@@ -56,6 +58,8 @@ __all__ = [
     "SessionReminderSerializer",
     "StudentProgressSerializer",
     "ActivityLogSerializer",
+    "ActivityEventSerializer",
+    "ActivityBatchSerializer",
     "CompletionRecordSerializer",
     "CompletionRecordListSerializer",
     "LearningGoalSerializer",
@@ -1,5 +1,8 @@
 from rest_framework import serializers
 from django.utils import timezone
+from ..services.achievements import creates_prerequisite_cycle
+from ..services.auto_approval import compile_conditions
+from ..services.rules import RuleError
 from ..achievement_models import (
     AchievementCategory,
     Achievement,
@@ -24,18 +27,24 @@ class AchievementSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'category', 'category_name', 'name', 'description', 'icon',
             'points', 'max_claims_per_term', 'requires_approval',
-            'auto_approve_conditions', 'voice_message', 'created_at', 'updated_at'
+            'auto_approve_conditions', 'voice_message', 'prerequisites',
+            'created_at', 'updated_at'
         ]
         read_only_fields = ['created_at', 'updated_at']
 
+    def validate_prerequisites(self, value):
+        """Reject prerequisite sets that would create a cycle"""
+        if self.instance is not None and creates_prerequisite_cycle(self.instance.pk, [a.pk for a in value]):
+            raise serializers.ValidationError('Prerequisites cannot depend on this achievement.')
+        return value
+
     def validate_auto_approve_conditions(self, value):
-        """Validate that auto-approve conditions are in the correct format"""
+        """Validate that auto-approve conditions compile as a rule"""
         if value:
-            required_keys = {'type', 'threshold'}
-            if not all(key in value for key in required_keys):
-                raise serializers.ValidationError(
-                    "auto_approve_conditions must contain 'type' and 'threshold'"
-                )
+            try:
+                compile_conditions(value)
+            except RuleError as exc:
+                raise serializers.ValidationError(str(exc))
         return value
 
 
@@ -1,6 +1,26 @@
 from rest_framework import serializers
+from django.db.models import Count, Max, Q
 from django.utils import timezone
+from core.serializers import SparseFieldsMixin
 from ..goals_models import LearningGoal, LearningMilestone, LearningSupport, GoalReflection
+from ..services.rules import RuleError, compile_rule
+
+REFLECTION_MOODS = [choice for choice, _ in GoalReflection._meta.get_field('mood').choices]
+
+
+def reflection_summary_annotations():
+    """
+    Conditional aggregates behind ``reflection_summary``: totals, one count
+    per mood, help requests and the latest reflection, for a goal queryset.
+    """
+    annotations = {
+        'reflection_total': Count('reflections', distinct=True),
+        'needs_help_total': Count('reflections', filter=Q(reflections__needs_help=True), distinct=True),
+        'latest_reflection_at': Max('reflections__created_at'),
+    }
+    for mood in REFLECTION_MOODS:
+        annotations[f'mood_{mood}_total'] = Count('reflections', filter=Q(reflections__mood=mood), distinct=True)
+    return annotations
 
 
 class GoalReflectionSerializer(serializers.ModelSerializer):
@@ -72,9 +92,14 @@ class LearningMilestoneSerializer(serializers.ModelSerializer):
         ]
 
     def get_support_count(self, obj):
+        # Annotated by LearningGoalViewSet; fall back to a query elsewhere.
+        if hasattr(obj, 'support_total'):
+            return obj.support_total
         return obj.support_records.count()
 
     def get_reflection_count(self, obj):
+        if hasattr(obj, 'reflection_total'):
+            return obj.reflection_total
         return obj.reflections.count()
 
     def validate(self, data):
@@ -85,6 +110,11 @@ class LearningMilestoneSerializer(serializers.ModelSerializer):
                     'required_attendance': 'Attendance requirement must be between 0 and 100'
                 })
 
+        try:
+            compile_rule(data.get('custom_criteria'))
+        except RuleError as exc:
+            raise serializers.ValidationError({'custom_criteria': str(exc)})
+
         # Check if resources exist
         resources = data.get('required_resources')
         if resources:
@@ -97,10 +127,10 @@ class LearningMilestoneSerializer(serializers.ModelSerializer):
         return data
 
 
-class LearningGoalSerializer(serializers.ModelSerializer):
+class LearningGoalSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Detailed serializer for learning goals"""
-    student_name = serializers.CharField(source='student.display_name', read_only=True)
-    course_code = serializers.CharField(source='course.code', read_only=True)
+    student_name = serializers.CharField(source='student.user.display_name', read_only=True)
+    programme_code = serializers.CharField(source='programme.code', read_only=True)
     creator_name = serializers.CharField(source='created_by.display_name', read_only=True)
     approver_name = serializers.CharField(source='approved_by.display_name', read_only=True)
     milestones = LearningMilestoneSerializer(many=True, read_only=True)
@@ -109,7 +139,7 @@ class LearningGoalSerializer(serializers.ModelSerializer):
     class Meta:
         model = LearningGoal
         fields = [
-            'id', 'student', 'student_name', 'course', 'course_code',
+            'id', 'student', 'student_name', 'programme', 'programme_code',
             'term', 'title', 'description', 'voice_description',
             'target_date', 'progress_percentage', 'status',
             'created_by', 'creator_name', 'approved_by', 'approver_name',
@@ -120,23 +150,27 @@ class LearningGoalSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at', 'created_by',
             'approved_by', 'progress_percentage'
         ]
+        expandable_fields = {'milestones': 'prefetch'}
+        default_expand = ['milestones']
+        # Annotated by reflection_summary_annotations().
+        method_field_sources = {'reflection_summary': ()}
 
     def get_reflection_summary(self, obj):
         """Summarize student reflections on this goal"""
-        reflections = GoalReflection.objects.filter(goal=obj)
-        if not reflections.exists():
+        if not hasattr(obj, 'reflection_total'):
+            obj = LearningGoal.objects.annotate(**reflection_summary_annotations()).get(pk=obj.pk)
+        if not obj.reflection_total:
             return None
 
-        moods = reflections.values_list('mood', flat=True)
-        needs_help = reflections.filter(needs_help=True).count()
-
         return {
-            'total_reflections': len(moods),
+            'total_reflections': obj.reflection_total,
             'mood_distribution': {
-                mood: moods.count(mood) for mood in set(moods)
+                mood: getattr(obj, f'mood_{mood}_total')
+                for mood in REFLECTION_MOODS
+                if getattr(obj, f'mood_{mood}_total')
             },
-            'needs_help_count': needs_help,
-            'latest_reflection': reflections.order_by('-created_at').first().created_at
+            'needs_help_count': obj.needs_help_total,
+            'latest_reflection': obj.latest_reflection_at,
         }
 
     def validate_target_date(self, value):
@@ -148,9 +182,9 @@ class LearningGoalSerializer(serializers.ModelSerializer):
         return value
 
 
-class LearningGoalListSerializer(serializers.ModelSerializer):
+class LearningGoalListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Lightweight serializer for goal list views"""
-    student_name = serializers.CharField(source='student.display_name', read_only=True)
+    student_name = serializers.CharField(source='student.user.display_name', read_only=True)
     milestone_count = serializers.SerializerMethodField()
     completed_milestone_count = serializers.SerializerMethodField()
 
@@ -161,9 +195,14 @@ class LearningGoalListSerializer(serializers.ModelSerializer):
             'progress_percentage', 'target_date', 'milestone_count',
             'completed_milestone_count'
         ]
+        method_field_sources = {'milestone_count': (), 'completed_milestone_count': ()}
 
     def get_milestone_count(self, obj):
+        if hasattr(obj, 'milestone_total'):
+            return obj.milestone_total
         return obj.milestones.count()
 
     def get_completed_milestone_count(self, obj):
-        return obj.milestones.filter(completed=True).count()
\ No newline at end of file
+        if hasattr(obj, 'milestone_done'):
+            return obj.milestone_done
+        return obj.milestones.filter(completed=True).count()
@@ -75,6 +75,42 @@ class ActivityLogSerializer(serializers.ModelSerializer):
         return data
 
 
+class ActivityEventSerializer(serializers.Serializer):
+    """
+    One event in a batched ActivityLog upload. Foreign keys are plain ids here and
+    are checked for the whole batch at once by the ingest view.
+    """
+    client_id = serializers.CharField(max_length=64)
+    programme = serializers.IntegerField()
+    activity_type = serializers.ChoiceField(choices=ActivityLog._meta.get_field('activity_type').choices)
+    occurred_at = serializers.DateTimeField(required=False, allow_null=True)
+    duration_minutes = serializers.IntegerField(required=False, allow_null=True, min_value=0)
+    resource = serializers.IntegerField(required=False, allow_null=True)
+    details = serializers.JSONField(required=False, allow_null=True)
+    was_successful = serializers.BooleanField(required=False, allow_null=True)
+    difficulty_reported = serializers.IntegerField(required=False, allow_null=True, min_value=1, max_value=5)
+    needed_help = serializers.BooleanField(required=False, default=False)
+    helper_type = serializers.ChoiceField(
+        choices=ActivityLog._meta.get_field('helper_type').choices, required=False, allow_blank=True, default=''
+    )
+
+    def validate(self, data):
+        if data.get('needed_help') and not data.get('helper_type'):
+            raise serializers.ValidationError({
+                'helper_type': 'Helper type is required when needed_help is True'
+            })
+        return data
+
+
+class ActivityBatchSerializer(serializers.Serializer):
+    MAX_EVENTS = 5000
+
+    student = serializers.IntegerField(required=False)
+    events = serializers.ListField(
+        child=serializers.DictField(), allow_empty=False, max_length=MAX_EVENTS
+    )
+
+
 class CompletionRecordSerializer(serializers.ModelSerializer):
     student_name = serializers.CharField(source='student.display_name', read_only=True)
     course_code = serializers.CharField(source='course.code', read_only=True)
@@ -0,0 +1,46 @@
+from .activity import (
+    decay_activity_streaks,
+    process_activity_rollups,
+    process_daily_rollups,
+    rebuild_daily_rollups,
+    prune_activity_logs,
+)
+from .achievements import achievements_overview, invalidate_category_overview
+from .auto_approval import auto_approve_claims, compile_conditions
+from .curriculum import curriculum_graph, validate_registrations
+from .milestones import evaluate_milestones, recompute_goal_progress
+from .points import (
+    approve_achievement_claims,
+    approve_reward_claims,
+    reconcile_points,
+    reverse_ledger_entry,
+)
+from .progress import (
+    refresh_unit_progress,
+    rebuild_progress_snapshots,
+)
+from .registrations import bulk_approve_registrations, sync_approved_registrations
+
+__all__ = [
+    "achievements_overview",
+    "invalidate_category_overview",
+    "decay_activity_streaks",
+    "process_activity_rollups",
+    "process_daily_rollups",
+    "rebuild_daily_rollups",
+    "prune_activity_logs",
+    "auto_approve_claims",
+    "compile_conditions",
+    "curriculum_graph",
+    "validate_registrations",
+    "evaluate_milestones",
+    "recompute_goal_progress",
+    "approve_achievement_claims",
+    "approve_reward_claims",
+    "reconcile_points",
+    "reverse_ledger_entry",
+    "refresh_unit_progress",
+    "rebuild_progress_snapshots",
+    "bulk_approve_registrations",
+    "sync_approved_registrations",
+]
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+from collections import defaultdict
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Exists, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from core.cache import DEFAULT_TIMEOUT, bump_version, versioned_key
+from learning.achievement_models import Achievement, AchievementPrerequisiteClosure, StudentAchievement
+
+OVERVIEW_CACHE_NAMESPACE = "achievement-overview"
+
+
+def invalidate_category_overview(category_id) -> None:
+    """Drops every cached overview (all terms and scopes) for a category."""
+    if category_id is not None:
+        bump_version(OVERVIEW_CACHE_NAMESPACE, category_id)
+
+
+def achievements_overview(category, term: str, user, serialize) -> list:
+    """
+    Achievements in ``category`` with claim counts for ``term``.
+
+    Students get their own ``claimed_count``; everyone else gets
+    ``total_claims``/``approved_claims``. The counts come from one query with
+    conditional aggregation grouped by achievement, and the serialized result
+    is cached per (category, term, scope) until a claim in the category is
+    created, approved or removed. ``serialize`` turns an Achievement into the
+    base dict (normally the viewset's serializer).
+    """
+    is_student = user.role == "student"
+    scope = f"student-{user.id}" if is_student else "staff"
+    key = versioned_key(OVERVIEW_CACHE_NAMESPACE, category.pk, term, scope)
+    data = cache.get(key)
+    if data is not None:
+        return data
+
+    in_term = Q(student_achievements__term=term)
+    if is_student:
+        counts = {"claimed_count": Count("student_achievements", filter=in_term & Q(student_achievements__student=user))}
+    else:
+        counts = {
+            "total_claims": Count("student_achievements", filter=in_term),
+            "approved_claims": Count(
+                "student_achievements", filter=in_term & Q(student_achievements__approved_by__isnull=False)
+            ),
+        }
+    achievements = (
+        Achievement.objects.filter(category=category)
+        .select_related("category")
+        .prefetch_related("prerequisites")
+        .annotate(**counts)
+        .order_by("id")
+    )
+
+    data = []
+    for achievement in achievements:
+        row = dict(serialize(achievement))
+        row.update({name: getattr(achievement, name) for name in counts})
+        data.append(row)
+    cache.set(key, data, DEFAULT_TIMEOUT)
+    return data
+
+
+class PrerequisiteCycleError(ValueError):
+    """Raised when adding prerequisites would make an achievement depend on itself."""
+
+
+def creates_prerequisite_cycle(achievement_id: int, prerequisite_ids) -> bool:
+    """True when making ``prerequisite_ids`` prerequisites of the achievement would close a cycle."""
+    prerequisite_ids = set(prerequisite_ids)
+    if achievement_id in prerequisite_ids:
+        return True
+    return AchievementPrerequisiteClosure.objects.filter(
+        achievement_id__in=prerequisite_ids, prerequisite_id=achievement_id
+    ).exists()
+
+
+def rebuild_prerequisite_closure() -> int:
+    """
+    Recomputes AchievementPrerequisiteClosure from the prerequisite edges with
+    a breadth-first walk per achievement (shortest depth wins). The catalogue
+    is small, so a full rebuild on every graph change keeps this simple.
+    Returns the number of closure rows written.
+    """
+    edges = defaultdict(set)
+    for achievement_id, prerequisite_id in Achievement.prerequisites.through.objects.values_list(
+        "from_achievement_id", "to_achievement_id"
+    ):
+        edges[achievement_id].add(prerequisite_id)
+
+    rows = []
+    for achievement_id in edges:
+        depths = {}
+        frontier, depth = edges[achievement_id], 1
+        while frontier:
+            frontier = {node for node in frontier if node not in depths and node != achievement_id}
+            for node in frontier:
+                depths[node] = depth
+            frontier = set().union(*(edges.get(node, ()) for node in frontier))
+            depth += 1
+        rows.extend(
+            AchievementPrerequisiteClosure(achievement_id=achievement_id, prerequisite_id=node, depth=node_depth)
+            for node, node_depth in depths.items()
+        )
+
+    with transaction.atomic():
+        AchievementPrerequisiteClosure.objects.all().delete()
+        AchievementPrerequisiteClosure.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def achievement_availability(student, term: str, achievements=None):
+    """
+    Annotates achievements (all by default) with ``current_claims`` for the
+    student in ``term`` and ``unmet_prerequisites``, the number of direct or
+    indirect prerequisites the student has no approved claim for. Both come
+    from the closure table and conditional aggregation in a single query.
+    """
+    if achievements is None:
+        achievements = Achievement.objects.all()
+    approved = StudentAchievement.objects.filter(
+        student=student, achievement_id=OuterRef("prerequisite_id"), approved_by__isnull=False
+    )
+    unmet = (
+        AchievementPrerequisiteClosure.objects.filter(achievement_id=OuterRef("pk"))
+        .filter(~Exists(approved))
+        .order_by()
+        .values("achievement_id")
+        .annotate(total=Count("id"))
+        .values("total")
+    )
+    return achievements.annotate(
+        current_claims=Count(
+            "student_achievements",
+            filter=Q(student_achievements__student=student, student_achievements__term=term),
+        ),
+        unmet_prerequisites=Coalesce(Subquery(unmet, output_field=IntegerField()), Value(0)),
+    )
+
+
+def availability_row(achievement) -> dict:
+    """Claimability for an achievement annotated by ``achievement_availability``."""
+    can_claim = achievement.current_claims < achievement.max_claims_per_term if achievement.max_claims_per_term else True
+    prerequisites_met = achievement.unmet_prerequisites == 0
+    return {
+        "achievement": achievement.pk,
+        "name": achievement.name,
+        "category": achievement.category_id,
+        "can_claim": can_claim and prerequisites_met,
+        "current_claims": achievement.current_claims,
+        "max_claims": achievement.max_claims_per_term,
+        "prerequisites_met": prerequisites_met,
+        "unmet_prerequisites": achievement.unmet_prerequisites,
+    }
@@ -0,0 +1,360 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Max, Q, Sum
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+
+from core.models import ProcessingWatermark
+from core.terms import term_for_date
+from learning.progress_models import ActivityDailyRollup, ActivityLog, StudentProgress
+
+ROLLUP_WATERMARK = "learning.activity-rollups"
+DAILY_ROLLUP_WATERMARK = "learning.activity-daily-rollups"
+BITMAP_DAYS = 63
+_BITMAP_MASK = (1 << BITMAP_DAYS) - 1
+SCORE_WINDOW_DAYS = 28
+
+
+def mark_active_day(bitmap: int, anchor: date | None, day: date) -> tuple[int, date]:
+    """
+    Records ``day`` in a daily-activity bitmap where bit ``i`` means "active on
+    anchor - i days". Moving the anchor forward shifts older days up; days more
+    than ``BITMAP_DAYS`` before the anchor fall off.
+    """
+    if anchor is None:
+        return 1, day
+    if day > anchor:
+        shift = (day - anchor).days
+        bitmap = (bitmap << shift) & _BITMAP_MASK if shift < BITMAP_DAYS else 0
+        return bitmap | 1, day
+    offset = (anchor - day).days
+    if offset < BITMAP_DAYS:
+        bitmap |= 1 << offset
+    return bitmap, anchor
+
+
+def streak_length(bitmap: int) -> int:
+    """Consecutive active days ending on the anchor day."""
+    streak = 0
+    while bitmap & 1:
+        streak += 1
+        bitmap >>= 1
+    return streak
+
+
+def activity_score(bitmap: int) -> float:
+    """Share of the last ``SCORE_WINDOW_DAYS`` (up to the anchor) with any activity, as 0-100."""
+    window = bitmap & ((1 << SCORE_WINDOW_DAYS) - 1)
+    return round(100 * bin(window).count("1") / SCORE_WINDOW_DAYS, 2)
+
+
+def bitmap_as_of(bitmap: int, anchor: date | None, day: date) -> int:
+    """The bitmap re-anchored on ``day`` (a later day shifts in inactive days)."""
+    if anchor is None:
+        return 0
+    shift = (day - anchor).days
+    if shift <= 0:
+        return bitmap
+    return (bitmap << shift) & _BITMAP_MASK if shift < BITMAP_DAYS else 0
+
+
+def activity_as_of(bitmap: int, anchor: date | None, today: date) -> tuple[int, float]:
+    """
+    ``(consecutive_days, activity_score)`` as of ``today``. A streak stays
+    alive through the day after the last active day, so it does not drop to
+    zero overnight before the student has had a chance to continue it.
+    """
+    current = bitmap_as_of(bitmap, anchor, today)
+    return streak_length(current) or streak_length(current >> 1), activity_score(current)
+
+
+def settled_before() -> datetime:
+    """
+    Rows created after this may still sit behind an open transaction holding
+    a lower id, so the id watermarks only consume older rows.
+    """
+    return timezone.now() - timedelta(seconds=getattr(settings, "ACTIVITY_ROLLUP_SETTLE_SECONDS", 120))
+
+
+def process_activity_rollups(
+    batch_size: int = 5000, max_batches: int | None = None, today: date | None = None
+) -> int:
+    """
+    Folds ActivityLog rows newer than the stored watermark into StudentProgress.
+
+    Each batch applies time-spent deltas, last-activity timestamps and the
+    daily-activity bitmap, then advances the watermark inside the same
+    transaction, so the processor can be stopped and rerun without double
+    counting. Only rows older than ``ACTIVITY_ROLLUP_SETTLE_SECONDS`` are
+    consumed, so a row committed late behind a lower id is not skipped.
+    Returns the number of log rows consumed.
+    """
+    today = today or timezone.localdate()
+    processed = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        with transaction.atomic():
+            watermark, _ = ProcessingWatermark.objects.select_for_update().get_or_create(name=ROLLUP_WATERMARK)
+            rows = list(
+                ActivityLog.objects.filter(id__gt=watermark.last_id, created_at__lt=settled_before())
+                .order_by("id")
+                .values_list("id", "student_id", "programme_id", "duration_minutes", "occurred_at", "created_at")[:batch_size]
+            )
+            if not rows:
+                break
+            _apply_rows(rows, today)
+            watermark.last_id = rows[-1][0]
+            watermark.save(update_fields=["last_id", "updated_at"])
+        processed += len(rows)
+        batches += 1
+    return processed
+
+
+def _apply_rows(rows, today: date) -> None:
+    minutes = defaultdict(int)
+    last_seen = {}
+    days = defaultdict(set)
+    for _, student_id, programme_id, duration, occurred_at, created_at in rows:
+        happened = occurred_at or created_at
+        day = timezone.localdate(happened)
+        key = (student_id, programme_id, term_for_date(day))
+        minutes[key] += duration or 0
+        if key not in last_seen or happened > last_seen[key]:
+            last_seen[key] = happened
+        days[key].add(day)
+
+    existing = {
+        (progress.student_id, progress.programme_id, progress.term): progress
+        for progress in StudentProgress.objects.filter(
+            student_id__in={key[0] for key in minutes},
+            programme_id__in={key[1] for key in minutes},
+            term__in={key[2] for key in minutes},
+        )
+    }
+
+    now = timezone.now()
+    to_create, to_update = [], []
+    for key, delta in minutes.items():
+        progress = existing.get(key)
+        if progress is None:
+            progress = StudentProgress(student_id=key[0], programme_id=key[1], term=key[2])
+            to_create.append(progress)
+        else:
+            to_update.append(progress)
+
+        progress.total_time_spent += delta
+        if progress.last_activity_at is None or last_seen[key] > progress.last_activity_at:
+            progress.last_activity_at = last_seen[key]
+        for day in sorted(days[key]):
+            progress.activity_days, progress.activity_anchor = mark_active_day(
+                progress.activity_days, progress.activity_anchor, day
+            )
+        progress.consecutive_days, progress.activity_score = activity_as_of(
+            progress.activity_days, progress.activity_anchor, today
+        )
+        progress.updated_at = now
+
+    StudentProgress.objects.bulk_create(to_create)
+    StudentProgress.objects.bulk_update(
+        to_update,
+        [
+            "total_time_spent",
+            "last_activity_at",
+            "activity_days",
+            "activity_anchor",
+            "consecutive_days",
+            "activity_score",
+            "updated_at",
+        ],
+        batch_size=1000,
+    )
+
+
+def decay_activity_streaks(today: date | None = None) -> int:
+    """
+    Recomputes streaks and activity scores as of ``today`` for students with
+    no new activity today, which the rollup processor never revisits. Each
+    row is refreshed at most once a day and rows already at zero are
+    skipped. Returns the number of rows updated.
+    """
+    today = today or timezone.localdate()
+    start_of_day = timezone.make_aware(datetime.combine(today, time.min))
+    stale = list(
+        StudentProgress.objects.filter(
+            Q(consecutive_days__gt=0) | Q(activity_score__gt=0),
+            activity_anchor__lt=today,
+            updated_at__lt=start_of_day,
+        ).only("id", "activity_days", "activity_anchor")
+    )
+    now = timezone.now()
+    for progress in stale:
+        progress.consecutive_days, progress.activity_score = activity_as_of(
+            progress.activity_days, progress.activity_anchor, today
+        )
+        progress.updated_at = now
+    StudentProgress.objects.bulk_update(stale, ["consecutive_days", "activity_score", "updated_at"], batch_size=1000)
+    return len(stale)
+
+
+def _daily_totals(queryset):
+    return (
+        queryset.annotate(day=TruncDate(Coalesce("occurred_at", "created_at")))
+        .values("day", "programme_id", "activity_type", "helper_type")
+        .annotate(
+            events=Count("id"),
+            minutes=Coalesce(Sum("duration_minutes"), 0),
+            successful=Count("id", filter=Q(was_successful=True)),
+            helped=Count("id", filter=Q(needed_help=True)),
+        )
+        .order_by()
+    )
+
+
+def _merge_daily_totals(totals) -> None:
+    totals = list(totals)
+    if not totals:
+        return
+    existing = {
+        (rollup.day, rollup.programme_id, rollup.activity_type, rollup.helper_type): rollup
+        for rollup in ActivityDailyRollup.objects.filter(
+            day__in={row["day"] for row in totals},
+            programme_id__in={row["programme_id"] for row in totals},
+        )
+    }
+    to_create, to_update = [], []
+    for row in totals:
+        key = (row["day"], row["programme_id"], row["activity_type"], row["helper_type"])
+        rollup = existing.get(key)
+        if rollup is None:
+            rollup = ActivityDailyRollup(
+                day=row["day"],
+                programme_id=row["programme_id"],
+                activity_type=row["activity_type"],
+                helper_type=row["helper_type"],
+            )
+            to_create.append(rollup)
+        else:
+            to_update.append(rollup)
+        rollup.event_count += row["events"]
+        rollup.total_minutes += row["minutes"]
+        rollup.successful_count += row["successful"]
+        rollup.needed_help_count += row["helped"]
+
+    now = timezone.now()
+    for rollup in to_update:
+        rollup.updated_at = now
+    ActivityDailyRollup.objects.bulk_create(to_create, batch_size=1000)
+    ActivityDailyRollup.objects.bulk_update(
+        to_update,
+        ["event_count", "total_minutes", "successful_count", "needed_help_count", "updated_at"],
+        batch_size=1000,
+    )
+
+
+def process_daily_rollups(batch_size: int = 20000, max_batches: int | None = None) -> int:
+    """
+    Adds ActivityLog rows newer than the daily-rollup watermark to ActivityDailyRollup.
+
+    Each batch is grouped in the database by day, programme, activity type and
+    helper type and merged into the rollup rows together with the watermark
+    update. Like the progress processor it only consumes settled rows.
+    Returns the number of log rows consumed.
+    """
+    processed = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        with transaction.atomic():
+            watermark, _ = ProcessingWatermark.objects.select_for_update().get_or_create(name=DAILY_ROLLUP_WATERMARK)
+            pending = ActivityLog.objects.filter(id__gt=watermark.last_id, created_at__lt=settled_before())
+            upper = pending.order_by("id").values_list("id", flat=True)[batch_size - 1:batch_size].first()
+            if upper is None:
+                upper = pending.aggregate(last=Max("id"))["last"]
+            if upper is None:
+                break
+            totals = list(_daily_totals(pending.filter(id__lte=upper)))
+            _merge_daily_totals(totals)
+            watermark.last_id = upper
+            watermark.save(update_fields=["last_id", "updated_at"])
+        processed += sum(row["events"] for row in totals)
+        batches += 1
+    return processed
+
+
+def retention_start() -> date | None:
+    """First day whose raw logs are still kept under ACTIVITY_LOG_RETENTION_DAYS."""
+    days = getattr(settings, "ACTIVITY_LOG_RETENTION_DAYS", None)
+    if not days:
+        return None
+    return timezone.localdate() - timedelta(days=days - 1)
+
+
+def rebuild_daily_rollups(start: date | None = None, end: date | None = None) -> int:
+    """
+    Recomputes ActivityDailyRollup rows for a day range from raw logs already
+    consumed by the daily processor (newer rows are left for it to add).
+
+    Days before the retention window are never rebuilt, because their raw logs
+    may have been pruned. Returns the number of rollup rows written.
+    """
+    earliest = retention_start()
+    if earliest is not None and (start is None or start < earliest):
+        start = earliest
+
+    with transaction.atomic():
+        watermark, _ = ProcessingWatermark.objects.select_for_update().get_or_create(name=DAILY_ROLLUP_WATERMARK)
+        totals = _daily_totals(ActivityLog.objects.filter(id__lte=watermark.last_id))
+        rollups = ActivityDailyRollup.objects.all()
+        if start is not None:
+            totals = totals.filter(day__gte=start)
+            rollups = rollups.filter(day__gte=start)
+        if end is not None:
+            totals = totals.filter(day__lte=end)
+            rollups = rollups.filter(day__lte=end)
+        rollups.delete()
+        created = ActivityDailyRollup.objects.bulk_create(
+            [
+                ActivityDailyRollup(
+                    day=row["day"],
+                    programme_id=row["programme_id"],
+                    activity_type=row["activity_type"],
+                    helper_type=row["helper_type"],
+                    event_count=row["events"],
+                    total_minutes=row["minutes"],
+                    successful_count=row["successful"],
+                    needed_help_count=row["helped"],
+                )
+                for row in totals
+            ],
+            batch_size=1000,
+        )
+    return len(created)
+
+
+def prune_activity_logs(older_than_days: int, chunk_size: int = 5000, dry_run: bool = False) -> int:
+    """
+    Deletes raw ActivityLog rows older than the cutoff, but only rows both
+    rollup processors have already consumed. Returns the number of rows
+    deleted (or that would be deleted with ``dry_run``).
+    """
+    consumed = dict(
+        ProcessingWatermark.objects.filter(name__in=[ROLLUP_WATERMARK, DAILY_ROLLUP_WATERMARK]).values_list("name", "last_id")
+    )
+    safe_id = min(consumed.get(ROLLUP_WATERMARK, 0), consumed.get(DAILY_ROLLUP_WATERMARK, 0))
+    cutoff = timezone.now() - timedelta(days=older_than_days)
+    expired = ActivityLog.objects.filter(created_at__lt=cutoff, id__lte=safe_id).order_by("id")
+    if dry_run:
+        return expired.count()
+
+    deleted = 0
+    while True:
+        ids = list(expired.values_list("id", flat=True)[:chunk_size])
+        if not ids:
+            break
+        ActivityLog.objects.filter(id__in=ids).delete()
+        deleted += len(ids)
+    return deleted
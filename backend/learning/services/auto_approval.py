@@ -0,0 +1,250 @@
+"""
+Rule language for ``Achievement.auto_approve_conditions``.
+
+Rules use the shared syntax in ``rule_syntax``, like milestone
+``custom_criteria``: a condition ``{"type": <metric>, "op": ">=", "threshold": 5}``
+or ``{"all": [...]}``, ``{"any": [...]}``, ``{"not": {...}}``. ``activity_count`` conditions may add
+``"activity_type"`` to count one kind of activity. Rules compile into a ``Q``
+over per-claim metric annotations, so a batch of pending claims is matched
+by the database in one query instead of claim by claim.
+"""
+from __future__ import annotations
+
+import logging
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import Avg, Count, FloatField, IntegerField, Max, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Cast, Coalesce, NullIf
+
+from core.terms import is_valid_term, term_bounds
+from learning.achievement_models import Achievement, StudentAchievement, TermProgress
+from learning.progress_models import ActivityLog, CompletionRecord, StudentProgress
+from learning.services.points import approve_achievement_claims
+from learning.services.rule_syntax import Combination, RuleError, parse_rule
+from learning.session_models import CourseSession, VoiceAttendance
+
+logger = logging.getLogger(__name__)
+
+METRICS = {
+    "activity_count": "Activity log events in the claim's term (optionally one activity_type)",
+    "attendance_rate": "Percentage of completed sessions in the student's programme attended this term",
+    "streak": "Current daily activity streak",
+    "activity_score": "Share of recent days with activity (0-100)",
+    "time_spent": "Minutes of recorded activity in the term",
+    "completions": "Completion records in the term",
+    "completion_score": "Average completion score in the term (0-100)",
+    "points": "Points already earned in the term",
+}
+
+_LOOKUPS = {">=": "gte", ">": "gt", "<=": "lte", "<": "lt", "==": "exact", "!=": "exact"}
+
+
+def _scalar(queryset, aggregate, output_field):
+    """Correlated single-value subquery aggregating ``queryset`` per claim."""
+    return Subquery(
+        queryset.order_by().values("student_id").annotate(value=aggregate).values("value")[:1],
+        output_field=output_field,
+    )
+
+
+def _metric_expression(metric: str, term: str, activity_type: str | None = None):
+    start, end = term_bounds(term)
+    student = OuterRef("student_id")
+    if metric == "activity_count":
+        logs = ActivityLog.objects.annotate(happened=Coalesce("occurred_at", "created_at")).filter(
+            student_id=student, happened__date__gte=start, happened__date__lt=end
+        )
+        if activity_type:
+            logs = logs.filter(activity_type=activity_type)
+        return Coalesce(_scalar(logs, Count("id"), IntegerField()), Value(0))
+    if metric == "attendance_rate":
+        attended = _scalar(
+            VoiceAttendance.objects.filter(student_id=student, session__schedule__term=term, session__status="completed"),
+            Count("id"),
+            IntegerField(),
+        )
+        held = Subquery(
+            CourseSession.objects.filter(
+                schedule__programme_id=OuterRef("student__student_profile__programme_id"),
+                schedule__term=term,
+                status="completed",
+            )
+            .order_by()
+            .values("schedule__programme_id")
+            .annotate(total=Count("id"))
+            .values("total")[:1],
+            output_field=IntegerField(),
+        )
+        return Coalesce(
+            100.0 * Cast(Coalesce(attended, Value(0)), FloatField()) / NullIf(Cast(held, FloatField()), Value(0.0)),
+            Value(0.0),
+        )
+    if metric in ("streak", "activity_score", "time_spent"):
+        progress = StudentProgress.objects.filter(student_id=student, term=term)
+        if metric == "time_spent":
+            return Coalesce(_scalar(progress, Sum("total_time_spent"), IntegerField()), Value(0))
+        field = "consecutive_days" if metric == "streak" else "activity_score"
+        output = IntegerField() if metric == "streak" else FloatField()
+        return Coalesce(_scalar(progress, Max(field), output), Value(0, output_field=output))
+    if metric in ("completions", "completion_score"):
+        records = CompletionRecord.objects.filter(
+            student_id=student, completed_at__date__gte=start, completed_at__date__lt=end
+        )
+        if metric == "completions":
+            return Coalesce(_scalar(records, Count("id"), IntegerField()), Value(0))
+        return Coalesce(_scalar(records, Avg("score"), FloatField()), Value(0.0))
+    # points
+    return Coalesce(
+        Subquery(
+            TermProgress.objects.filter(student_id=student, term=term).values("total_points_earned")[:1],
+            output_field=IntegerField(),
+        ),
+        Value(0),
+    )
+
+
+class CompiledRule:
+    """A rule as a ``Q`` over named annotations, plus the metrics those annotations need."""
+
+    def __init__(self, condition: Q, metrics: dict):
+        self.condition = condition
+        self.metrics = metrics
+
+    def annotations(self, term: str) -> dict:
+        return {
+            name: _metric_expression(metric, term, activity_type)
+            for name, (metric, activity_type) in self.metrics.items()
+        }
+
+    def match(self, claims, term: str):
+        """Filters a StudentAchievement queryset (all in ``term``) down to claims meeting the rule."""
+        return claims.annotate(**self.annotations(term)).filter(self.condition)
+
+
+def compile_conditions(spec) -> CompiledRule:
+    """Compiles an auto_approve_conditions document; raises RuleError when it is invalid."""
+    metrics = {}
+    return CompiledRule(_compile(parse_rule(spec, METRICS, _options), metrics), metrics)
+
+
+def _options(metric: str, spec: dict) -> dict:
+    activity_type = spec.get("activity_type")
+    if activity_type is None:
+        return {}
+    if metric != "activity_count":
+        raise RuleError("'activity_type' only applies to activity_count.")
+    if activity_type not in dict(ActivityLog._meta.get_field("activity_type").choices):
+        raise RuleError(f"Unknown activity_type '{activity_type}'.")
+    return {"activity_type": activity_type}
+
+
+def _compile(node, metrics) -> Q:
+    if isinstance(node, Combination):
+        conditions = [_compile(child, metrics) for child in node.children]
+        if node.kind == "not":
+            return ~conditions[0]
+        condition = conditions[0]
+        for compiled in conditions[1:]:
+            condition = condition & compiled if node.kind == "all" else condition | compiled
+        return condition
+
+    activity_type = node.options.get("activity_type")
+    name = f"rule_{node.metric}" + (f"_{activity_type}" if activity_type else "")
+    metrics[name] = (node.metric, activity_type)
+    condition = Q(**{f"{name}__{_LOOKUPS[node.op]}": node.threshold})
+    return ~condition if node.op == "!=" else condition
+
+
+_compiled_rules = {}
+
+
+def compiled_conditions(achievement) -> CompiledRule | None:
+    """
+    The achievement's compiled rule, cached per process and recompiled
+    whenever the achievement's ``updated_at`` moves. ``None`` when the
+    achievement has no conditions.
+    """
+    if not achievement.auto_approve_conditions:
+        return None
+    cached = _compiled_rules.get(achievement.pk)
+    if cached is not None and cached[0] == achievement.updated_at:
+        return cached[1]
+    compiled = compile_conditions(achievement.auto_approve_conditions)
+    _compiled_rules[achievement.pk] = (achievement.updated_at, compiled)
+    return compiled
+
+
+def forget_compiled_conditions(achievement_id) -> None:
+    _compiled_rules.pop(achievement_id, None)
+
+
+def auto_approver():
+    """
+    The existing account named by ``ACHIEVEMENT_AUTO_APPROVER_USERNAME``, recorded
+    as approver of rule-approved claims. Raises ImproperlyConfigured when the
+    setting is empty or names no user; no account is created here.
+    """
+    from users.models import User
+
+    username = getattr(settings, "ACHIEVEMENT_AUTO_APPROVER_USERNAME", "")
+    if not username:
+        raise ImproperlyConfigured("Set ACHIEVEMENT_AUTO_APPROVER_USERNAME to approve claims automatically.")
+    try:
+        return User.objects.get(username=username)
+    except User.DoesNotExist:
+        raise ImproperlyConfigured(
+            f"ACHIEVEMENT_AUTO_APPROVER_USERNAME names no user: {username!r}."
+        ) from None
+
+
+def auto_approve_claims(achievement_id: int | None = None, batch_size: int = 5000) -> dict:
+    """
+    Approves pending claims whose achievement's auto_approve_conditions hold.
+
+    Pending claims are walked per achievement and term in id-ordered batches
+    of ``batch_size``; each batch is matched with one annotated query and the
+    matches are approved (and credited to the points ledger) together.
+    Returns counts of achievements checked, claims evaluated and approved,
+    achievements skipped for invalid conditions, and claim terms skipped
+    because they are not in the ``"<year>-<trimester>"`` format.
+    """
+    achievements = Achievement.objects.filter(auto_approve_conditions__isnull=False)
+    if achievement_id is not None:
+        achievements = achievements.filter(pk=achievement_id)
+
+    summary = {"achievements": 0, "evaluated": 0, "approved": 0, "invalid": 0, "invalid_terms": 0}
+    approver = None
+    for achievement in achievements:
+        try:
+            rule = compiled_conditions(achievement)
+        except RuleError as exc:
+            logger.warning("Skipping achievement %s with invalid auto_approve_conditions: %s", achievement.pk, exc)
+            summary["invalid"] += 1
+            continue
+        if rule is None:
+            continue
+        summary["achievements"] += 1
+
+        pending = StudentAchievement.objects.filter(achievement=achievement, approved_by__isnull=True)
+        for term in pending.order_by().values_list("term", flat=True).distinct():
+            if not is_valid_term(term):
+                logger.warning("Skipping achievement %s claims with invalid term %r", achievement.pk, term)
+                summary["invalid_terms"] += 1
+                continue
+            in_term = pending.filter(term=term)
+            last_id = 0
+            while True:
+                ids = list(in_term.filter(id__gt=last_id).order_by("id").values_list("id", flat=True)[:batch_size])
+                if not ids:
+                    break
+                batch = in_term.filter(id__gte=ids[0], id__lte=ids[-1])
+                matched = list(rule.match(batch, term).values_list("id", flat=True))
+                if matched:
+                    approver = approver or auto_approver()
+                    summary["approved"] += approve_achievement_claims(
+                        StudentAchievement.objects.filter(id__in=matched), approver
+                    )
+                summary["evaluated"] += len(ids)
+                last_id = ids[-1]
+    return summary
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import logging
+from collections import defaultdict
+
+from core.catalogue import MISSING, catalogue_get, catalogue_key, catalogue_set
+from learning.models import CurriculumUnit, Registration
+
+logger = logging.getLogger(__name__)
+
+
+class CurriculumGraph:
+    """
+    A programme's units and their ``prereq_unit`` edges (only where
+    ``has_prereq`` is set), topologically sorted (prerequisites first) with
+    each unit's full prerequisite chain precomputed, so lookups never touch
+    the database. Prerequisites that belong to other programmes are pulled
+    in with their own chains. Units caught in a cycle left by older data are
+    logged and get no chain, so one bad edge cannot block every registration.
+    """
+
+    def __init__(self, programme_id, codes: dict, prerequisite: dict):
+        self.programme_id = programme_id
+        self.codes = codes
+        self.prerequisite = prerequisite
+        self.order, stuck = _topological_order(prerequisite)
+        self.chains = {}
+        for unit_id in self.order:
+            parent = prerequisite.get(unit_id)
+            self.chains[unit_id] = [parent, *self.chains[parent]] if parent else []
+        if stuck:
+            logger.warning(
+                "Units %s in programme %s are on or behind a prerequisite cycle; ignoring the cycle.",
+                [codes[unit_id] for unit_id in stuck], programme_id,
+            )
+            for unit_id in stuck:
+                self.chains[unit_id] = _chain_until_repeat(unit_id, prerequisite)
+            self.order.extend(stuck)
+
+    def __contains__(self, unit_id):
+        return unit_id in self.codes
+
+    def chain(self, unit_id) -> list:
+        """Every prerequisite of the unit, nearest first."""
+        return self.chains.get(unit_id, [])
+
+    def missing(self, unit_id, completed) -> list:
+        """
+        Prerequisites still to complete before ``unit_id``, starting from the
+        direct prerequisite and following the chain only while the student
+        has not completed the unit above it.
+        """
+        missing = []
+        for prerequisite in self.chain(unit_id):
+            if prerequisite in completed:
+                break
+            missing.append(prerequisite)
+        return missing
+
+
+def _topological_order(prerequisite: dict) -> tuple[list, list]:
+    """Kahn's algorithm over unit -> prerequisite edges; returns the order and the units stuck on a cycle."""
+    dependents = defaultdict(list)
+    waiting = {}
+    for unit_id, parent in prerequisite.items():
+        waiting[unit_id] = 1 if parent else 0
+        if parent:
+            dependents[parent].append(unit_id)
+    ready = [unit_id for unit_id, count in waiting.items() if count == 0]
+    order = []
+    while ready:
+        unit_id = ready.pop()
+        order.append(unit_id)
+        for dependent in dependents[unit_id]:
+            waiting[dependent] -= 1
+            if waiting[dependent] == 0:
+                ready.append(dependent)
+    return order, sorted(set(prerequisite) - set(order))
+
+
+def _chain_until_repeat(unit_id, prerequisite: dict) -> list:
+    """The unit's chain up to the first repeated unit; empty for a unit on the cycle itself."""
+    chain = []
+    parent = prerequisite.get(unit_id)
+    while parent and parent not in chain:
+        if parent == unit_id:
+            return []
+        chain.append(parent)
+        parent = prerequisite.get(parent)
+    return chain
+
+
+def _load_units(unit_filter) -> tuple[dict, dict]:
+    """Codes and prerequisite edges for the matching units plus every prerequisite they reach."""
+    codes, prerequisite = {}, {}
+    fields = ("id", "code", "prereq_unit_id", "has_prereq")
+    rows = CurriculumUnit.objects.filter(**unit_filter).values_list(*fields)
+    while rows:
+        for unit_id, code, parent, has_prereq in rows:
+            codes[unit_id] = code
+            prerequisite[unit_id] = parent if has_prereq else None
+        outside = {parent for parent in prerequisite.values() if parent and parent not in prerequisite}
+        rows = CurriculumUnit.objects.filter(id__in=outside).values_list(*fields) if outside else []
+    return codes, prerequisite
+
+
+def curriculum_graph(programme_id) -> CurriculumGraph:
+    """
+    The programme's prerequisite graph, built from one query (plus one per
+    level of prerequisites in other programmes) and kept in the catalogue
+    cache until any curriculum unit changes.
+    """
+    key = catalogue_key((CurriculumUnit,), "curriculum-graph", programme_id)
+    graph = catalogue_get(key)
+    if graph is MISSING:
+        codes, prerequisite = _load_units({"programme_id": programme_id})
+        graph = CurriculumGraph(programme_id, codes, prerequisite)
+        catalogue_set(key, graph)
+    return graph
+
+
+def creates_unit_cycle(unit_id, prereq_unit_id) -> bool:
+    """
+    True when making ``prereq_unit_id`` the prerequisite of ``unit_id`` would
+    close a cycle. Walks the stored ``prereq_unit`` links (one query per
+    level) rather than the cached graph, so edits earlier in the same
+    transaction are seen.
+    """
+    if not prereq_unit_id or not unit_id:
+        return False
+    seen = set()
+    current = prereq_unit_id
+    while current and current not in seen:
+        if current == unit_id:
+            return True
+        seen.add(current)
+        current = CurriculumUnit.objects.filter(pk=current).values_list("prereq_unit_id", flat=True).first()
+    return False
+
+
+def validate_registrations(pairs) -> list:
+    """
+    Checks (student_id, unit_id) pairs against each student's completed
+    (approved) registrations. Units are looked up in one query, graphs come
+    from the cache, and completions for every student come from one more
+    query. Returns one ``{"student", "unit", "unit_code", "missing"}`` entry
+    per pair whose prerequisites are not met; an empty list means all pass.
+    """
+    pairs = list(pairs)
+    programmes = dict(
+        CurriculumUnit.objects.filter(id__in={unit_id for _, unit_id in pairs}).values_list("id", "programme_id")
+    )
+    graphs = {programme_id: curriculum_graph(programme_id) for programme_id in set(programmes.values())}
+
+    needed = set()
+    for _, unit_id in pairs:
+        graph = graphs.get(programmes.get(unit_id))
+        if graph is not None:
+            needed.update(graph.chain(unit_id))
+    completed = defaultdict(set)
+    if needed:
+        for student_id, unit_id in Registration.objects.filter(
+            student_id__in={student_id for student_id, _ in pairs},
+            unit_id__in=needed,
+            status=Registration.Status.APPROVED,
+        ).values_list("student_id", "unit_id"):
+            completed[student_id].add(unit_id)
+
+    errors = []
+    for student_id, unit_id in pairs:
+        graph = graphs.get(programmes.get(unit_id))
+        if graph is None:
+            continue
+        missing = graph.missing(unit_id, completed[student_id])
+        if missing:
+            errors.append({
+                "student": student_id,
+                "unit": unit_id,
+                "unit_code": graph.codes[unit_id],
+                "missing": [graph.codes[prerequisite] for prerequisite in missing],
+            })
+    return errors
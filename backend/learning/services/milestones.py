@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import logging
+from collections import defaultdict
+from typing import Optional
+
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from core.terms import is_valid_term, term_bounds
+from learning.achievement_models import TermProgress
+from learning.goals_models import LearningGoal, LearningMilestone
+from learning.progress_models import CompletionRecord, StudentProgress
+from learning.services.rules import RuleError, compile_rule
+from learning.session_models import CourseSession, VoiceAttendance
+
+logger = logging.getLogger(__name__)
+
+
+def _collect_metrics(keys):
+    """
+    Returns ``{(student_id, programme_id, term): metrics}`` for the given keys,
+    plus each student's completed resource ids (in any term, for required
+    resources), using one grouped query per source and per term.
+    """
+    student_ids = {key[0] for key in keys}
+    programme_ids = {key[1] for key in keys}
+    terms = {key[2] for key in keys}
+
+    points = {
+        (student_id, term): earned
+        for student_id, term, earned in TermProgress.objects.filter(
+            student_id__in=student_ids, term__in=terms
+        ).values_list("student_id", "term", "total_points_earned")
+    }
+    sessions_held = {
+        (row["schedule__programme_id"], row["schedule__term"]): row["total"]
+        for row in CourseSession.objects.filter(
+            schedule__programme_id__in=programme_ids, schedule__term__in=terms, status="completed"
+        )
+        .values("schedule__programme_id", "schedule__term")
+        .annotate(total=Count("id"))
+        .order_by()
+    }
+    attended = {
+        (row["student_id"], row["session__schedule__programme_id"], row["session__schedule__term"]): row["total"]
+        for row in VoiceAttendance.objects.filter(
+            student_id__in=student_ids,
+            session__schedule__programme_id__in=programme_ids,
+            session__schedule__term__in=terms,
+            session__status="completed",
+        )
+        .values("student_id", "session__schedule__programme_id", "session__schedule__term")
+        .annotate(total=Count("id"))
+        .order_by()
+    }
+    activity = {
+        (student_id, programme_id, term): (time_spent, score, streak)
+        for student_id, programme_id, term, time_spent, score, streak in StudentProgress.objects.filter(
+            student_id__in=student_ids, programme_id__in=programme_ids, term__in=terms
+        ).values_list("student_id", "programme_id", "term", "total_time_spent", "activity_score", "consecutive_days")
+    }
+    completed_resources = defaultdict(set)
+    for student_id, resource_id in (
+        CompletionRecord.objects.filter(student_id__in=student_ids, resource__isnull=False)
+        .values_list("student_id", "resource_id")
+        .distinct()
+    ):
+        completed_resources[student_id].add(resource_id)
+    # The resources_completed metric counts only the term's completions, like the other metrics.
+    term_resources = {}
+    for term in terms:
+        if not is_valid_term(term):
+            continue
+        start, end = term_bounds(term)
+        for student_id, total in (
+            CompletionRecord.objects.filter(
+                student_id__in=student_ids,
+                resource__isnull=False,
+                completed_at__date__gte=start,
+                completed_at__date__lt=end,
+            )
+            .values("student_id")
+            .annotate(total=Count("resource_id", distinct=True))
+            .order_by()
+            .values_list("student_id", "total")
+        ):
+            term_resources[student_id, term] = total
+
+    metrics = {}
+    for key in keys:
+        student_id, programme_id, term = key
+        held = sessions_held.get((programme_id, term), 0)
+        time_spent, score, streak = activity.get(key, (0, 0, 0))
+        metrics[key] = {
+            "points": points.get((student_id, term), 0),
+            "attendance": 100 * attended.get(key, 0) / held if held else 0,
+            "resources_completed": term_resources.get((student_id, term), 0),
+            "time_spent": time_spent,
+            "activity_score": score,
+            "consecutive_days": streak,
+        }
+    return metrics, completed_resources
+
+
+def evaluate_milestones(programme_id: Optional[int] = None) -> dict:
+    """
+    Evaluates every open milestone (optionally for one programme) against the
+    student's points, attendance, completed resources and compiled
+    ``custom_criteria``. Newly met milestones are marked complete and the
+    affected goals' progress_percentage/status are recomputed, all with bulk
+    writes. Milestones with no criterion at all are left to the manual
+    completion flow. Returns counts of evaluated/completed milestones,
+    updated goals, milestones skipped for invalid criteria and manual ones.
+    """
+    milestones = LearningMilestone.objects.filter(completed=False).exclude(goal__status="completed")
+    if programme_id is not None:
+        milestones = milestones.filter(goal__programme_id=programme_id)
+    milestones = list(
+        milestones.values_list(
+            "id", "goal_id", "goal__student_id", "goal__programme_id", "goal__term",
+            "required_points", "required_attendance", "custom_criteria",
+        )
+    )
+    summary = {"evaluated": 0, "completed": 0, "goals_updated": 0, "invalid": 0, "manual": 0}
+    if not milestones:
+        return summary
+
+    required_resources = defaultdict(set)
+    for milestone_id, resource_id in LearningMilestone.required_resources.through.objects.filter(
+        learningmilestone_id__in=[row[0] for row in milestones]
+    ).values_list("learningmilestone_id", "libraryasset_id"):
+        required_resources[milestone_id].add(resource_id)
+    # Milestones without any criterion are completed and verified by hand.
+    automatic = [row for row in milestones if row[5] or row[6] or row[7] or required_resources[row[0]]]
+    summary["manual"] = len(milestones) - len(automatic)
+    summary["evaluated"] = len(automatic)
+    milestones = automatic
+    if not milestones:
+        return summary
+
+    keys = {(row[2], row[3], row[4]) for row in milestones}
+    metrics, completed_resources = _collect_metrics(keys)
+
+    now = timezone.now()
+    met = []
+    for milestone_id, goal_id, student_id, programme, term, points, attendance, criteria in milestones:
+        values = metrics[(student_id, programme, term)]
+        try:
+            predicate = compile_rule(criteria)
+        except RuleError as exc:
+            logger.warning("Skipping milestone %s with invalid custom_criteria: %s", milestone_id, exc)
+            summary["invalid"] += 1
+            continue
+        if (
+            values["points"] >= points
+            and values["attendance"] >= attendance
+            and required_resources[milestone_id] <= completed_resources[student_id]
+            and predicate(values)
+        ):
+            met.append(LearningMilestone(id=milestone_id, goal_id=goal_id, completed=True, completed_at=now, updated_at=now))
+
+    with transaction.atomic():
+        LearningMilestone.objects.bulk_update(met, ["completed", "completed_at", "updated_at"], batch_size=1000)
+        summary["completed"] = len(met)
+        summary["goals_updated"] = recompute_goal_progress({milestone.goal_id for milestone in met})
+    return summary
+
+
+def recompute_goal_progress(goal_ids) -> int:
+    """Recomputes progress_percentage and status for the given goals in one query plus one bulk update."""
+    if not goal_ids:
+        return 0
+    goals = list(
+        LearningGoal.objects.filter(id__in=goal_ids).annotate(
+            milestone_total=Count("milestones"),
+            milestone_done=Count("milestones", filter=Q(milestones__completed=True)),
+        )
+    )
+    now = timezone.now()
+    for goal in goals:
+        goal.progress_percentage = (
+            round(100 * goal.milestone_done / goal.milestone_total, 2) if goal.milestone_total else 0
+        )
+        if goal.milestone_total and goal.milestone_done == goal.milestone_total:
+            goal.status = "completed"
+        elif goal.milestone_done and goal.status == "not_started":
+            goal.status = "in_progress"
+        goal.updated_at = now
+    LearningGoal.objects.bulk_update(goals, ["progress_percentage", "status", "updated_at"], batch_size=1000)
+    return len(goals)
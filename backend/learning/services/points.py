@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import uuid
+
+from django.db import transaction
+from django.db.models import Count, Exists, F, IntegerField, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from learning.achievement_models import PointsLedgerEntry, RewardClaim, StudentAchievement, TermProgress
+from learning.services.achievements import invalidate_category_overview
+
+
+def _ledger_sum(entries, **filters):
+    """Per-(student, term) subquery summing ledger deltas, for use in TermProgress updates."""
+    return Coalesce(
+        Subquery(
+            entries.filter(student_id=OuterRef("student_id"), term=OuterRef("term"), **filters)
+            .order_by()
+            .values("student_id")
+            .annotate(total=Sum("delta"))
+            .values("total"),
+            output_field=IntegerField(),
+        ),
+        Value(0),
+    )
+
+
+def _ledger_count(entries, **filters):
+    """Per-(student, term) count of ledger entries, less the reversals (entries moving the other way)."""
+    return Coalesce(
+        Subquery(
+            entries.filter(student_id=OuterRef("student_id"), term=OuterRef("term"), **filters)
+            .order_by()
+            .values("student_id")
+            .annotate(total=Count("id", filter=Q(delta__lt=0)) - Count("id", filter=Q(delta__gt=0)))
+            .values("total"),
+            output_field=IntegerField(),
+        ),
+        Value(0),
+    )
+
+
+def _ensure_progress(pairs) -> None:
+    TermProgress.objects.bulk_create(
+        [TermProgress(student_id=student_id, term=term) for student_id, term in pairs],
+        ignore_conflicts=True,
+    )
+
+
+def _apply_batch(batch_id, pairs) -> None:
+    """Adds one batch's ledger entries to the affected TermProgress rows in a single UPDATE."""
+    _ensure_progress(pairs)
+    entries = PointsLedgerEntry.objects.filter(batch_id=batch_id)
+    progress = TermProgress.objects.filter(
+        Exists(entries.filter(student_id=OuterRef("student_id"), term=OuterRef("term"))),
+        student_id__in={student_id for student_id, _ in pairs},
+    )
+    progress.update(
+        total_points_earned=F("total_points_earned") + _ledger_sum(entries, kind=PointsLedgerEntry.Kind.EARNED),
+        total_points_spent=F("total_points_spent") - _ledger_sum(entries, kind=PointsLedgerEntry.Kind.SPENT),
+        rewards_claimed_count=F("rewards_claimed_count") + _ledger_count(entries, kind=PointsLedgerEntry.Kind.SPENT),
+        updated_at=timezone.now(),
+    )
+
+
+def approve_achievement_claims(claims, approver) -> int:
+    """
+    Approves the pending claims in ``claims`` and credits their points.
+
+    Claims are approved with one UPDATE, one earned ledger entry is inserted
+    per claim, and TermProgress balances move with one F()-expression UPDATE,
+    all in one transaction, so the statement count does not depend on how
+    many claims are approved. Returns the number of claims approved.
+    """
+    with transaction.atomic():
+        pending = list(
+            claims.select_for_update(of=("self",))
+            .filter(approved_by__isnull=True)
+            .order_by("id")
+            .values_list("id", "student_id", "term", "points_earned", "achievement__category_id")
+        )
+        if not pending:
+            return 0
+
+        now = timezone.now()
+        batch_id = uuid.uuid4()
+        StudentAchievement.objects.filter(id__in=[row[0] for row in pending]).update(
+            approved_by=approver, approved_at=now, updated_at=now
+        )
+        PointsLedgerEntry.objects.bulk_create(
+            [
+                PointsLedgerEntry(
+                    student_id=student_id,
+                    term=term,
+                    kind=PointsLedgerEntry.Kind.EARNED,
+                    delta=points,
+                    student_achievement_id=claim_id,
+                    batch_id=batch_id,
+                    recorded_by=approver,
+                )
+                for claim_id, student_id, term, points, _ in pending
+            ],
+            batch_size=1000,
+        )
+        _apply_batch(batch_id, {(row[1], row[2]) for row in pending})
+        transaction.on_commit(lambda: _after_achievement_approval(pending))
+    return len(pending)
+
+
+def _after_achievement_approval(pending) -> None:
+    # QuerySet.update() sends no post_save, so refresh caches and leaderboards here.
+    for category_id in {row[4] for row in pending}:
+        invalidate_category_overview(category_id)
+    _sync_term_boards({(row[1], row[2]) for row in pending})
+
+
+def _sync_term_boards(pairs) -> None:
+    """Rewrites the term leaderboards for the given ``(student_id, term)`` pairs."""
+    from rewards import leaderboard
+
+    by_term = {}
+    for student_id, term in pairs:
+        by_term.setdefault(term, set()).add(student_id)
+    for term, student_ids in by_term.items():
+        leaderboard.sync_term_points(student_ids, term)
+
+
+def approve_reward_claims(claims, approver) -> int:
+    """
+    Approves the pending reward claims in ``claims`` and debits their points,
+    with the same ledger-then-balance statements as achievement approvals.
+    Returns the number of claims approved.
+    """
+    with transaction.atomic():
+        pending = list(
+            claims.select_for_update()
+            .filter(approved_by__isnull=True)
+            .order_by("id")
+            .values_list("id", "student_id", "term", "points_spent")
+        )
+        if not pending:
+            return 0
+
+        now = timezone.now()
+        batch_id = uuid.uuid4()
+        RewardClaim.objects.filter(id__in=[row[0] for row in pending]).update(
+            approved_by=approver, approved_at=now, updated_at=now
+        )
+        PointsLedgerEntry.objects.bulk_create(
+            [
+                PointsLedgerEntry(
+                    student_id=student_id,
+                    term=term,
+                    kind=PointsLedgerEntry.Kind.SPENT,
+                    delta=-points,
+                    reward_claim_id=claim_id,
+                    batch_id=batch_id,
+                    recorded_by=approver,
+                )
+                for claim_id, student_id, term, points in pending
+            ],
+            batch_size=1000,
+        )
+        _apply_batch(batch_id, {(row[1], row[2]) for row in pending})
+    return len(pending)
+
+
+def reverse_ledger_entry(**claim) -> bool:
+    """
+    Posts an entry cancelling the ledger entry linked to ``claim`` (a
+    ``student_achievement`` or ``reward_claim`` lookup) and moves TermProgress
+    back; reversed earned points also leave the term leaderboards once the
+    transaction commits. Called before an approved claim is deleted, since the
+    link is SET_NULL and would otherwise leave its points on the balance.
+    Returns whether an entry was reversed.
+    """
+    original = PointsLedgerEntry.objects.filter(**claim).first()
+    if original is None:
+        return False
+    with transaction.atomic():
+        batch_id = uuid.uuid4()
+        PointsLedgerEntry.objects.create(
+            student_id=original.student_id,
+            term=original.term,
+            kind=original.kind,
+            delta=-original.delta,
+            batch_id=batch_id,
+        )
+        _apply_batch(batch_id, {(original.student_id, original.term)})
+        if original.kind == PointsLedgerEntry.Kind.EARNED:
+            transaction.on_commit(lambda: _sync_term_boards({(original.student_id, original.term)}))
+    return True
+
+
+def reconcile_points(term: str | None = None) -> int:
+    """
+    Rebuilds TermProgress totals from the ledger (optionally for one term)
+    with one INSERT for missing rows and one UPDATE for all balances.
+    Returns the number of TermProgress rows rewritten.
+    """
+    entries = PointsLedgerEntry.objects.all()
+    progress = TermProgress.objects.all()
+    if term is not None:
+        entries = entries.filter(term=term)
+        progress = progress.filter(term=term)
+
+    with transaction.atomic():
+        _ensure_progress(set(entries.values_list("student_id", "term").distinct().order_by()))
+        return progress.update(
+            total_points_earned=_ledger_sum(entries, kind=PointsLedgerEntry.Kind.EARNED),
+            total_points_spent=-_ledger_sum(entries, kind=PointsLedgerEntry.Kind.SPENT),
+            rewards_claimed_count=_ledger_count(entries, kind=PointsLedgerEntry.Kind.SPENT),
+            updated_at=timezone.now(),
+        )
+
+
+def ledger_drift(term: str | None = None) -> int:
+    """Number of TermProgress rows whose totals disagree with the ledger."""
+    entries = PointsLedgerEntry.objects.all()
+    progress = TermProgress.objects.all()
+    if term is not None:
+        entries = entries.filter(term=term)
+        progress = progress.filter(term=term)
+    return (
+        progress.annotate(
+            ledger_earned=_ledger_sum(entries, kind=PointsLedgerEntry.Kind.EARNED),
+            ledger_spent=-_ledger_sum(entries, kind=PointsLedgerEntry.Kind.SPENT),
+        )
+        .filter(~Q(total_points_earned=F("ledger_earned")) | ~Q(total_points_spent=F("ledger_spent")))
+        .count()
+    )
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from decimal import Decimal
+from typing import Iterable, Optional
+
+from django.db import transaction
+from django.utils import timezone
+
+from learning.models import Registration, Submission, UnitProgressSnapshot
+
+_SNAPSHOT_FIELDS = (
+    "is_registered",
+    "submission_count",
+    "graded_count",
+    "grade_sum",
+    "average_grade",
+    "completed",
+    "submissions",
+)
+
+
+def _snapshot_values(is_registered: bool, rows) -> dict:
+    grades = [row["grade"] for row in rows if row["grade"] is not None]
+    grade_sum = sum(grades, Decimal("0"))
+    average = float(grade_sum) / len(grades) if grades else None
+    return {
+        "is_registered": is_registered,
+        "submission_count": len(rows),
+        "graded_count": len(grades),
+        "grade_sum": grade_sum,
+        "average_grade": average,
+        "completed": average is not None,
+        "submissions": [
+            {
+                "assignment_id": row["assignment_id"],
+                "assignment_title": row["assignment__title"],
+                "grade": float(row["grade"]) if row["grade"] is not None else None,
+            }
+            for row in rows
+        ],
+    }
+
+
+def _submission_rows(queryset):
+    return queryset.order_by("submitted_at", "pk").values(
+        "student_id", "assignment__unit_id", "assignment_id", "assignment__title", "grade"
+    )
+
+
+def refresh_unit_progress(student_id, unit_id, *, create: bool = True) -> Optional[UnitProgressSnapshot]:
+    """
+    Recomputes the snapshot for a single student/unit pair.
+
+    Called from signals whenever a submission or registration changes, so the
+    work is bounded by one student's submissions in one unit. Delete handlers
+    pass ``create=False`` so a cascading delete never resurrects a snapshot.
+    """
+    if not student_id or not unit_id:
+        return None
+
+    is_registered = Registration.objects.filter(
+        student_id=student_id, unit_id=unit_id, status=Registration.Status.APPROVED
+    ).exists()
+    rows = list(_submission_rows(Submission.objects.filter(student_id=student_id, assignment__unit_id=unit_id)))
+
+    if not is_registered and not rows:
+        UnitProgressSnapshot.objects.filter(student_id=student_id, unit_id=unit_id).delete()
+        return None
+
+    values = _snapshot_values(is_registered, rows)
+    if not create:
+        UnitProgressSnapshot.objects.filter(student_id=student_id, unit_id=unit_id).update(
+            updated_at=timezone.now(), **values
+        )
+        return None
+    snapshot, _ = UnitProgressSnapshot.objects.update_or_create(
+        student_id=student_id,
+        unit_id=unit_id,
+        defaults=values,
+    )
+    return snapshot
+
+
+def rebuild_progress_snapshots(student_ids: Optional[Iterable[int]] = None) -> dict:
+    """
+    Recomputes every snapshot (optionally limited to some students) from source
+    rows with set-based queries, fixing any drift. Returns created/updated/deleted counts.
+    """
+    registrations = Registration.objects.filter(status=Registration.Status.APPROVED, unit__isnull=False)
+    submissions = Submission.objects.filter(assignment__unit__isnull=False, student__isnull=False)
+    snapshots = UnitProgressSnapshot.objects.all()
+    if student_ids is not None:
+        student_ids = list(student_ids)
+        registrations = registrations.filter(student_id__in=student_ids)
+        submissions = submissions.filter(student_id__in=student_ids)
+        snapshots = snapshots.filter(student_id__in=student_ids)
+
+    registered = set(registrations.values_list("student_id", "unit_id"))
+    rows_by_pair = defaultdict(list)
+    for row in _submission_rows(submissions).iterator():
+        rows_by_pair[(row["student_id"], row["assignment__unit_id"])].append(row)
+
+    existing = {(s.student_id, s.unit_id): s for s in snapshots}
+    to_create, to_update = [], []
+    for pair in registered | set(rows_by_pair):
+        values = _snapshot_values(pair in registered, rows_by_pair.get(pair, []))
+        snapshot = existing.pop(pair, None)
+        if snapshot is None:
+            to_create.append(UnitProgressSnapshot(student_id=pair[0], unit_id=pair[1], **values))
+        elif any(getattr(snapshot, field) != value for field, value in values.items()):
+            for field, value in values.items():
+                setattr(snapshot, field, value)
+            to_update.append(snapshot)
+
+    with transaction.atomic():
+        UnitProgressSnapshot.objects.bulk_create(to_create, batch_size=1000)
+        # bulk_update bypasses auto_now, so stamp updated_at for ETag consumers.
+        if to_update:
+            now = timezone.now()
+            for snapshot in to_update:
+                snapshot.updated_at = now
+            UnitProgressSnapshot.objects.bulk_update(to_update, [*_SNAPSHOT_FIELDS, "updated_at"], batch_size=1000)
+        stale = [snapshot.pk for snapshot in existing.values()]
+        if stale:
+            UnitProgressSnapshot.objects.filter(pk__in=stale).delete()
+
+    return {"created": len(to_create), "updated": len(to_update), "deleted": len(existing)}
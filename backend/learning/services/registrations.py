@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Iterable
+
+from django.db import transaction
+from django.utils import timezone
+
+from core.models import CalendarEvent
+from core.services import notify_each, upsert_calendar_events
+from learning.models import Registration
+from learning.services.curriculum import validate_registrations
+from learning.services.progress import rebuild_progress_snapshots
+from users.models import ParentStudentLink
+
+APPROVAL_BATCH_SIZE = 500
+APPROVABLE_STATUSES = (Registration.Status.SUBMITTED, Registration.Status.PENDING_HOD)
+
+
+def sync_approved_registrations(registrations: Iterable[Registration], batch_size: int = APPROVAL_BATCH_SIZE) -> None:
+    """
+    Calendar events and "Registration approved" notifications for the student
+    and linked parents of each approved registration. Parents for every
+    student come from one query and the writes are bulk upserts/inserts of
+    ``batch_size`` rows, so the cost does not grow with the number of rows.
+    Callers should ``select_related("unit")``.
+    """
+    registrations = [
+        registration for registration in registrations
+        if registration.status == Registration.Status.APPROVED and registration.student_id
+    ]
+    if not registrations:
+        return
+
+    parents = defaultdict(list)
+    for student_id, parent_id in ParentStudentLink.objects.filter(
+        student_id__in={registration.student_id for registration in registrations}, parent__isnull=False
+    ).values_list("student_id", "parent_id"):
+        parents[student_id].append(parent_id)
+
+    now = timezone.now()
+    events, messages = [], []
+    for registration in registrations:
+        title = registration.unit.title if registration.unit_id else ""
+        # Student and Guardian profiles share their user's primary key.
+        for user_id in dict.fromkeys([registration.student_id, *parents[registration.student_id]]):
+            events.append(CalendarEvent(
+                owner_user_id=user_id,
+                source_type="registration",
+                source_id=str(registration.id),
+                title=f"Registration approved: {title}",
+                start_at=now,
+                description=(
+                    f"{title} registration approved for {registration.academic_year} T{registration.trimester}"
+                ),
+                metadata={
+                    "registration_id": registration.id,
+                    "unit": registration.unit_id,
+                    "status": registration.status,
+                },
+            ))
+            messages.append((
+                user_id, "Registration approved", f"You are cleared for {title}.", {"registration_id": registration.id},
+            ))
+    upsert_calendar_events(events, batch_size=batch_size)
+    notify_each(messages, kind="registration", batch_size=batch_size)
+
+
+def bulk_approve_registrations(registration_ids: Iterable, approved_by, batch_size: int = APPROVAL_BATCH_SIZE) -> list:
+    """
+    Approves submitted or HOD-pending registrations whose prerequisites are
+    met with one set-based UPDATE that records ``approved_by`` and the
+    approval time as a single approval does, then does in bulk what the
+    ``registration_updated`` signal does per row (which ``update()`` does
+    not send): calendar events and notifications, plus progress snapshots for
+    the affected students. The query count is constant in the number of IDs.
+
+    Returns ``{"id", "result"}`` per requested ID, in order, where result is
+    ``approved``, ``already_approved``, ``rejected``, ``not_pending`` (still
+    a draft), ``prerequisites_unmet`` (with the ``missing`` unit codes),
+    ``duplicate`` (repeated in the request), ``not_found`` or ``invalid``.
+    """
+    requested = []
+    for raw in registration_ids:
+        try:
+            requested.append((raw, int(raw)))
+        except (TypeError, ValueError):
+            requested.append((raw, None))
+
+    with transaction.atomic():
+        registrations = {
+            registration.id: registration
+            for registration in Registration.objects.select_for_update(of=("self",))
+            .select_related("unit")
+            .filter(id__in={registration_id for _, registration_id in requested if registration_id is not None})
+        }
+        candidates = [
+            registration for registration in registrations.values() if registration.status in APPROVABLE_STATUSES
+        ]
+        unmet = {
+            (error["student"], error["unit"]): error["missing"]
+            for error in validate_registrations(
+                (registration.student_id, registration.unit_id)
+                for registration in candidates
+                if registration.student_id and registration.unit_id
+            )
+        }
+        pending = [
+            registration for registration in candidates
+            if (registration.student_id, registration.unit_id) not in unmet
+        ]
+        if pending:
+            now = timezone.now()
+            Registration.objects.filter(id__in=[registration.id for registration in pending]).update(
+                status=Registration.Status.APPROVED, approved_by=approved_by, approved_at=now, updated_at=now
+            )
+            for registration in pending:
+                registration.status = Registration.Status.APPROVED
+                registration.approved_by = approved_by
+                registration.approved_at = now
+                registration.updated_at = now
+            sync_approved_registrations(pending, batch_size=batch_size)
+            rebuild_progress_snapshots({registration.student_id for registration in pending if registration.student_id})
+
+    approved = {registration.id for registration in pending}
+    seen = set()
+    results = []
+    for raw, registration_id in requested:
+        row = {"id": raw}
+        registration = registrations.get(registration_id)
+        if registration_id is None:
+            row["result"] = "invalid"
+        elif registration_id in seen:
+            row["result"] = "duplicate"
+        elif registration is None:
+            row["result"] = "not_found"
+        elif registration_id in approved:
+            row["result"] = "approved"
+        elif registration.status == Registration.Status.APPROVED:
+            row["result"] = "already_approved"
+        elif registration.status == Registration.Status.REJECTED:
+            row["result"] = "rejected"
+        elif registration.status not in APPROVABLE_STATUSES:
+            row["result"] = "not_pending"
+        else:
+            row["result"] = "prerequisites_unmet"
+            row["missing"] = unmet[(registration.student_id, registration.unit_id)]
+        seen.add(registration_id)
+        results.append(row)
+    return results
@@ -0,0 +1,70 @@
+"""
+Shared syntax for the rule documents in ``LearningMilestone.custom_criteria``
+and ``Achievement.auto_approve_conditions``.
+
+A rule is either a condition ``{"type": <metric>, "op": ">=", "threshold": 80}``
+or a combination ``{"all": [...]}``, ``{"any": [...]}`` or ``{"not": {...}}``.
+``parse_rule`` validates a document once and returns a tree of ``Condition``
+and ``Combination`` nodes; each back end (Python predicates in ``rules``,
+``Q`` objects in ``auto_approval``) only walks that tree.
+"""
+from __future__ import annotations
+
+import operator
+from typing import Callable, NamedTuple
+
+OPERATORS = {
+    ">=": operator.ge,
+    ">": operator.gt,
+    "<=": operator.le,
+    "<": operator.lt,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+
+class RuleError(ValueError):
+    """Raised when a rule document is not a valid rule."""
+
+
+class Condition(NamedTuple):
+    metric: str
+    op: str
+    threshold: float
+    options: dict
+
+
+class Combination(NamedTuple):
+    kind: str  # "all", "any" or "not"
+    children: tuple
+
+
+def parse_rule(spec, metrics, options: Callable[[str, dict], dict] | None = None):
+    """
+    Validates ``spec`` against the ``metrics`` a back end supports and returns
+    its node tree. ``options(metric, condition)`` may accept extra condition
+    keys; it returns them as a dict or raises RuleError.
+    """
+    if not isinstance(spec, dict):
+        raise RuleError("Each rule must be an object.")
+
+    if "all" in spec or "any" in spec:
+        key = "all" if "all" in spec else "any"
+        children = spec[key]
+        if not isinstance(children, list) or not children:
+            raise RuleError(f"'{key}' must be a non-empty list of rules.")
+        return Combination(key, tuple(parse_rule(child, metrics, options) for child in children))
+
+    if "not" in spec:
+        return Combination("not", (parse_rule(spec["not"], metrics, options),))
+
+    metric = spec.get("type")
+    if metric not in metrics:
+        raise RuleError(f"Unknown metric '{metric}'. Expected one of: {', '.join(sorted(metrics))}.")
+    op_name = spec.get("op", ">=")
+    if op_name not in OPERATORS:
+        raise RuleError(f"Unknown operator '{op_name}'.")
+    threshold = spec.get("threshold")
+    if isinstance(threshold, bool) or not isinstance(threshold, (int, float)):
+        raise RuleError("'threshold' must be a number.")
+    return Condition(metric, op_name, threshold, options(metric, spec) if options else {})
@@ -0,0 +1,54 @@
+"""
+Small rule language for ``LearningMilestone.custom_criteria``.
+
+Rules use the shared syntax in ``rule_syntax`` and compile once into plain
+Python predicates over a metrics dict so a nightly run can evaluate
+thousands of milestones without re-parsing JSON.
+"""
+from __future__ import annotations
+
+import json
+from functools import lru_cache
+from typing import Callable
+
+from learning.services.rule_syntax import OPERATORS, Condition, RuleError, parse_rule
+
+METRICS = {
+    "points": "Points earned in the goal's term",
+    "attendance": "Attendance percentage for the goal's programme and term",
+    "resources_completed": "Distinct library resources completed in the goal's term",
+    "time_spent": "Minutes of recorded activity in the goal's term",
+    "activity_score": "Share of recent days with activity (0-100)",
+    "consecutive_days": "Current daily activity streak",
+}
+
+Predicate = Callable[[dict], bool]
+
+
+def _always(metrics: dict) -> bool:
+    return True
+
+
+def _compile(node) -> Predicate:
+    if isinstance(node, Condition):
+        compare = OPERATORS[node.op]
+        metric, threshold = node.metric, node.threshold
+        return lambda metrics: compare(metrics.get(metric) or 0, threshold)
+    predicates = [_compile(child) for child in node.children]
+    if node.kind == "not":
+        inner = predicates[0]
+        return lambda metrics: not inner(metrics)
+    combine = all if node.kind == "all" else any
+    return lambda metrics: combine(predicate(metrics) for predicate in predicates)
+
+
+@lru_cache(maxsize=1024)
+def _compile_cached(serialized: str) -> Predicate:
+    return _compile(parse_rule(json.loads(serialized), METRICS))
+
+
+def compile_rule(spec) -> Predicate:
+    """Compiles a rule document (or None/empty for "no extra criteria") into a predicate."""
+    if not spec:
+        return _always
+    return _compile_cached(json.dumps(spec, sort_keys=True))
@@ -19,6 +19,7 @@ class CourseSchedule(TimeStampedModel):
     
     class Meta:
         ordering = ['day_of_week', 'start_time']
+        indexes = [models.Index(fields=['day_of_week', 'start_time'])]
 
     def __str__(self):
         days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
@@ -42,6 +43,7 @@ class CourseSession(TimeStampedModel):
     
     class Meta:
         ordering = ['-date', '-actual_start']
+        indexes = [models.Index(fields=['date', 'actual_start'])]
         
     def __str__(self):
         return f"{self.schedule.programme.code} - {self.date}"
@@ -66,6 +68,7 @@ class VoiceAttendance(TimeStampedModel):
     class Meta:
         unique_together = ['student', 'session']
         ordering = ['-created_at']
+        indexes = [models.Index(fields=['created_at'])]
         
     def __str__(self):
         return f"{self.student.user.username} - {self.session.date}"
@@ -88,6 +91,7 @@ class SessionReminder(TimeStampedModel):
     
     class Meta:
         ordering = ['-scheduled_for']
+        indexes = [models.Index(fields=['scheduled_for'])]
         unique_together = ['session', 'student', 'reminder_type']
         
     def __str__(self):
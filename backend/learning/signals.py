@@ -1,4 +1,5 @@
-from django.db.models.signals import post_delete, post_save
+from django.contrib.auth import get_user_model
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
 from django.dispatch import receiver
 from django.utils import timezone
 
@@ -7,7 +8,18 @@ from core.services import (
     remove_calendar_events_for_source,
     upsert_calendar_events_for_users,
 )
-from learning.models import Assignment, Registration
+from learning.achievement_models import Achievement, RewardClaim, StudentAchievement
+from learning.models import Assignment, CurriculumUnit, Registration, Submission
+from learning.services.achievements import (
+    PrerequisiteCycleError,
+    creates_prerequisite_cycle,
+    invalidate_category_overview,
+    rebuild_prerequisite_closure,
+)
+from learning.services.auto_approval import forget_compiled_conditions
+from learning.services.points import reverse_ledger_entry
+from learning.services.progress import rebuild_progress_snapshots, refresh_unit_progress
+from learning.services.registrations import sync_approved_registrations
 
 
 def _unique_users(users):
@@ -57,6 +69,15 @@ def assignment_upsert(sender, instance: Assignment, created, **kwargs):
         )
 
 
+@receiver(post_save, sender=Assignment)
+def assignment_progress_changed(sender, instance: Assignment, created, **kwargs):
+    # Snapshots copy the assignment title; refresh the students who submitted to it.
+    if not created:
+        student_ids = set(Submission.objects.filter(assignment=instance).values_list("student_id", flat=True))
+        if student_ids:
+            rebuild_progress_snapshots(student_ids)
+
+
 @receiver(post_delete, sender=Assignment)
 def assignment_removed(sender, instance: Assignment, **kwargs):
     remove_calendar_events_for_source("assignment", str(instance.id))
@@ -69,35 +90,78 @@ def registration_updated(sender, instance: Registration, created, **kwargs):
             remove_calendar_events_for_source("registration", str(instance.id))
         return
 
-    owners = [instance.student]
-    parents = [
-        link.parent for link in instance.student.parent_links.select_related("parent").all()
-    ]
-    owners.extend(parents)
-    owners = _unique_users(owners)
+    sync_approved_registrations([instance])
 
-    upsert_calendar_events_for_users(
-        owners,
-        source_type="registration",
-        source_id=str(instance.id),
-        title=f"Registration approved: {instance.unit.title}",
-        start_at=timezone.now(),
-        description=f"{instance.unit.title} registration approved for {instance.academic_year} T{instance.trimester}",
-        metadata={
-            "registration_id": instance.id,
-            "unit": instance.unit_id,
-            "status": instance.status,
-        },
+
+@receiver(post_delete, sender=Registration)
+def registration_deleted(sender, instance: Registration, **kwargs):
+    remove_calendar_events_for_source("registration", str(instance.id))
+
+
+@receiver(post_save, sender=Registration)
+@receiver(post_delete, sender=Registration)
+def registration_progress_changed(sender, instance: Registration, **kwargs):
+    refresh_unit_progress(instance.student_id, instance.unit_id, create=kwargs.get("signal") is post_save)
+
+
+@receiver(post_save, sender=Submission)
+@receiver(post_delete, sender=Submission)
+def submission_progress_changed(sender, instance: Submission, **kwargs):
+    unit_id = Assignment.objects.filter(pk=instance.assignment_id).values_list("unit_id", flat=True).first()
+    refresh_unit_progress(instance.student_id, unit_id, create=kwargs.get("signal") is post_save)
+
+
+@receiver(post_save, sender=StudentAchievement)
+@receiver(post_delete, sender=StudentAchievement)
+def student_achievement_changed(sender, instance: StudentAchievement, **kwargs):
+    category_id = (
+        Achievement.objects.filter(pk=instance.achievement_id).values_list("category_id", flat=True).first()
     )
+    invalidate_category_overview(category_id)
 
-    notify_users(
-        owners,
-        "Registration approved",
-        f"You are cleared for {instance.unit.title}.",
-        kind="registration",
+
+@receiver(pre_delete, sender=StudentAchievement)
+@receiver(pre_delete, sender=RewardClaim)
+def approved_claim_deleted(sender, instance, origin=None, **kwargs):
+    # Deleting the student cascades away their ledger and balances, so there is nothing to reverse.
+    if isinstance(origin, get_user_model()):
+        return
+    link = "student_achievement" if sender is StudentAchievement else "reward_claim"
+    reverse_ledger_entry(**{link: instance})
+
+
+@receiver(pre_save, sender=Achievement)
+def achievement_category_before_save(sender, instance: Achievement, **kwargs):
+    # Remember the stored category so a move also refreshes the overview it left.
+    instance._previous_category_id = (
+        Achievement.objects.filter(pk=instance.pk).values_list("category_id", flat=True).first() if instance.pk else None
     )
 
 
-@receiver(post_delete, sender=Registration)
-def registration_deleted(sender, instance: Registration, **kwargs):
-    remove_calendar_events_for_source("registration", str(instance.id))
+@receiver(post_save, sender=Achievement)
+@receiver(post_delete, sender=Achievement)
+def achievement_changed(sender, instance: Achievement, **kwargs):
+    forget_compiled_conditions(instance.pk)
+    for category_id in {instance.category_id, getattr(instance, "_previous_category_id", None)}:
+        invalidate_category_overview(category_id)
+    if kwargs.get("signal") is post_delete:
+        # Cascaded edge deletes send no m2m_changed, and paths through this achievement are gone.
+        rebuild_prerequisite_closure()
+
+
+@receiver(m2m_changed, sender=Achievement.prerequisites.through)
+def achievement_prerequisites_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == "pre_add":
+        cycle = any(creates_prerequisite_cycle(pk, [instance.pk]) for pk in pk_set) if reverse else (
+            creates_prerequisite_cycle(instance.pk, pk_set)
+        )
+        if cycle:
+            raise PrerequisiteCycleError("Prerequisites cannot depend on the achievement itself.")
+    elif action in ("post_add", "post_remove", "post_clear"):
+        rebuild_prerequisite_closure()
+
+
+@receiver(pre_save, sender=CurriculumUnit)
+def curriculum_unit_prerequisite_guard(sender, instance: CurriculumUnit, **kwargs):
+    # Writers that skip full_clean() still get the model's prerequisite check.
+    instance.clean()
@@ -0,0 +1,38 @@
+from celery import shared_task
+from django.conf import settings
+
+from .services.activity import (
+    decay_activity_streaks,
+    process_activity_rollups,
+    process_daily_rollups,
+    prune_activity_logs,
+)
+from .services.auto_approval import auto_approve_claims
+from .services.milestones import evaluate_milestones
+
+
+@shared_task
+def rollup_activity_logs():
+    return {
+        "progress": process_activity_rollups(),
+        "daily": process_daily_rollups(),
+        "decayed": decay_activity_streaks(),
+    }
+
+
+@shared_task
+def prune_expired_activity_logs():
+    days = getattr(settings, "ACTIVITY_LOG_RETENTION_DAYS", None)
+    if not days:
+        return 0
+    return prune_activity_logs(days)
+
+
+@shared_task
+def evaluate_learning_milestones(programme_id=None):
+    return evaluate_milestones(programme_id)
+
+
+@shared_task
+def auto_approve_achievement_claims(achievement_id=None):
+    return auto_approve_claims(achievement_id)
@@ -0,0 +1,113 @@
+from django.db import transaction
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from learning.achievement_models import (
+    Achievement,
+    AchievementCategory,
+    AchievementPrerequisiteClosure,
+    StudentAchievement,
+)
+from learning.services.achievements import PrerequisiteCycleError
+from users.models import Guardian, ParentStudentLink, Student, User
+
+
+class AchievementPrerequisiteTests(TestCase):
+
+    def setUp(self):
+        self.category = AchievementCategory.objects.create(name='Reading', icon='book')
+        self.first, self.second, self.third = [
+            Achievement.objects.create(
+                category=self.category, name=name, description='', icon='star', voice_message='Well done',
+                max_claims_per_term=2,
+            )
+            for name in ('First book', 'Second book', 'Third book')
+        ]
+        self.second.prerequisites.add(self.first)
+        self.third.prerequisites.add(self.second)
+        self.student = User.objects.create_user(username='teststudent', role=User.Roles.STUDENT)
+        self.lecturer = User.objects.create_user(username='lecturer', role=User.Roles.LECTURER)
+        self.client = APIClient()
+        self.client.force_authenticate(self.student)
+
+    def _claim(self, achievement, approved=True):
+        return StudentAchievement.objects.create(
+            student=self.student, achievement=achievement, points_earned=5, term='2025-1',
+            approved_by=self.lecturer if approved else None, approved_at=timezone.now() if approved else None,
+        )
+
+    def test_closure_holds_transitive_prerequisites(self):
+        closure = set(AchievementPrerequisiteClosure.objects.values_list('achievement_id', 'prerequisite_id', 'depth'))
+        self.assertEqual(closure, {
+            (self.second.pk, self.first.pk, 1),
+            (self.third.pk, self.second.pk, 1),
+            (self.third.pk, self.first.pk, 2),
+        })
+        self.second.prerequisites.remove(self.first)
+        self.assertEqual(
+            set(AchievementPrerequisiteClosure.objects.values_list('achievement_id', 'prerequisite_id')),
+            {(self.third.pk, self.second.pk)},
+        )
+
+    def test_cycles_are_rejected(self):
+        with self.assertRaises(PrerequisiteCycleError), transaction.atomic():
+            self.first.prerequisites.add(self.third)
+        with self.assertRaises(PrerequisiteCycleError), transaction.atomic():
+            self.first.unlocks.add(self.first)
+        self.assertFalse(self.first.prerequisites.exists())
+
+    def test_serializer_rejects_cycles(self):
+        self.lecturer.is_staff = True
+        self.lecturer.save()
+        self.client.force_authenticate(self.lecturer)
+        response = self.client.patch(
+            f'/api/learning/achievements/{self.first.pk}/', {'prerequisites': [self.third.pk]}, format='json'
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('prerequisites', response.data)
+
+    def test_availability_for_every_achievement_in_one_query(self):
+        self._claim(self.first)
+        self._claim(self.first)
+        self._claim(self.second, approved=False)
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/learning/achievements/availability/', {'term': '2025-1'})
+        self.assertEqual(response.status_code, 200)
+        rows = {row['name']: row for row in response.data}
+        self.assertEqual(
+            (rows['First book']['can_claim'], rows['First book']['current_claims']), (False, 2)
+        )
+        self.assertTrue(rows['Second book']['can_claim'])
+        # Third needs Second approved, and transitively First.
+        self.assertEqual(
+            (rows['Third book']['prerequisites_met'], rows['Third book']['unmet_prerequisites']), (False, 1)
+        )
+
+    def test_availability_for_another_student_is_restricted(self):
+        url = '/api/learning/achievements/availability/'
+        self.client.force_authenticate(self.lecturer)
+        self.assertEqual(self.client.get(url, {'term': '2025-1', 'student': 'abc'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'term': '2025-1', 'student': self.student.pk}).status_code, 200)
+
+        parent = User.objects.create_user(username='parent', role=User.Roles.PARENT)
+        guardian = Guardian.objects.create(user=parent)
+        self.client.force_authenticate(parent)
+        self.assertEqual(self.client.get(url, {'term': '2025-1', 'student': self.student.pk}).status_code, 403)
+        ParentStudentLink.objects.create(parent=guardian, student=Student.objects.create(
+            user=self.student, year=1, trimester=1, trimester_label='T1', cohort_year=2025,
+        ))
+        self.assertEqual(self.client.get(url, {'term': '2025-1', 'student': self.student.pk}).status_code, 200)
+
+        self.client.force_authenticate(User.objects.create_user(username='guest', role=User.Roles.GUEST))
+        self.assertEqual(self.client.get(url, {'term': '2025-1', 'student': self.student.pk}).status_code, 403)
+
+    def test_single_achievement_check_uses_closure(self):
+        response = self.client.get(f'/api/learning/achievements/{self.third.pk}/available_for_student/', {'term': '2025-1'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['can_claim'], response.data['prerequisites_met']), (False, False))
+
+        self._claim(self.first)
+        self._claim(self.second)
+        response = self.client.get(f'/api/learning/achievements/{self.third.pk}/available_for_student/', {'term': '2025-1'})
+        self.assertTrue(response.data['can_claim'])
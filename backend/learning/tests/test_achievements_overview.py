@@ -0,0 +1,108 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from learning.achievement_models import Achievement, AchievementCategory, StudentAchievement
+from users.models import User
+
+
+class AchievementsOverviewTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.category = AchievementCategory.objects.create(name='Attendance', icon='calendar')
+        self.achievements = [
+            Achievement.objects.create(
+                category=self.category, name=f'Badge {index}', description='', icon='star', voice_message='Well done',
+            )
+            for index in range(3)
+        ]
+        self.student = User.objects.create_user(username='teststudent', role=User.Roles.STUDENT)
+        self.lecturer = User.objects.create_user(username='lecturer', role=User.Roles.LECTURER, is_staff=True)
+        self.client = APIClient()
+        self.url = f'/api/learning/achievement-categories/{self.category.pk}/achievements_overview/'
+
+    def _claim(self, achievement, approved=False, term='2025-1', student=None):
+        return StudentAchievement.objects.create(
+            student=student or self.student,
+            achievement=achievement,
+            points_earned=5,
+            term=term,
+            approved_by=self.lecturer if approved else None,
+            approved_at=timezone.now() if approved else None,
+        )
+
+    def test_staff_overview_counts_claims_per_achievement(self):
+        self._claim(self.achievements[0], approved=True)
+        self._claim(self.achievements[0])
+        self._claim(self.achievements[1], term='2024-3')
+        self.client.force_authenticate(self.lecturer)
+        response = self.client.get(self.url, {'term': '2025-1'})
+        self.assertEqual(response.status_code, 200)
+        counts = {row['name']: (row['total_claims'], row['approved_claims']) for row in response.data}
+        self.assertEqual(counts, {'Badge 0': (2, 1), 'Badge 1': (0, 0), 'Badge 2': (0, 0)})
+
+    def test_student_overview_counts_only_own_claims(self):
+        other = User.objects.create_user(username='other', role=User.Roles.STUDENT)
+        self._claim(self.achievements[2])
+        self._claim(self.achievements[2], student=other)
+        self.client.force_authenticate(self.student)
+        response = self.client.get(self.url, {'term': '2025-1'})
+        counts = {row['name']: row['claimed_count'] for row in response.data}
+        self.assertEqual(counts, {'Badge 0': 0, 'Badge 1': 0, 'Badge 2': 1})
+        self.assertNotIn('total_claims', response.data[0])
+
+    def test_query_count_does_not_grow_with_catalogue(self):
+        self.client.force_authenticate(self.lecturer)
+        with self.assertNumQueries(3):
+            self.client.get(self.url, {'term': '2025-1'})
+        for index in range(3, 10):
+            Achievement.objects.create(
+                category=self.category, name=f'Badge {index}', description='', icon='star', voice_message='Well done',
+            )
+        cache.clear()
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url, {'term': '2025-1'})
+        self.assertEqual(len(response.data), 10)
+
+    def test_cached_overview_is_invalidated_by_new_and_approved_claims(self):
+        self.client.force_authenticate(self.lecturer)
+        self.client.get(self.url, {'term': '2025-1'})
+        with self.assertNumQueries(1):
+            self.client.get(self.url, {'term': '2025-1'})
+
+        claim = self._claim(self.achievements[0])
+        response = self.client.get(self.url, {'term': '2025-1'})
+        self.assertEqual((response.data[0]['total_claims'], response.data[0]['approved_claims']), (1, 0))
+
+        claim.approved_by = self.lecturer
+        claim.save()
+        response = self.client.get(self.url, {'term': '2025-1'})
+        self.assertEqual(response.data[0]['approved_claims'], 1)
+
+    def test_term_is_required(self):
+        self.client.force_authenticate(self.lecturer)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 400)
+
+    def test_achievement_edits_show_up_immediately(self):
+        self.client.force_authenticate(self.lecturer)
+        self.client.get(self.url, {'term': '2025-1'})
+
+        badge = self.achievements[0]
+        badge.name = 'Renamed'
+        badge.save()
+        names = [row['name'] for row in self.client.get(self.url, {'term': '2025-1'}).data]
+        self.assertIn('Renamed', names)
+
+        other = AchievementCategory.objects.create(name='Reading', icon='book')
+        other_url = f'/api/learning/achievement-categories/{other.pk}/achievements_overview/'
+        self.client.get(other_url, {'term': '2025-1'})
+        badge.category = other
+        badge.save()
+        self.assertEqual(len(self.client.get(self.url, {'term': '2025-1'}).data), 2)
+        self.assertEqual([row['name'] for row in self.client.get(other_url, {'term': '2025-1'}).data], ['Renamed'])
+
+        self.achievements[1].delete()
+        self.assertEqual(len(self.client.get(self.url, {'term': '2025-1'}).data), 1)
@@ -0,0 +1,95 @@
+from unittest import mock
+
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from learning.models import Department, Programme
+from learning.progress_models import ActivityLog
+from users.models import User, Student
+
+
+class ActivityBatchIngestTests(TestCase):
+
+    def setUp(self):
+        department = Department.objects.create(name='Test Department', code='TD')
+        self.programme = Programme.objects.create(
+            department=department,
+            name='Test Programme',
+            code='TP',
+            award_level='Diploma',
+            duration_years=2,
+            trimesters_per_year=3
+        )
+        self.user = User.objects.create_user(username='teststudent', role=User.Roles.STUDENT)
+        self.student = Student.objects.create(
+            user=self.user,
+            programme=self.programme,
+            year=1,
+            trimester=1,
+            trimester_label='T1',
+            cohort_year=2025
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _event(self, client_id, **overrides):
+        event = {
+            'client_id': client_id,
+            'programme': self.programme.pk,
+            'activity_type': 'resource_view',
+            'occurred_at': '2025-03-01T08:00:00Z',
+            'duration_minutes': 5,
+        }
+        event.update(overrides)
+        return event
+
+    def _post(self, events):
+        return self.client.post('/api/learning/activity/batch/', {'events': events}, format='json')
+
+    def test_batch_reports_per_event_outcome(self):
+        response = self._post([
+            self._event('a'),
+            self._event('b', activity_type='quiz_attempt'),
+            self._event('a'),
+            self._event('c', activity_type='unknown'),
+            self._event('d', programme=999999),
+            self._event('e', needed_help=True),
+        ])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [result['status'] for result in response.data['results']],
+            ['accepted', 'accepted', 'duplicate', 'rejected', 'rejected', 'rejected'],
+        )
+        self.assertEqual(response.data['accepted'], 2)
+        self.assertEqual(ActivityLog.objects.filter(student=self.student).count(), 2)
+
+    def test_resent_batch_is_deduplicated(self):
+        events = [self._event(str(i)) for i in range(50)]
+        self._post(events)
+        with self.assertNumQueries(3):
+            response = self._post(events)
+        self.assertEqual(response.data['duplicate'], 50)
+        self.assertEqual(ActivityLog.objects.count(), 50)
+
+    def test_rows_lost_to_a_concurrent_flush_are_duplicates(self):
+        bulk_create = ActivityLog.objects.bulk_create
+
+        def racing_bulk_create(objs, **kwargs):
+            # Another request stores event 'b' between our duplicate check and the insert.
+            ActivityLog.objects.create(
+                student=self.student, programme=self.programme, activity_type='resource_view', client_id='b'
+            )
+            return bulk_create(objs, **kwargs)
+
+        with mock.patch.object(ActivityLog.objects, 'bulk_create', side_effect=racing_bulk_create):
+            response = self._post([self._event('a'), self._event('b')])
+        self.assertEqual([result['status'] for result in response.data['results']], ['accepted', 'duplicate'])
+        self.assertEqual((response.data['accepted'], response.data['duplicate']), (1, 1))
+
+    def test_student_cannot_post_for_someone_else(self):
+        other = User.objects.create_user(username='other', role=User.Roles.STUDENT)
+        Student.objects.create(user=other, programme=self.programme, year=1, trimester=1, trimester_label='T1', cohort_year=2025)
+        response = self.client.post(
+            '/api/learning/activity/batch/', {'student': other.pk, 'events': [self._event('x')]}, format='json'
+        )
+        self.assertEqual(response.status_code, 403)
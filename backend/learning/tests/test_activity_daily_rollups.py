@@ -0,0 +1,103 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from learning.models import Department, Programme
+from learning.progress_models import ActivityDailyRollup, ActivityLog
+from learning.services.activity import (
+    process_activity_rollups,
+    process_daily_rollups,
+    prune_activity_logs,
+    rebuild_daily_rollups,
+)
+from users.models import User, Student
+
+
+@override_settings(ACTIVITY_ROLLUP_SETTLE_SECONDS=0)
+class ActivityDailyRollupTests(TestCase):
+
+    def setUp(self):
+        department = Department.objects.create(name='Test Department', code='TD')
+        self.programme = Programme.objects.create(
+            department=department,
+            name='Test Programme',
+            code='TP',
+            award_level='Diploma',
+            duration_years=2,
+            trimesters_per_year=3
+        )
+        user = User.objects.create_user(username='teststudent', role=User.Roles.STUDENT)
+        self.student = Student.objects.create(
+            user=user,
+            programme=self.programme,
+            year=1,
+            trimester=1,
+            trimester_label='T1',
+            cohort_year=2025
+        )
+
+    def _log(self, day, activity_type='resource_view', minutes=10, **extra):
+        return ActivityLog.objects.create(
+            student=self.student,
+            programme=self.programme,
+            activity_type=activity_type,
+            duration_minutes=minutes,
+            occurred_at=datetime(2025, 3, day, 12, tzinfo=dt_timezone.utc),
+            **extra,
+        )
+
+    def test_daily_rollups_accumulate_incrementally(self):
+        self._log(3)
+        self._log(3, minutes=5, was_successful=True)
+        self.assertEqual(process_daily_rollups(batch_size=1), 2)
+        self._log(3, needed_help=True, helper_type='parent')
+        self._log(4, activity_type='quiz_attempt')
+        process_daily_rollups()
+        self.assertEqual(process_daily_rollups(), 0)
+
+        views = ActivityDailyRollup.objects.get(day='2025-03-03', activity_type='resource_view', helper_type='')
+        self.assertEqual((views.event_count, views.total_minutes, views.successful_count), (2, 15, 1))
+        self.assertEqual(ActivityDailyRollup.objects.count(), 3)
+
+        ActivityDailyRollup.objects.update(event_count=0)
+        with self.settings(ACTIVITY_LOG_RETENTION_DAYS=0):
+            rebuild_daily_rollups()
+        views = ActivityDailyRollup.objects.get(day='2025-03-03', activity_type='resource_view', helper_type='')
+        self.assertEqual(views.event_count, 2)
+
+    def test_analytics_api_groups_by_week(self):
+        self._log(3)
+        self._log(4, activity_type='quiz_attempt')
+        self._log(12)
+        process_daily_rollups()
+
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user(username='admin', role=User.Roles.ADMIN))
+        with self.assertNumQueries(1):
+            response = client.get('/api/learning/analytics/activity/', {
+                'start': '2025-03-01', 'end': '2025-03-31', 'bucket': 'week', 'group_by': 'activity_type',
+            })
+        self.assertEqual(response.status_code, 200)
+        results = [(str(row['bucket']), row['activity_type'], row['events']) for row in response.data['results']]
+        self.assertEqual(results, [
+            ('2025-03-03', 'quiz_attempt', 1),
+            ('2025-03-03', 'resource_view', 1),
+            ('2025-03-10', 'resource_view', 1),
+        ])
+
+        response = client.get('/api/learning/analytics/activity/', {
+            'start': '2025-03-01', 'end': '2025-03-31', 'programme': 'abc',
+        })
+        self.assertEqual(response.status_code, 400)
+
+    def test_prune_only_removes_rolled_up_logs(self):
+        old = self._log(3)
+        ActivityLog.objects.filter(pk=old.pk).update(created_at=timezone.now() - timedelta(days=500))
+        self.assertEqual(prune_activity_logs(400), 0)
+
+        process_activity_rollups()
+        process_daily_rollups()
+        self._log(4)
+        self.assertEqual(prune_activity_logs(400), 1)
+        self.assertEqual(ActivityLog.objects.count(), 1)
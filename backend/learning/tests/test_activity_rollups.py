@@ -0,0 +1,103 @@
+from datetime import date, datetime, timezone as dt_timezone
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from learning.models import Department, Programme
+from learning.progress_models import ActivityLog, StudentProgress
+from learning.services.activity import (
+    activity_as_of,
+    decay_activity_streaks,
+    mark_active_day,
+    process_activity_rollups,
+    streak_length,
+)
+from users.models import User, Student
+
+
+class ActivityBitmapTests(SimpleTestCase):
+
+    def test_streak_follows_anchor(self):
+        bitmap, anchor = 0, None
+        for day in (date(2025, 3, 1), date(2025, 3, 2), date(2025, 3, 4), date(2025, 3, 3)):
+            bitmap, anchor = mark_active_day(bitmap, anchor, day)
+        self.assertEqual(anchor, date(2025, 3, 4))
+        self.assertEqual(streak_length(bitmap), 4)
+
+        bitmap, anchor = mark_active_day(bitmap, anchor, date(2025, 3, 6))
+        self.assertEqual(streak_length(bitmap), 1)
+
+    def test_streak_is_measured_from_today(self):
+        bitmap, anchor = 0b111, date(2025, 3, 4)
+        self.assertEqual(activity_as_of(bitmap, anchor, date(2025, 3, 5))[0], 3)
+        self.assertEqual(activity_as_of(bitmap, anchor, date(2025, 3, 6)), (0, 10.71))
+        self.assertEqual(activity_as_of(bitmap, anchor, date(2025, 5, 1)), (0, 0.0))
+
+
+@override_settings(ACTIVITY_ROLLUP_SETTLE_SECONDS=0)
+class ActivityRollupTests(TestCase):
+
+    def setUp(self):
+        department = Department.objects.create(name='Test Department', code='TD')
+        self.programme = Programme.objects.create(
+            department=department,
+            name='Test Programme',
+            code='TP',
+            award_level='Diploma',
+            duration_years=2,
+            trimesters_per_year=3
+        )
+        user = User.objects.create_user(username='teststudent', role=User.Roles.STUDENT)
+        self.student = Student.objects.create(
+            user=user,
+            programme=self.programme,
+            year=1,
+            trimester=1,
+            trimester_label='T1',
+            cohort_year=2025
+        )
+
+    def _log(self, day, minutes):
+        ActivityLog.objects.create(
+            student=self.student,
+            programme=self.programme,
+            activity_type='resource_view',
+            duration_minutes=minutes,
+            occurred_at=datetime(2025, 3, day, 12, tzinfo=dt_timezone.utc),
+        )
+
+    def test_rollup_is_incremental_and_idempotent(self):
+        self._log(1, 10)
+        self._log(2, 15)
+        self.assertEqual(process_activity_rollups(batch_size=1, today=date(2025, 3, 3)), 2)
+
+        progress = StudentProgress.objects.get(student=self.student, term='2025-1')
+        self.assertEqual(progress.total_time_spent, 25)
+        self.assertEqual(progress.consecutive_days, 2)
+
+        # Rerunning with nothing new changes nothing.
+        self.assertEqual(process_activity_rollups(today=date(2025, 3, 3)), 0)
+        self._log(3, 5)
+        self.assertEqual(process_activity_rollups(today=date(2025, 3, 3)), 1)
+
+        progress.refresh_from_db()
+        self.assertEqual(progress.total_time_spent, 30)
+        self.assertEqual(progress.consecutive_days, 3)
+        self.assertEqual(progress.last_activity_at, datetime(2025, 3, 3, 12, tzinfo=dt_timezone.utc))
+        self.assertAlmostEqual(progress.activity_score, 10.71)
+
+    def test_streaks_decay_without_new_activity(self):
+        self._log(1, 10)
+        self._log(2, 10)
+        process_activity_rollups(today=date(2025, 3, 2))
+        StudentProgress.objects.update(updated_at=datetime(2025, 3, 2, 12, tzinfo=dt_timezone.utc))
+
+        self.assertEqual(decay_activity_streaks(today=date(2025, 3, 5)), 1)
+        progress = StudentProgress.objects.get(student=self.student)
+        self.assertEqual((progress.consecutive_days, progress.activity_score), (0, 7.14))
+        # Refreshed today already: the next run skips it.
+        self.assertEqual(decay_activity_streaks(today=date(2025, 3, 5)), 0)
+
+    def test_unsettled_rows_wait_for_the_next_run(self):
+        self._log(1, 10)
+        with self.settings(ACTIVITY_ROLLUP_SETTLE_SECONDS=120):
+            self.assertEqual(process_activity_rollups(), 0)
+        self.assertEqual(process_activity_rollups(), 1)
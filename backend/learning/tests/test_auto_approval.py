@@ -0,0 +1,149 @@
+from datetime import date, datetime, timezone as dt_timezone
+
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from core.terms import term_bounds
+from learning.achievement_models import Achievement, AchievementCategory, StudentAchievement, TermProgress
+from learning.models import Department, Programme
+from learning.progress_models import ActivityLog, StudentProgress
+from learning.services.auto_approval import auto_approve_claims, compile_conditions, compiled_conditions
+from learning.services.rules import RuleError
+from learning.session_models import CourseSchedule, CourseSession, VoiceAttendance
+from users.models import User, Student
+
+
+class AutoApprovalCompilerTests(SimpleTestCase):
+
+    def test_metrics_are_collected_once_per_name(self):
+        rule = compile_conditions({'all': [
+            {'type': 'streak', 'threshold': 5},
+            {'any': [{'type': 'activity_count', 'activity_type': 'quiz_attempt', 'threshold': 3},
+                     {'not': {'type': 'streak', 'op': '<', 'threshold': 10}}]},
+        ]})
+        self.assertEqual(set(rule.metrics), {'rule_streak', 'rule_activity_count_quiz_attempt'})
+
+    def test_invalid_conditions_raise(self):
+        for spec in ({'type': 'magic', 'threshold': 1}, {'type': 'streak', 'threshold': '5'},
+                     {'type': 'streak', 'activity_type': 'quiz_attempt', 'threshold': 1},
+                     {'type': 'activity_count', 'activity_type': 'dancing', 'threshold': 1}, {'any': []}):
+            with self.assertRaises(RuleError):
+                compile_conditions(spec)
+
+    def test_term_bounds(self):
+        self.assertEqual(term_bounds('2025-2'), (date(2025, 5, 1), date(2025, 9, 1)))
+        self.assertEqual(term_bounds('2025-3'), (date(2025, 9, 1), date(2026, 1, 1)))
+        for term in ('2025-4', '2025-0', 'Fall 2025', '2025'):
+            with self.assertRaises(ValueError):
+                term_bounds(term)
+
+
+@override_settings(ACHIEVEMENT_AUTO_APPROVER_USERNAME='hod-approver')
+class AutoApprovalTests(TestCase):
+
+    def setUp(self):
+        self.approver = User.objects.create_user(username='hod-approver', role=User.Roles.HOD)
+        department = Department.objects.create(name='Test Department', code='TD')
+        self.programme = Programme.objects.create(
+            department=department,
+            name='Test Programme',
+            code='TP',
+            award_level='Diploma',
+            duration_years=2,
+            trimesters_per_year=3
+        )
+        self.users = []
+        for index in range(3):
+            user = User.objects.create_user(username=f'student{index}', role=User.Roles.STUDENT)
+            Student.objects.create(
+                user=user,
+                programme=self.programme,
+                year=1,
+                trimester=1,
+                trimester_label='T1',
+                cohort_year=2025
+            )
+            self.users.append(user)
+        category = AchievementCategory.objects.create(name='Engagement', icon='spark')
+        self.achievement = Achievement.objects.create(
+            category=category, name='Quiz streak', description='', icon='star', points=10, voice_message='Great work',
+            auto_approve_conditions={'all': [
+                {'type': 'activity_count', 'activity_type': 'quiz_attempt', 'threshold': 2},
+                {'type': 'streak', 'threshold': 3},
+            ]},
+        )
+
+    def _claim(self, user, term='2025-1'):
+        return StudentAchievement.objects.create(student=user, achievement=self.achievement, points_earned=10, term=term)
+
+    def _quizzes(self, user, count, when=datetime(2025, 2, 1, 9, tzinfo=dt_timezone.utc)):
+        for _ in range(count):
+            ActivityLog.objects.create(
+                student_id=user.pk, programme=self.programme, activity_type='quiz_attempt', occurred_at=when,
+            )
+
+    def test_matching_claims_are_approved_in_batches(self):
+        for user, quizzes, streak in zip(self.users, [2, 5, 1], [3, 2, 9]):
+            self._quizzes(user, quizzes)
+            StudentProgress.objects.create(student_id=user.pk, programme=self.programme, term='2025-1', consecutive_days=streak)
+        claims = [self._claim(user) for user in self.users]
+        # Out-of-term activity does not count towards a 2025-2 claim.
+        later = self._claim(self.users[0], term='2025-2')
+
+        summary = auto_approve_claims(batch_size=2)
+
+        self.assertEqual(summary, {'achievements': 1, 'evaluated': 4, 'approved': 1, 'invalid': 0, 'invalid_terms': 0})
+        approved = set(StudentAchievement.objects.filter(approved_by__isnull=False).values_list('pk', flat=True))
+        self.assertEqual(approved, {claims[0].pk})
+        self.assertNotIn(later.pk, approved)
+        self.assertEqual(StudentAchievement.objects.get(pk=claims[0].pk).approved_by, self.approver)
+        self.assertEqual(User.objects.count(), len(self.users) + 1)
+        self.assertEqual(TermProgress.objects.get(student=self.users[0], term='2025-1').total_points_earned, 10)
+
+    def test_claims_with_malformed_terms_are_skipped(self):
+        for user in self.users[:2]:
+            self._quizzes(user, 2)
+            StudentProgress.objects.create(student_id=user.pk, programme=self.programme, term='2025-1', consecutive_days=5)
+        good = self._claim(self.users[0])
+        self._claim(self.users[1], term='Spring 2025')
+
+        with self.assertLogs('learning.services.auto_approval', 'WARNING'):
+            summary = auto_approve_claims()
+
+        self.assertEqual((summary['approved'], summary['invalid_terms']), (1, 1))
+        self.assertEqual(
+            list(StudentAchievement.objects.filter(approved_by__isnull=False).values_list('pk', flat=True)), [good.pk]
+        )
+
+    def test_an_approver_must_be_configured(self):
+        self._quizzes(self.users[0], 2)
+        StudentProgress.objects.create(student_id=self.users[0].pk, programme=self.programme, term='2025-1', consecutive_days=5)
+        self._claim(self.users[0])
+
+        for username in ('', 'nobody'):
+            with self.subTest(username=username), override_settings(ACHIEVEMENT_AUTO_APPROVER_USERNAME=username):
+                with self.assertRaises(ImproperlyConfigured):
+                    auto_approve_claims()
+        self.assertFalse(StudentAchievement.objects.filter(approved_by__isnull=False).exists())
+        self.assertFalse(User.objects.filter(username='nobody').exists())
+
+    def test_attendance_rate_condition(self):
+        self.achievement.auto_approve_conditions = {'type': 'attendance_rate', 'threshold': 50}
+        self.achievement.save()
+        schedule = CourseSchedule.objects.create(programme=self.programme, term='2025-1', day_of_week=0, start_time='08:00', duration_minutes=60)
+        sessions = [CourseSession.objects.create(schedule=schedule, date=date(2025, 1, day), status='completed') for day in (6, 13)]
+        VoiceAttendance.objects.create(student_id=self.users[1].pk, session=sessions[0])
+        claims = [self._claim(user) for user in self.users[:2]]
+
+        auto_approve_claims()
+
+        self.assertEqual(
+            list(StudentAchievement.objects.filter(approved_by__isnull=False).values_list('pk', flat=True)), [claims[1].pk]
+        )
+
+    def test_compiled_rule_is_cached_until_achievement_changes(self):
+        first = compiled_conditions(self.achievement)
+        self.assertIs(compiled_conditions(self.achievement), first)
+        self.achievement.auto_approve_conditions = {'type': 'points', 'threshold': 1}
+        self.achievement.save()
+        self.assertEqual(set(compiled_conditions(self.achievement).metrics), {'rule_points'})
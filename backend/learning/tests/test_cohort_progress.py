@@ -0,0 +1,91 @@
+from decimal import Decimal
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from learning.models import Assignment, CurriculumUnit, Department, Programme, Registration, Submission
+from users.models import User, Student
+
+
+class CohortProgressTests(TestCase):
+
+    def setUp(self):
+        self.department = Department.objects.create(name='Test Department', code='TD')
+        self.programme = Programme.objects.create(
+            department=self.department,
+            name='Test Programme',
+            code='TP',
+            award_level='Diploma',
+            duration_years=2,
+            trimesters_per_year=3
+        )
+        self.unit = CurriculumUnit.objects.create(programme=self.programme, code='TP101', title='Intro', credit_hours=3)
+        self.other_unit = CurriculumUnit.objects.create(programme=self.programme, code='TP102', title='Next', credit_hours=3)
+        self.assignment = Assignment.objects.create(unit=self.unit, title='Essay')
+        self.other_assignment = Assignment.objects.create(unit=self.other_unit, title='Quiz')
+
+        self.alice = self._student('alice')
+        self.bob = self._student('bob')
+        self._register(self.alice, self.unit)
+        self._register(self.alice, self.other_unit)
+        self._register(self.bob, self.unit)
+        self._submit(self.alice, self.assignment, '80.00')
+        self._submit(self.alice, self.other_assignment, '60.00')
+        self._submit(self.bob, self.assignment, None)
+        # A registration from another term must not leak into the cohort.
+        late = self._student('carol')
+        Registration.objects.create(student=late, unit=self.unit, academic_year=2026, trimester=1, status=Registration.Status.APPROVED)
+
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(username='lecturer', role=User.Roles.LECTURER))
+
+    def _student(self, username):
+        user = User.objects.create_user(username=username, role=User.Roles.STUDENT)
+        return Student.objects.create(
+            user=user,
+            programme=self.programme,
+            year=1,
+            trimester=1,
+            trimester_label='T1',
+            cohort_year=2025
+        )
+
+    def _register(self, student, unit):
+        Registration.objects.create(student=student, unit=unit, academic_year=2025, trimester=1, status=Registration.Status.APPROVED)
+
+    def _submit(self, student, assignment, grade):
+        Submission.objects.create(
+            assignment=assignment, student=student, content_url='https://example.com/work',
+            grade=Decimal(grade) if grade else None,
+        )
+
+    def test_unit_cohort(self):
+        response = self.client.get('/api/learning/progress/cohort/', {'unit': self.unit.pk, 'academic_year': 2025, 'trimester': 1})
+        self.assertEqual(response.status_code, 200)
+        rows = {row['username']: row for row in response.data['results']}
+        self.assertEqual(set(rows), {'alice', 'bob'})
+        self.assertEqual(rows['alice']['average_grade'], 80.0)
+        self.assertTrue(rows['alice']['completed'])
+        self.assertFalse(rows['bob']['completed'])
+        self.assertEqual(rows['bob']['submission_count'], 1)
+
+    def test_department_cohort_uses_fixed_queries(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                '/api/learning/progress/cohort/', {'department': self.department.pk, 'academic_year': 2025, 'trimester': 1}
+            )
+        alice = next(row for row in response.data['results'] if row['username'] == 'alice')
+        self.assertEqual(alice['units'], 2)
+        self.assertEqual(alice['average_grade'], 70.0)
+
+    def test_csv_export_streams(self):
+        response = self.client.get(
+            '/api/learning/progress/cohort/', {'programme': self.programme.pk, 'academic_year': 2025, 'trimester': 1, 'export': 'csv'}
+        )
+        self.assertEqual(response.status_code, 200)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0].split(',')[:2], ['student_id', 'username'])
+        self.assertEqual(len(lines), 3)
+
+    def test_requires_single_scope(self):
+        response = self.client.get('/api/learning/progress/cohort/', {'academic_year': 2025, 'trimester': 1})
+        self.assertEqual(response.status_code, 400)
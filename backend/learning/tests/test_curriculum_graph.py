@@ -0,0 +1,132 @@
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from core.catalogue import local_cache
+from learning.models import CurriculumUnit, Department, Programme, Registration
+from learning.services.curriculum import curriculum_graph, validate_registrations
+from users.models import User, Student
+
+
+class CurriculumGraphTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        local_cache.clear()
+        department = Department.objects.create(name='Test Department', code='TD')
+        self.programme = Programme.objects.create(
+            department=department,
+            name='Test Programme',
+            code='TP',
+            award_level='Diploma',
+            duration_years=2,
+            trimesters_per_year=3
+        )
+        self.other = Programme.objects.create(
+            department=department, name='Other Programme', code='OP', award_level='Diploma',
+            duration_years=2, trimesters_per_year=3,
+        )
+        self.intro = self._unit('U101')
+        self.middle = self._unit('U201', prereq=self.intro)
+        self.advanced = self._unit('U301', prereq=self.middle)
+        self.bridge = self._unit('X401', prereq=self.advanced, programme=self.other)
+        self.students = []
+        for index in range(2):
+            user = User.objects.create_user(username=f'student{index}', role=User.Roles.STUDENT)
+            self.students.append(Student.objects.create(
+                user=user,
+                programme=self.programme,
+                year=1,
+                trimester=1,
+                trimester_label='T1',
+                cohort_year=2025
+            ))
+
+    def _unit(self, code, prereq=None, programme=None):
+        return CurriculumUnit.objects.create(
+            programme=programme or self.programme, code=code, title=code, credit_hours=3,
+            has_prereq=prereq is not None, prereq_unit=prereq,
+        )
+
+    def test_graph_is_topologically_sorted_with_chains(self):
+        graph = curriculum_graph(self.other.pk)
+        order = graph.order
+        self.assertLess(order.index(self.intro.pk), order.index(self.middle.pk))
+        self.assertLess(order.index(self.advanced.pk), order.index(self.bridge.pk))
+        self.assertEqual(graph.chain(self.bridge.pk), [self.advanced.pk, self.middle.pk, self.intro.pk])
+
+    def test_edits_that_close_a_cycle_are_rejected(self):
+        self.intro.prereq_unit = self.advanced
+        with self.assertRaises(ValidationError):
+            self.intro.full_clean()
+        with self.assertRaises(ValidationError), transaction.atomic():
+            self.intro.save()
+        self.intro.refresh_from_db()
+        self.intro.prereq_unit = self.bridge
+        with self.assertRaises(ValidationError), transaction.atomic():
+            self.intro.save()
+
+        # The guard reads the stored links, not the cached graph, so an edit in the same transaction counts.
+        curriculum_graph(self.programme.pk)
+        with transaction.atomic():
+            CurriculumUnit.objects.filter(pk=self.middle.pk).update(prereq_unit=None, has_prereq=False)
+            self.middle.refresh_from_db()
+            self.middle.prereq_unit = self.advanced
+            with self.assertRaises(ValidationError), transaction.atomic():
+                self.middle.save()
+            transaction.set_rollback(True)
+
+        # A legal edit refreshes the cached graph.
+        self.advanced.prereq_unit = self.intro
+        with self.captureOnCommitCallbacks(execute=True):
+            self.advanced.save()
+        self.assertEqual(curriculum_graph(self.programme.pk).chain(self.advanced.pk), [self.intro.pk])
+
+    def test_units_without_has_prereq_are_unrestricted(self):
+        CurriculumUnit.objects.filter(pk=self.middle.pk).update(has_prereq=False)
+        graph = curriculum_graph(self.programme.pk)
+        self.assertEqual(graph.chain(self.middle.pk), [])
+        self.assertEqual(graph.chain(self.advanced.pk), [self.middle.pk])
+
+    def test_cyclic_data_does_not_break_the_graph(self):
+        # Bypasses the save guard the way older data or raw updates could.
+        CurriculumUnit.objects.filter(pk=self.intro.pk).update(prereq_unit=self.middle, has_prereq=True)
+        with self.assertLogs('learning.services.curriculum', 'WARNING'):
+            graph = curriculum_graph(self.other.pk)
+            errors = validate_registrations([(self.students[0].pk, self.middle.pk)])
+        self.assertEqual((graph.chain(self.intro.pk), graph.chain(self.middle.pk)), ([], []))
+        self.assertEqual(graph.chain(self.advanced.pk), [self.middle.pk, self.intro.pk])
+        self.assertEqual(errors, [])
+
+    def test_batch_validation_uses_a_constant_number_of_queries(self):
+        first, second = self.students
+        Registration.objects.create(student=first, unit=self.intro, academic_year=2025, trimester=1, status='approved')
+        pairs = [(first.pk, self.middle.pk), (first.pk, self.advanced.pk), (second.pk, self.advanced.pk), (second.pk, self.intro.pk)]
+
+        with self.assertNumQueries(3):
+            errors = validate_registrations(pairs)
+        self.assertEqual(
+            [(error['student'], error['unit_code'], error['missing']) for error in errors],
+            [(first.pk, 'U301', ['U201']), (second.pk, 'U301', ['U201', 'U101'])],
+        )
+        # The graph is cached now: units and completions only.
+        with self.assertNumQueries(2):
+            validate_registrations(pairs)
+
+    def test_validate_endpoint(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user(username='records', role=User.Roles.RECORDS))
+        response = client.post(
+            '/api/learning/registrations/validate/',
+            {'registrations': [{'student': self.students[0].pk, 'unit': self.middle.pk}]},
+            format='json',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.data['valid'])
+        self.assertEqual(response.data['errors'][0]['missing'], ['U101'])
+
+        client.force_authenticate(self.students[0].user)
+        response = client.post('/api/learning/registrations/validate/', {'registrations': []}, format='json')
+        self.assertEqual(response.status_code, 403)
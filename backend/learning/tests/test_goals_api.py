@@ -0,0 +1,134 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from learning.goals_models import GoalReflection, LearningGoal, LearningMilestone, LearningSupport
+from learning.models import Department, Programme
+from users.models import User, Student
+
+
+class LearningGoalApiTests(TestCase):
+
+    def setUp(self):
+        department = Department.objects.create(name='Test Department', code='TD')
+        self.programme = Programme.objects.create(
+            department=department,
+            name='Test Programme',
+            code='TP',
+            award_level='Diploma',
+            duration_years=2,
+            trimesters_per_year=3
+        )
+        self.user = User.objects.create_user(username='teststudent', role=User.Roles.STUDENT, display_name='Test Student')
+        self.student = Student.objects.create(
+            user=self.user,
+            programme=self.programme,
+            year=1,
+            trimester=1,
+            trimester_label='T1',
+            cohort_year=2025
+        )
+        self.lecturer = User.objects.create_user(username='lecturer', role=User.Roles.LECTURER)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _goal(self, milestones=2, reflections=(), supports=0):
+        goal = LearningGoal.objects.create(
+            student=self.student, programme=self.programme, term='2025-1',
+            title='Read more', description='Finish the reading list',
+        )
+        created = [
+            LearningMilestone.objects.create(
+                goal=goal, title=f'Step {index}', description='', order=index, completed=index == 0,
+                verified_by=self.lecturer,
+            )
+            for index in range(milestones)
+        ]
+        for mood, needs_help in reflections:
+            GoalReflection.objects.create(
+                goal=goal, milestone=created[0], mood=mood, needs_help=needs_help,
+                help_type_requested='practice' if needs_help else '',
+            )
+        for _ in range(supports):
+            LearningSupport.objects.create(
+                milestone=created[0], provided_by=self.lecturer, support_type='guidance', description='Extra notes',
+            )
+        return goal
+
+    def test_list_reports_milestone_counts(self):
+        self._goal(milestones=3)
+        response = self.client.get('/api/learning/learning-goals/')
+        self.assertEqual(response.status_code, 200)
+        row = response.data['results'][0]
+        self.assertEqual(row['student_name'], 'Test Student')
+        self.assertEqual(row['milestone_count'], 3)
+        self.assertEqual(row['completed_milestone_count'], 1)
+
+    def test_list_query_count_is_constant(self):
+        for _ in range(5):
+            self._goal(milestones=4, reflections=[('happy', False)])
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/learning/learning-goals/')
+        self.assertEqual(response.data['count'], 5)
+
+    def test_detail_summarises_reflections_and_milestones(self):
+        goal = self._goal(
+            milestones=2,
+            reflections=[('happy', False), ('happy', False), ('worried', True)],
+            supports=2,
+        )
+        response = self.client.get(f'/api/learning/learning-goals/{goal.pk}/')
+        self.assertEqual(response.status_code, 200)
+        summary = response.data['reflection_summary']
+        self.assertEqual(summary['total_reflections'], 3)
+        self.assertEqual(summary['mood_distribution'], {'happy': 2, 'worried': 1})
+        self.assertEqual(summary['needs_help_count'], 1)
+        self.assertEqual(response.data['programme_code'], 'TP')
+        first = response.data['milestones'][0]
+        self.assertEqual((first['support_count'], first['reflection_count']), (2, 3))
+
+    def test_detail_query_count_is_constant(self):
+        small = self._goal(milestones=1)
+        large = self._goal(milestones=8, reflections=[('proud', False)] * 6, supports=4)
+        for goal in (small, large):
+            with self.assertNumQueries(3):
+                self.client.get(f'/api/learning/learning-goals/{goal.pk}/')
+
+    def test_goal_without_reflections_has_no_summary(self):
+        goal = self._goal()
+        response = self.client.get(f'/api/learning/learning-goals/{goal.pk}/')
+        self.assertIsNone(response.data['reflection_summary'])
+
+    def test_students_only_see_their_own_goals(self):
+        self._goal()
+        other = User.objects.create_user(username='other', role=User.Roles.STUDENT)
+        Student.objects.create(
+            user=other, programme=self.programme, year=1, trimester=1, trimester_label='T1', cohort_year=2025
+        )
+        self.client.force_authenticate(other)
+        response = self.client.get('/api/learning/learning-goals/')
+        self.assertEqual(response.data['count'], 0)
+
+    def test_sparse_fields_trim_payload_and_queries(self):
+        goal = self._goal(milestones=3, reflections=[('happy', False)])
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f'/api/learning/learning-goals/{goal.pk}/', {'fields': 'id,title,milestones', 'expand': ''})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.data), {'id', 'title', 'milestones'})
+        self.assertEqual(len(response.data['milestones']), 3)
+        self.assertIsInstance(response.data['milestones'][0], int)
+        # No reflection aggregates, no milestone annotations, no unrequested columns.
+        self.assertEqual(len(queries), 2)
+        self.assertNotIn('COUNT', queries[0]['sql'])
+        self.assertNotIn('description', queries[0]['sql'])
+
+        response = self.client.get('/api/learning/learning-goals/', {'fields': 'id,title'})
+        self.assertEqual(set(response.data['results'][0]), {'id', 'title'})
+
+    def test_student_user_collapses_unless_expanded(self):
+        response = self.client.get(f'/api/users/students/{self.student.pk}/')
+        self.assertEqual(response.data['user']['display_name'], 'Test Student')
+        with self.assertNumQueries(1):
+            response = self.client.get(f'/api/users/students/{self.student.pk}/', {'fields': 'user,stars', 'expand': ''})
+        self.assertEqual(response.data, {'user': self.user.pk, 'stars': 0})
@@ -0,0 +1,117 @@
+from datetime import date, datetime, timezone as dt_timezone
+from django.test import SimpleTestCase, TestCase
+
+from learning.achievement_models import TermProgress
+from learning.goals_models import LearningGoal, LearningMilestone
+from learning.models import CurriculumUnit, Department, Programme
+from learning.progress_models import CompletionRecord, StudentProgress
+from learning.services.milestones import evaluate_milestones
+from learning.services.rules import RuleError, compile_rule
+from learning.session_models import CourseSchedule, CourseSession, VoiceAttendance
+from repository.models import LibraryAsset
+from users.models import User, Student
+
+
+class RuleCompilerTests(SimpleTestCase):
+
+    def test_composite_rules(self):
+        rule = compile_rule({'all': [
+            {'type': 'points', 'threshold': 50},
+            {'any': [{'type': 'attendance', 'op': '>', 'threshold': 75}, {'not': {'type': 'time_spent', 'op': '<', 'threshold': 120}}]},
+        ]})
+        self.assertTrue(rule({'points': 60, 'attendance': 80, 'time_spent': 0}))
+        self.assertTrue(rule({'points': 60, 'attendance': 10, 'time_spent': 200}))
+        self.assertFalse(rule({'points': 60, 'attendance': 10, 'time_spent': 30}))
+        self.assertFalse(rule({'points': 10, 'attendance': 90}))
+        self.assertTrue(compile_rule(None)({}))
+
+    def test_invalid_rules_raise(self):
+        for spec in ({'type': 'magic', 'threshold': 1}, {'type': 'points', 'op': '~', 'threshold': 1},
+                     {'type': 'points', 'threshold': 'x'}, {'all': []}, ['points']):
+            with self.assertRaises(RuleError):
+                compile_rule(spec)
+
+
+class MilestoneEvaluationTests(TestCase):
+
+    def setUp(self):
+        department = Department.objects.create(name='Test Department', code='TD')
+        self.programme = Programme.objects.create(
+            department=department,
+            name='Test Programme',
+            code='TP',
+            award_level='Diploma',
+            duration_years=2,
+            trimesters_per_year=3
+        )
+        user = User.objects.create_user(username='teststudent', role=User.Roles.STUDENT)
+        self.student = Student.objects.create(
+            user=user,
+            programme=self.programme,
+            year=1,
+            trimester=1,
+            trimester_label='T1',
+            cohort_year=2025
+        )
+        self.goal = LearningGoal.objects.create(
+            student=self.student, programme=self.programme, term='2025-1', title='Read more', description='',
+        )
+        TermProgress.objects.create(student=user, term='2025-1', total_points_earned=40)
+        StudentProgress.objects.create(student=self.student, programme=self.programme, term='2025-1', total_time_spent=90)
+
+        schedule = CourseSchedule.objects.create(programme=self.programme, term='2025-1', day_of_week=0, start_time='08:00', duration_minutes=60)
+        for day in range(1, 5):
+            session = CourseSession.objects.create(schedule=schedule, date=date(2025, 1, day), status='completed')
+            if day != 4:
+                VoiceAttendance.objects.create(student=self.student, session=session)
+
+        self.asset = LibraryAsset.objects.create(title='Story', type=LibraryAsset.AssetType.LINK, url='https://example.com/story')
+        CompletionRecord.objects.create(
+            student=self.student, programme=self.programme, resource=self.asset, completion_type='self_marked',
+            unit=CurriculumUnit.objects.create(programme=self.programme, code='TP101', title='Intro', credit_hours=3),
+        )
+
+    def _milestone(self, title, **criteria):
+        return LearningMilestone.objects.create(goal=self.goal, title=title, description='', **criteria)
+
+    def test_evaluation_marks_met_milestones_and_goal_progress(self):
+        points = self._milestone('Points', required_points=40)
+        attendance = self._milestone('Attendance', required_attendance=75)
+        reading = self._milestone('Reading')
+        reading.required_resources.add(self.asset)
+        custom = self._milestone('Practice', custom_criteria={'type': 'time_spent', 'threshold': 120})
+        broken = self._milestone('Broken', custom_criteria={'type': 'nope', 'threshold': 1})
+
+        with self.assertLogs('learning.services.milestones', level='WARNING'):
+            summary = evaluate_milestones(self.programme.pk)
+
+        self.assertEqual(summary, {'evaluated': 5, 'completed': 3, 'goals_updated': 1, 'invalid': 1, 'manual': 0})
+        completed = set(LearningMilestone.objects.filter(completed=True).values_list('pk', flat=True))
+        self.assertEqual(completed, {points.pk, attendance.pk, reading.pk})
+        self.assertNotIn(custom.pk, completed)
+        self.assertNotIn(broken.pk, completed)
+        self.goal.refresh_from_db()
+        self.assertEqual(self.goal.progress_percentage, 60.0)
+        self.assertEqual(self.goal.status, 'in_progress')
+
+    def test_resources_completed_counts_only_the_goal_term(self):
+        reading = self._milestone('Reading list', custom_criteria={'type': 'resources_completed', 'threshold': 1})
+        CompletionRecord.objects.update(completed_at=datetime(2025, 6, 1, 9, tzinfo=dt_timezone.utc))
+
+        evaluate_milestones(self.programme.pk)
+        reading.refresh_from_db()
+        self.assertFalse(reading.completed)
+
+        CompletionRecord.objects.update(completed_at=datetime(2025, 2, 1, 9, tzinfo=dt_timezone.utc))
+        evaluate_milestones(self.programme.pk)
+        reading.refresh_from_db()
+        self.assertTrue(reading.completed)
+
+    def test_milestones_without_criteria_are_left_for_manual_completion(self):
+        manual = self._milestone('Presentation')
+        empty = self._milestone('Reflection', custom_criteria={})
+
+        summary = evaluate_milestones(self.programme.pk)
+
+        self.assertEqual(summary, {'evaluated': 0, 'completed': 0, 'goals_updated': 0, 'invalid': 0, 'manual': 2})
+        self.assertFalse(LearningMilestone.objects.filter(pk__in=[manual.pk, empty.pk], completed=True).exists())
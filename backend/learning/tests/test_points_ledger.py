@@ -0,0 +1,150 @@
+from importlib import import_module
+from io import StringIO
+
+from django.apps import apps
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from learning.achievement_models import (
+    Achievement,
+    AchievementCategory,
+    PointsLedgerEntry,
+    RewardClaim,
+    StudentAchievement,
+    TermProgress,
+)
+from learning.services.points import approve_achievement_claims, ledger_drift, reconcile_points
+from users.models import User
+
+
+class PointsLedgerTests(TestCase):
+
+    def setUp(self):
+        category = AchievementCategory.objects.create(name='Attendance', icon='calendar')
+        self.achievement = Achievement.objects.create(
+            category=category, name='Badge', description='', icon='star', points=10, voice_message='Well done',
+        )
+        self.students = [
+            User.objects.create_user(username=f'student{index}', role=User.Roles.STUDENT) for index in range(3)
+        ]
+        self.lecturer = User.objects.create_user(username='lecturer', role=User.Roles.LECTURER)
+        self.client = APIClient()
+        self.client.force_authenticate(self.lecturer)
+
+    def _claim(self, student, points=10, term='2025-1'):
+        return StudentAchievement.objects.create(student=student, achievement=self.achievement, points_earned=points, term=term)
+
+    def _progress(self, student, term='2025-1'):
+        return TermProgress.objects.get(student=student, term=term)
+
+    def test_approve_credits_points_through_ledger(self):
+        claim = self._claim(self.students[0], points=7)
+        response = self.client.post(f'/api/learning/student-achievements/{claim.pk}/approve/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['approved_by'], self.lecturer.pk)
+        self.assertEqual(self._progress(self.students[0]).total_points_earned, 7)
+        entry = PointsLedgerEntry.objects.get()
+        self.assertEqual((entry.kind, entry.delta, entry.student_achievement_id), ('earned', 7, claim.pk))
+
+        response = self.client.post(f'/api/learning/student-achievements/{claim.pk}/approve/')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self._progress(self.students[0]).total_points_earned, 7)
+
+    def test_bulk_approve_uses_constant_statements(self):
+        claims = [self._claim(student, points=index + 1) for index, student in enumerate(self.students)]
+        with self.assertNumQueries(7):
+            approved = approve_achievement_claims(StudentAchievement.objects.filter(pk__in=[c.pk for c in claims]), self.lecturer)
+        self.assertEqual(approved, 3)
+        self.assertEqual(
+            [self._progress(student).total_points_earned for student in self.students], [1, 2, 3]
+        )
+
+        response = self.client.post(
+            f'/api/learning/student-achievements/{claims[0].pk}/bulk_approve/',
+            {'student_ids': [student.pk for student in self.students], 'term': '2025-1'},
+            format='json',
+        )
+        self.assertEqual(response.data['updated_count'], 0)
+        self.assertEqual(PointsLedgerEntry.objects.count(), 3)
+
+    def test_reward_approval_debits_points(self):
+        approve_achievement_claims(StudentAchievement.objects.filter(pk=self._claim(self.students[0]).pk), self.lecturer)
+        reward = RewardClaim.objects.create(
+            student=self.students[0], points_spent=4, reward_description='Extra library time', term='2025-1',
+        )
+        response = self.client.post(f'/api/learning/reward-claims/{reward.pk}/approve/')
+        self.assertEqual(response.status_code, 200)
+        progress = self._progress(self.students[0])
+        self.assertEqual(
+            (progress.total_points_earned, progress.total_points_spent, progress.rewards_claimed_count, progress.available_points),
+            (10, 4, 1, 6),
+        )
+
+    def test_reconcile_rebuilds_balances_from_ledger(self):
+        approve_achievement_claims(StudentAchievement.objects.filter(pk=self._claim(self.students[1], points=9).pk), self.lecturer)
+        TermProgress.objects.filter(student=self.students[1]).update(total_points_earned=0)
+        self.assertEqual(ledger_drift(), 1)
+
+        out = StringIO()
+        call_command('reconcile_points', '--term', '2025-1', stdout=out)
+        self.assertIn('1 had drifted', out.getvalue())
+        self.assertEqual(self._progress(self.students[1]).total_points_earned, 9)
+        self.assertEqual(ledger_drift(), 0)
+        self.assertEqual(reconcile_points(), 1)
+
+    def test_ledger_entries_are_append_only(self):
+        approve_achievement_claims(StudentAchievement.objects.filter(pk=self._claim(self.students[0]).pk), self.lecturer)
+        entry = PointsLedgerEntry.objects.get()
+        entry.delta = 100
+        with self.assertRaises(ValueError):
+            entry.save()
+
+    def test_deleting_approved_claims_reverses_their_entries(self):
+        claim = self._claim(self.students[0], points=10)
+        approve_achievement_claims(StudentAchievement.objects.filter(pk=claim.pk), self.lecturer)
+        reward = RewardClaim.objects.create(
+            student=self.students[0], points_spent=4, reward_description='Extra library time', term='2025-1',
+        )
+        self.client.post(f'/api/learning/reward-claims/{reward.pk}/approve/')
+
+        reward.delete()
+        progress = self._progress(self.students[0])
+        self.assertEqual(
+            (progress.total_points_earned, progress.total_points_spent, progress.rewards_claimed_count), (10, 0, 0)
+        )
+        claim.delete()
+        self.assertEqual(self._progress(self.students[0]).total_points_earned, 0)
+        self.assertEqual(PointsLedgerEntry.objects.count(), 4)
+        self.assertEqual(ledger_drift(), 0)
+        self.assertEqual(reconcile_points(), 1)
+        self.assertEqual(self._progress(self.students[0]).rewards_claimed_count, 0)
+
+    def test_deleting_pending_claim_posts_nothing(self):
+        self._claim(self.students[0]).delete()
+        self.assertFalse(PointsLedgerEntry.objects.exists())
+
+    def test_backfill_migration_records_existing_approvals(self):
+        migration = import_module('learning.migrations.0011_backfill_points_ledger')
+        claim = StudentAchievement.objects.create(
+            student=self.students[2], achievement=self.achievement, points_earned=6, term='2025-1',
+            approved_by=self.lecturer,
+        )
+        RewardClaim.objects.create(
+            student=self.students[2], points_spent=2, reward_description='Sticker', term='2025-1',
+            approved_by=self.lecturer,
+        )
+        self._claim(self.students[2])
+
+        migration.backfill_ledger(apps, None)
+        entries = PointsLedgerEntry.objects.filter(student=self.students[2]).order_by('kind')
+        self.assertEqual(
+            [(entry.kind, entry.delta, entry.recorded_by_id) for entry in entries],
+            [('earned', 6, self.lecturer.pk), ('spent', -2, self.lecturer.pk)],
+        )
+        self.assertEqual(entries[0].student_achievement_id, claim.pk)
+
+        migration.backfill_ledger(apps, None)
+        self.assertEqual(PointsLedgerEntry.objects.count(), 2)
+        migration.remove_backfill(apps, None)
+        self.assertFalse(PointsLedgerEntry.objects.exists())
@@ -0,0 +1,111 @@
+from decimal import Decimal
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from learning.models import (
+    Assignment,
+    CurriculumUnit,
+    Department,
+    Programme,
+    Registration,
+    Submission,
+    UnitProgressSnapshot,
+)
+from learning.services.progress import rebuild_progress_snapshots
+from users.models import User, Student
+
+
+class ProgressSnapshotTests(TestCase):
+
+    def setUp(self):
+        department = Department.objects.create(name='Test Department', code='TD')
+        self.programme = Programme.objects.create(
+            department=department,
+            name='Test Programme',
+            code='TP',
+            award_level='Diploma',
+            duration_years=2,
+            trimesters_per_year=3
+        )
+        self.unit = CurriculumUnit.objects.create(programme=self.programme, code='TP101', title='Intro', credit_hours=3)
+        self.user = User.objects.create_user(username='teststudent', role=User.Roles.STUDENT)
+        self.student = Student.objects.create(
+            user=self.user,
+            programme=self.programme,
+            year=1,
+            trimester=1,
+            trimester_label='T1',
+            cohort_year=2025
+        )
+        self.registration = Registration.objects.create(
+            student=self.student, unit=self.unit, academic_year=2025, trimester=1,
+            status=Registration.Status.APPROVED,
+        )
+        self.assignment = Assignment.objects.create(unit=self.unit, title='Essay')
+        self.submission = Submission.objects.create(
+            assignment=self.assignment, student=self.student, content_url='https://example.com/essay',
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = f'/api/learning/students/{self.student.pk}/progress/'
+
+    def test_grading_updates_snapshot(self):
+        snapshot = UnitProgressSnapshot.objects.get(student=self.student, unit=self.unit)
+        self.assertTrue(snapshot.is_registered)
+        self.assertFalse(snapshot.completed)
+
+        self.submission.grade = Decimal('80.00')
+        self.submission.save()
+        snapshot.refresh_from_db()
+        self.assertEqual(snapshot.graded_count, 1)
+        self.assertEqual(snapshot.average_grade, 80.0)
+        self.assertTrue(snapshot.completed)
+
+    def test_deregistration_hides_unit(self):
+        self.registration.status = Registration.Status.REJECTED
+        self.registration.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['total_units'], 0)
+
+    def test_summary_served_from_snapshots_with_validators(self):
+        self.submission.grade = Decimal('70.00')
+        self.submission.save()
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['completed_units'], 1)
+        self.assertEqual(response.data['overall_average'], 70.0)
+        self.assertEqual(response.json()['unit_progress'][0]['submissions'][0]['grade'], 70.0)
+
+        with self.assertNumQueries(2):
+            cached = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(cached.status_code, 304)
+
+        self.submission.grade = Decimal('90.00')
+        self.submission.save()
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 200)
+
+    def test_title_edits_invalidate_the_summary(self):
+        etag = self.client.get(self.url)['ETag']
+        self.unit.title = 'Introduction'
+        self.unit.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['unit_progress'][0]['unit_title'], 'Introduction')
+
+        self.assignment.title = 'Long essay'
+        self.assignment.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['unit_progress'][0]['submissions'][0]['assignment_title'], 'Long essay')
+
+    def test_rebuild_repairs_drift(self):
+        UnitProgressSnapshot.objects.update(average_grade=None, submission_count=0, submissions=[])
+        counts = rebuild_progress_snapshots()
+        self.assertEqual(counts, {'created': 0, 'updated': 1, 'deleted': 0})
+        self.assertEqual(UnitProgressSnapshot.objects.get().submission_count, 1)
+
+        UnitProgressSnapshot.objects.all().delete()
+        call_command('rebuild_progress_snapshots', stdout=open('/dev/null', 'w'))
+        self.assertEqual(UnitProgressSnapshot.objects.count(), 1)
@@ -0,0 +1,129 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from core.catalogue import local_cache
+from core.models import CalendarEvent
+from learning.models import CurriculumUnit, Department, Programme, Registration, UnitProgressSnapshot
+from learning.services.curriculum import curriculum_graph
+from learning.services.registrations import bulk_approve_registrations
+from notifications.models import Notification
+from users.models import Guardian, ParentStudentLink, Student, User
+
+
+class BulkRegistrationApprovalTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        local_cache.clear()
+        department = Department.objects.create(name='Test Department', code='TD')
+        self.programme = Programme.objects.create(
+            department=department,
+            name='Test Programme',
+            code='TP',
+            award_level='Diploma',
+            duration_years=2,
+            trimesters_per_year=3
+        )
+        self.units = [
+            CurriculumUnit.objects.create(programme=self.programme, code=f'U{index}', title=f'Unit {index}', credit_hours=3)
+            for index in range(3)
+        ]
+        self.students = []
+        for index in range(3):
+            user = User.objects.create_user(username=f'student{index}', role=User.Roles.STUDENT)
+            student = Student.objects.create(
+                user=user,
+                programme=self.programme,
+                year=1,
+                trimester=1,
+                trimester_label='T1',
+                cohort_year=2025
+            )
+            guardian = Guardian.objects.create(
+                user=User.objects.create_user(username=f'parent{index}', role=User.Roles.PARENT)
+            )
+            ParentStudentLink.objects.create(parent=guardian, student=student)
+            self.students.append(student)
+        self.hod = User.objects.create_user(username='hod', role=User.Roles.HOD)
+
+    def _registrations(self, students):
+        return [
+            Registration.objects.create(
+                student=student, unit=unit, academic_year=2025, trimester=1, status=Registration.Status.PENDING_HOD
+            ).pk
+            for student in students
+            for unit in self.units
+        ]
+
+    def test_side_effects_run_for_every_approved_row(self):
+        ids = self._registrations(self.students[:1])
+        results = bulk_approve_registrations([*ids, ids[0], 999999, 'x'], self.hod)
+
+        self.assertEqual(
+            [row['result'] for row in results],
+            ['approved', 'approved', 'approved', 'duplicate', 'not_found', 'invalid'],
+        )
+        approved = Registration.objects.filter(pk__in=ids, status=Registration.Status.APPROVED)
+        self.assertEqual(approved.filter(approved_by=self.hod, approved_at__isnull=False).count(), len(ids))
+        student, parent = self.students[0].user_id, ParentStudentLink.objects.get(student=self.students[0]).parent_id
+        events = CalendarEvent.objects.filter(source_type='registration')
+        self.assertEqual(
+            set(events.values_list('owner_user_id', 'source_id')),
+            {(owner, str(pk)) for owner in (student, parent) for pk in ids},
+        )
+        self.assertEqual(Notification.objects.filter(user_id=parent, type='registration').count(), len(ids))
+        self.assertEqual(
+            UnitProgressSnapshot.objects.filter(student=self.students[0], is_registered=True).count(), len(ids)
+        )
+
+        # Approving again is a no-op report; the events are not duplicated.
+        self.assertEqual({row['result'] for row in bulk_approve_registrations(ids, self.hod)}, {'already_approved'})
+        self.assertEqual(events.count(), 2 * len(ids))
+
+    def test_query_count_does_not_grow_with_the_batch(self):
+        small = self._registrations(self.students[:1])
+        large = self._registrations(self.students[1:])
+        curriculum_graph(self.programme.pk)
+        with CaptureQueriesContext(connection) as small_queries:
+            bulk_approve_registrations(small, self.hod)
+        with CaptureQueriesContext(connection) as large_queries:
+            bulk_approve_registrations(large, self.hod)
+        self.assertEqual(len(small_queries), len(large_queries))
+        self.assertEqual(CalendarEvent.objects.filter(source_type='registration').count(), 2 * (len(small) + len(large)))
+
+    def test_only_pending_rows_with_met_prerequisites_are_approved(self):
+        self.units[2].has_prereq, self.units[2].prereq_unit = True, self.units[1]
+        self.units[2].save()
+        rejected, draft, needs_prereq = [
+            Registration.objects.create(
+                student=self.students[0], unit=unit, academic_year=2025, trimester=1, status=state
+            ).pk
+            for unit, state in zip(self.units, ['rejected', 'draft', 'submitted'])
+        ]
+        results = bulk_approve_registrations([rejected, draft, needs_prereq], self.hod)
+        self.assertEqual(
+            results,
+            [
+                {'id': rejected, 'result': 'rejected'},
+                {'id': draft, 'result': 'not_pending'},
+                {'id': needs_prereq, 'result': 'prerequisites_unmet', 'missing': ['U1']},
+            ],
+        )
+        self.assertFalse(Registration.objects.filter(status=Registration.Status.APPROVED).exists())
+        self.assertFalse(CalendarEvent.objects.filter(source_type='registration').exists())
+
+    def test_endpoint_reports_per_id(self):
+        ids = self._registrations(self.students[:1])
+        client = APIClient()
+        client.force_authenticate(self.hod)
+        response = client.post('/api/core/api/hods/approve_registrations/', {'registration_ids': ids}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['detail'], '3 registrations approved.')
+        self.assertEqual(response.data['results'], [{'id': pk, 'result': 'approved'} for pk in ids])
+        self.assertEqual(set(Registration.objects.filter(pk__in=ids).values_list('approved_by', flat=True)), {self.hod.pk})
+
+        response = client.post('/api/core/api/hods/approve_registrations/', {'registration_ids': 5}, format='json')
+        self.assertEqual(response.status_code, 400)
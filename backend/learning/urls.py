@@ -24,7 +24,9 @@ from .views.assignments import (
     RegistrationViewSet,
     SubmissionViewSet,
 )
-from .views.progress_views import ProgressSummaryView
+from .views.goals import LearningGoalViewSet
+from .views.progress_views import CohortProgressView, ProgressSummaryView
+from .views.activity_views import ActivityAnalyticsView, ActivityBatchIngestView
 
 router = DefaultRouter()
 router.register(r"programmes", ProgrammeViewSet, basename="programme")
@@ -42,9 +44,13 @@ router.register(r"reward-claims", RewardClaimViewSet, basename="reward-claim")
 router.register(r"term-progress", TermProgressViewSet, basename="term-progress")
 router.register(r"assignments", AssignmentViewSet, basename="assignment")
 router.register(r"registrations", RegistrationViewSet, basename="registration")
+router.register(r"learning-goals", LearningGoalViewSet, basename="learning-goal")
 
 custom_patterns = [
     path("students/<int:student_id>/progress/", ProgressSummaryView.as_view(), name="progress-summary"),
+    path("progress/cohort/", CohortProgressView.as_view(), name="cohort-progress"),
+    path("activity/batch/", ActivityBatchIngestView.as_view(), name="activity-batch"),
+    path("analytics/activity/", ActivityAnalyticsView.as_view(), name="activity-analytics"),
     # path("enrollments/quick/", QuickEnrollmentView.as_view(), name="quick-enrollment"),
     # path("courses/<int:course_id>/roster/", CourseRosterView.as_view(), name="course-roster"),
     # path("attendance/check-in/", AttendanceCheckInView.as_view(), name="attendance-check-in"),
@@ -1,11 +1,14 @@
 from rest_framework import viewsets, permissions, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.utils import timezone
 from django.db.models import Q, Count
 from django_filters.rest_framework import DjangoFilterBackend
 
 from core.permissions import IsAdminOrLecturer, IsStudentReadOnly
+from rewards import leaderboard
+from users.models import User
+from ..services.achievements import achievement_availability, achievements_overview, availability_row
+from ..services.points import approve_achievement_claims, approve_reward_claims
 from ..serializers.achievements import (
     AchievementCategorySerializer,
     AchievementSerializer,
@@ -42,40 +45,15 @@ class AchievementCategoryViewSet(viewsets.ModelViewSet):
     def achievements_overview(self, request, pk=None):
         """Get overview of achievements in this category with student progress"""
         category = self.get_object()
-        user = request.user
         term = request.query_params.get('term')
-        
+
         if not term:
             return Response({'error': 'Term parameter is required'}, status=400)
-            
-        achievements = category.achievements.all()
-        data = []
-        
-        for achievement in achievements:
-            achievement_data = self.get_serializer(achievement).data
-            if user.role == 'student':
-                claims = StudentAchievement.objects.filter(
-                    achievement=achievement,
-                    student=user,
-                    term=term
-                ).count()
-                achievement_data['claimed_count'] = claims
-            else:
-                total_claims = StudentAchievement.objects.filter(
-                    achievement=achievement,
-                    term=term
-                ).count()
-                approved_claims = StudentAchievement.objects.filter(
-                    achievement=achievement,
-                    term=term,
-                    approved_by__isnull=False
-                ).count()
-                achievement_data.update({
-                    'total_claims': total_claims,
-                    'approved_claims': approved_claims
-                })
-            data.append(achievement_data)
-            
+
+        data = achievements_overview(
+            category, term, request.user,
+            serialize=lambda achievement: AchievementSerializer(achievement, context=self.get_serializer_context()).data,
+        )
         return Response(data)
 
 
@@ -90,6 +68,13 @@ class AchievementViewSet(viewsets.ModelViewSet):
     filter_backends = [filters.SearchFilter, DjangoFilterBackend]
     filterset_fields = ['category', 'requires_approval', 'max_claims_per_term']
     search_fields = ['name', 'description', 'voice_message']
+    staff_roles = {'lecturer', 'hod', 'admin', 'superadmin'}
+
+    def get_permissions(self):
+        # Availability also serves parents, who are checked against their linked students in the action.
+        if self.action == 'availability':
+            return [permissions.IsAuthenticated()]
+        return super().get_permissions()
 
     @action(detail=True, methods=['get'])
     def student_progress(self, request, pk=None):
@@ -107,6 +92,9 @@ class AchievementViewSet(viewsets.ModelViewSet):
         )
         return Response(claims)
 
+    def get_queryset(self):
+        return self.queryset.select_related('category').prefetch_related('prerequisites')
+
     @action(detail=True, methods=['get'])
     def available_for_student(self, request, pk=None):
         """Check if student can claim this achievement"""
@@ -116,34 +104,49 @@ class AchievementViewSet(viewsets.ModelViewSet):
         
         if not term or user.role != 'student':
             return Response({'error': 'Invalid request'}, status=400)
-            
-        current_claims = StudentAchievement.objects.filter(
-            achievement=achievement,
-            student=user,
-            term=term
-        ).count()
-        
-        can_claim = current_claims < achievement.max_claims_per_term if achievement.max_claims_per_term else True
-        prerequisites_met = True
-        
-        # Check prerequisites if any
-        if achievement.prerequisites.exists():
-            for prereq in achievement.prerequisites.all():
-                if not StudentAchievement.objects.filter(
-                    achievement=prereq,
-                    student=user,
-                    approved_by__isnull=False
-                ).exists():
-                    prerequisites_met = False
-                    break
-                    
+
+        annotated = achievement_availability(user, term, Achievement.objects.filter(pk=achievement.pk)).get()
+        row = availability_row(annotated)
         return Response({
-            'can_claim': can_claim and prerequisites_met,
-            'current_claims': current_claims,
-            'max_claims': achievement.max_claims_per_term,
-            'prerequisites_met': prerequisites_met
+            'can_claim': row['can_claim'],
+            'current_claims': row['current_claims'],
+            'max_claims': row['max_claims'],
+            'prerequisites_met': row['prerequisites_met']
         })
 
+    @action(detail=False, methods=['get'])
+    def availability(self, request):
+        """Claimability of every achievement for a student in a term, in one query"""
+        user = request.user
+        term = request.query_params.get('term')
+        if not term:
+            return Response({'error': 'Term parameter is required'}, status=400)
+
+        if user.role == 'student':
+            student = user
+        else:
+            try:
+                student_id = int(request.query_params.get('student', ''))
+            except ValueError:
+                return Response({'error': 'A valid student parameter is required'}, status=400)
+            student = User.objects.filter(pk=student_id, role=User.Roles.STUDENT).first()
+            if student is None:
+                return Response({'error': 'A valid student parameter is required'}, status=400)
+            if user.role == 'parent':
+                linked = hasattr(user, 'guardian_profile') and (
+                    user.guardian_profile.linked_students.filter(student_id=student.pk).exists()
+                )
+                if not linked:
+                    return Response({'error': 'You can only view your linked students'}, status=403)
+            elif not (user.is_staff or user.role in self.staff_roles):
+                return Response({'error': 'Forbidden'}, status=403)
+
+        achievements = self.filter_queryset(Achievement.objects.all()).order_by('category_id', 'name')
+        return Response([
+            availability_row(achievement)
+            for achievement in achievement_availability(student, term, achievements)
+        ])
+
 
 class StudentAchievementViewSet(viewsets.ModelViewSet):
     """
@@ -181,15 +184,9 @@ class StudentAchievementViewSet(viewsets.ModelViewSet):
             return Response({'error': 'Achievement already approved'},
                           status=400)
 
-        achievement.approved_by = request.user
-        achievement.approved_at = timezone.now()
-        achievement.save()
-
-        # Update term progress
-        TermProgress.objects.get_or_create(
-            student=achievement.student,
-            term=achievement.term,
-        )
+        # Credits the points to TermProgress through the ledger
+        approve_achievement_claims(StudentAchievement.objects.filter(pk=achievement.pk), request.user)
+        achievement.refresh_from_db()
 
         return Response(self.get_serializer(achievement).data)
         
@@ -200,7 +197,7 @@ class StudentAchievementViewSet(viewsets.ModelViewSet):
             return Response({'error': 'Only lecturers can approve achievements'},
                           status=403)
             
-        achievement = self.get_object()
+        achievement = self.get_object().achievement
         student_ids = request.data.get('student_ids', [])
         term = request.data.get('term')
         
@@ -216,12 +213,9 @@ class StudentAchievementViewSet(viewsets.ModelViewSet):
             approved_by__isnull=True
         )
         
-        # Bulk update claims
-        updated_count = claims.update(
-            approved_by=request.user,
-            approved_at=timezone.now()
-        )
-        
+        # Bulk approve claims and credit points in a constant number of statements
+        updated_count = approve_achievement_claims(claims, request.user)
+
         return Response({
             'message': f'Approved {updated_count} achievement claims',
             'updated_count': updated_count
@@ -242,6 +236,8 @@ class RewardClaimViewSet(viewsets.ModelViewSet):
         user = self.request.user
         if user.role == 'student':
             return RewardClaim.objects.filter(student=user)
+        elif user.role in ['lecturer', 'admin']:
+            return RewardClaim.objects.all()
         return RewardClaim.objects.none()
 
     def perform_create(self, serializer):
@@ -261,9 +257,8 @@ class RewardClaimViewSet(viewsets.ModelViewSet):
             return Response({'error': 'Reward already approved'},
                           status=400)
 
-        claim.approved_by = request.user
-        claim.approved_at = timezone.now()
-        claim.save()
+        approve_reward_claims(RewardClaim.objects.filter(pk=claim.pk), request.user)
+        claim.refresh_from_db()
 
         return Response(self.get_serializer(claim).data)
 
@@ -344,25 +339,28 @@ class TermProgressViewSet(viewsets.ReadOnlyModelViewSet):
         if not term:
             return Response({'error': 'Term parameter is required'}, status=400)
             
-        leaderboard = TermProgress.objects.filter(term=term).select_related('student')
-        
-        # Annotate with achievement counts and total points
-        leaderboard = leaderboard.annotate(
-            total_achievements=Count('student__achievements', 
-                                  filter=Q(student__achievements__approved_by__isnull=False)),
-            total_points=Count('student__achievements__points_earned')
-        ).order_by('-total_points', '-total_achievements')[:10]
-        
+        entries = leaderboard.top(leaderboard.term_board(term), 10)
+        student_ids = [entry['student_id'] for entry in entries]
+        names = dict(User.objects.filter(pk__in=student_ids).values_list('pk', 'display_name'))
+        approved = dict(
+            StudentAchievement.objects.filter(student_id__in=student_ids, term=term, approved_by__isnull=False)
+            .values('student_id').annotate(total=Count('id')).order_by().values_list('student_id', 'total')
+        )
+        rewards_claimed = dict(
+            TermProgress.objects.filter(student_id__in=student_ids, term=term)
+            .values_list('student_id', 'rewards_claimed_count')
+        )
+
         data = []
-        for entry in leaderboard:
+        for entry in entries:
+            student_id = entry['student_id']
             data.append({
-                'student_name': entry.student.display_name,
-                'total_achievements': entry.total_achievements,
-                'total_points': entry.total_points,
-                # Use annotated achievements as badges earned to avoid relying on undeclared fields
-                'badges_earned': entry.total_achievements,
-                # Fall back to model field maintained by the system
-                'rewards_claimed': getattr(entry, 'rewards_claimed_count', 0),
+                'rank': entry['rank'],
+                'student_name': names.get(student_id, ''),
+                'total_achievements': approved.get(student_id, 0),
+                'total_points': entry['score'],
+                'badges_earned': approved.get(student_id, 0),
+                'rewards_claimed': rewards_claimed.get(student_id, 0),
             })
-            
+
         return Response(data)
@@ -0,0 +1,215 @@
+from datetime import date
+
+from django.db.models import F, Sum
+from django.db.models.functions import TruncWeek
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from learning.models import Programme
+from learning.progress_models import ActivityDailyRollup, ActivityLog
+from learning.serializers import ActivityBatchSerializer, ActivityEventSerializer
+from repository.models import LibraryAsset
+from users.models import Student
+
+
+class ActivityBatchIngestView(APIView):
+    """
+    Accepts a batch of ActivityLog events queued offline by the mobile app.
+
+    Each event carries a client-generated ``client_id``; events already stored
+    for the student (or repeated within the batch) are reported as duplicates,
+    so a client can safely re-send a batch after a dropped connection. Valid
+    events are written with a single bulk_create and every event gets an
+    accepted/duplicate/rejected result in request order; "accepted" means
+    this request's row is the one stored.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    staff_roles = {'lecturer', 'hod', 'records', 'admin', 'superadmin'}
+
+    def post(self, request):
+        batch = ActivityBatchSerializer(data=request.data)
+        batch.is_valid(raise_exception=True)
+
+        student, error = self._resolve_student(request.user, batch.validated_data.get('student'))
+        if error is not None:
+            return error
+
+        events = batch.validated_data['events']
+        results = [None] * len(events)
+        candidates = []
+        seen = set()
+        for index, raw in enumerate(events):
+            serializer = ActivityEventSerializer(data=raw)
+            if not serializer.is_valid():
+                results[index] = self._result(raw.get('client_id'), 'rejected', serializer.errors)
+                continue
+            data = serializer.validated_data
+            if data['client_id'] in seen:
+                results[index] = self._result(data['client_id'], 'duplicate')
+                continue
+            seen.add(data['client_id'])
+            candidates.append((index, data))
+
+        # One query each for foreign keys and already-ingested client ids.
+        programme_ids = set(
+            Programme.objects.filter(pk__in={data['programme'] for _, data in candidates}).values_list('pk', flat=True)
+        )
+        resource_ids = set(
+            LibraryAsset.objects.filter(
+                pk__in={data['resource'] for _, data in candidates if data.get('resource')}
+            ).values_list('pk', flat=True)
+        )
+        existing = set(
+            ActivityLog.objects.filter(student=student, client_id__in=seen).order_by().values_list('client_id', flat=True)
+        )
+
+        to_create, pending = [], {}
+        for index, data in candidates:
+            client_id = data['client_id']
+            if client_id in existing:
+                results[index] = self._result(client_id, 'duplicate')
+            elif data['programme'] not in programme_ids:
+                results[index] = self._result(client_id, 'rejected', {'programme': ['Invalid programme.']})
+            elif data.get('resource') and data['resource'] not in resource_ids:
+                results[index] = self._result(client_id, 'rejected', {'resource': ['Invalid resource.']})
+            else:
+                to_create.append(ActivityLog(
+                    student=student,
+                    programme_id=data['programme'],
+                    resource_id=data.get('resource'),
+                    client_id=client_id,
+                    occurred_at=data.get('occurred_at'),
+                    activity_type=data['activity_type'],
+                    duration_minutes=data.get('duration_minutes'),
+                    details=data.get('details'),
+                    was_successful=data.get('was_successful'),
+                    difficulty_reported=data.get('difficulty_reported'),
+                    needed_help=data.get('needed_help', False),
+                    helper_type=data.get('helper_type', ''),
+                ))
+                pending[client_id] = index
+
+        # ignore_conflicts covers a concurrent flush of the same events racing this one;
+        # rows it dropped are stored with the racer's created_at, so they count as duplicates.
+        if to_create:
+            ActivityLog.objects.bulk_create(to_create, batch_size=500, ignore_conflicts=True)
+            stored = dict(
+                ActivityLog.objects.filter(student=student, client_id__in=pending)
+                .order_by().values_list('client_id', 'created_at')
+            )
+        for log in to_create:
+            outcome = 'accepted' if stored.get(log.client_id) == log.created_at else 'duplicate'
+            results[pending[log.client_id]] = self._result(log.client_id, outcome)
+
+        summary = {key: 0 for key in ('accepted', 'duplicate', 'rejected')}
+        for result in results:
+            summary[result['status']] += 1
+        return Response({**summary, 'results': results}, status=status.HTTP_200_OK)
+
+    @staticmethod
+    def _result(client_id, outcome, errors=None):
+        result = {'client_id': client_id, 'status': outcome}
+        if errors:
+            result['errors'] = errors
+        return result
+
+    def _resolve_student(self, user, student_id):
+        forbidden = Response({"error": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
+        if user.role == 'student':
+            student = Student.objects.filter(user=user).first()
+            if student is None or (student_id is not None and student_id != student.pk):
+                return None, forbidden
+            return student, None
+
+        if student_id is None:
+            return None, Response({'detail': 'student is required.'}, status=status.HTTP_400_BAD_REQUEST)
+        student = Student.objects.filter(pk=student_id).first()
+        if student is None:
+            return None, Response({'detail': 'Student not found.'}, status=status.HTTP_404_NOT_FOUND)
+
+        if user.role == 'parent':
+            if not hasattr(user, 'guardian_profile') or not user.guardian_profile.linked_students.filter(student=student).exists():
+                return None, forbidden
+        elif not (user.is_staff or user.role in self.staff_roles):
+            return None, forbidden
+        return student, None
+
+
+class ActivityAnalyticsView(APIView):
+    """
+    Activity usage by day or week for the admin analytics screen.
+
+    Reads only ActivityDailyRollup, so a term-wide chart is a single grouped
+    query over a few rows per day instead of a scan of raw ActivityLog rows.
+    Query params: ``start``/``end`` (YYYY-MM-DD), ``bucket`` (day|week),
+    ``group_by`` (activity_type|programme|helper_type) and optional
+    ``programme`` or ``department`` filters.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    allowed_roles = {'hod', 'records', 'admin', 'superadmin'}
+    group_fields = {
+        'activity_type': 'activity_type',
+        'programme': 'programme_id',
+        'helper_type': 'helper_type',
+    }
+
+    def get(self, request):
+        user = request.user
+        if not (user.is_staff or user.is_superuser or user.role in self.allowed_roles):
+            return Response({"error": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
+
+        params = request.query_params
+        bucket = params.get('bucket', 'day')
+        group_by = params.get('group_by', 'activity_type')
+        if bucket not in ('day', 'week') or group_by not in self.group_fields:
+            return Response(
+                {'detail': 'bucket must be day or week; group_by must be activity_type, programme or helper_type.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            start = date.fromisoformat(params['start'])
+            end = date.fromisoformat(params['end'])
+        except (KeyError, ValueError):
+            return Response({'detail': 'start and end are required dates (YYYY-MM-DD).'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            programme_id = int(params['programme']) if params.get('programme') else None
+            department_id = int(params['department']) if params.get('department') else None
+        except ValueError:
+            return Response({'detail': 'programme and department must be integers.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        rollups = ActivityDailyRollup.objects.filter(day__gte=start, day__lte=end)
+        if programme_id is not None:
+            rollups = rollups.filter(programme_id=programme_id)
+        if department_id is not None:
+            rollups = rollups.filter(programme__department_id=department_id)
+
+        group_field = self.group_fields[group_by]
+        rows = (
+            rollups.annotate(bucket=TruncWeek('day') if bucket == 'week' else F('day'))
+            .values('bucket', group_field)
+            .annotate(
+                events=Sum('event_count'),
+                minutes=Sum('total_minutes'),
+                successful=Sum('successful_count'),
+                needed_help=Sum('needed_help_count'),
+            )
+            .order_by('bucket', group_field)
+        )
+        return Response({
+            'start': start,
+            'end': end,
+            'bucket': bucket,
+            'group_by': group_by,
+            'results': [
+                {
+                    'bucket': row['bucket'],
+                    group_by: row[group_field],
+                    'events': row['events'],
+                    'minutes': row['minutes'],
+                    'successful': row['successful'],
+                    'needed_help': row['needed_help'],
+                }
+                for row in rows
+            ],
+        })
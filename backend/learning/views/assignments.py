@@ -2,11 +2,13 @@ from django.utils import timezone
 from rest_framework import permissions, viewsets, status
 from rest_framework.decorators import action
 from rest_framework.exceptions import PermissionDenied
+from rest_framework.response import Response
 
 from core.mixins import ScopedListMixin
 from core.permissions import IsSelfOrElevated
 from learning.models import Assignment, Registration, Submission
 from learning.serializers import AssignmentSerializer, RegistrationSerializer, SubmissionSerializer
+from learning.services.curriculum import validate_registrations
 from users.models import User
 
 
@@ -101,3 +103,22 @@ class RegistrationViewSet(ScopedListMixin, viewsets.ModelViewSet):
             serializer.save(approved_by=user, approved_at=timezone.now())
         else:
             serializer.save()
+
+    @action(detail=False, methods=["post"])
+    def validate(self, request):
+        """
+        Checks a batch of ``registrations`` (``[{"student": id, "unit": id}, ...]``)
+        against the prerequisite graph and each student's approved units.
+        """
+        if getattr(request.user, "role", None) == User.Roles.STUDENT:
+            raise PermissionDenied("Only staff can validate registration batches.")
+        rows = request.data.get("registrations")
+        try:
+            pairs = [(int(row["student"]), int(row["unit"])) for row in rows]
+        except (KeyError, TypeError, ValueError):
+            return Response(
+                {"detail": "registrations must be a list of {student, unit} objects."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        errors = validate_registrations(pairs)
+        return Response({"valid": not errors, "errors": errors})
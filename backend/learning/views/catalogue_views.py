@@ -3,27 +3,37 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 
+from core.mixins import CatalogueCacheMixin, ConditionalGetMixin
+
 from ..models import Programme, CurriculumUnit, TermOffering, LecturerAssignment, Timetable
 from ..serializers import ProgrammeSerializer, CurriculumUnitSerializer, TermOfferingSerializer, LecturerAssignmentSerializer, TimetableSerializer
 
 
-class ProgrammeViewSet(viewsets.ReadOnlyModelViewSet):
+class ProgrammeViewSet(ConditionalGetMixin, CatalogueCacheMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Programme.objects.all()
     serializer_class = ProgrammeSerializer
+    catalogue_models = (Programme,)
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['department']
 
     @action(detail=True, methods=['get'])
     def curriculum(self, request, pk=None):
-        programme = self.get_object()
-        curriculum = CurriculumUnit.objects.filter(programme=programme)
-        serializer = CurriculumUnitSerializer(curriculum, many=True)
-        return Response(serializer.data)
+        def respond():
+            programme = self.get_object()
+            curriculum = CurriculumUnit.objects.filter(programme=programme)
+            serializer = CurriculumUnitSerializer(curriculum, many=True)
+            return Response(serializer.data)
+
+        return self.conditional_response(
+            CurriculumUnit.objects.filter(programme_id=self.lookup_value()),
+            lambda: self.cached_response(respond, models=(Programme, CurriculumUnit)),
+        )
 
 
-class TermOfferingViewSet(viewsets.ModelViewSet):
+class TermOfferingViewSet(ConditionalGetMixin, CatalogueCacheMixin, viewsets.ModelViewSet):
     queryset = TermOffering.objects.all()
     serializer_class = TermOfferingSerializer
+    catalogue_models = (TermOffering,)
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['programme', 'academic_year', 'trimester']
 
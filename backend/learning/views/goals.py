@@ -0,0 +1,72 @@
+from rest_framework import viewsets, permissions, filters
+from django.db.models import Count, Prefetch, Q
+from django_filters.rest_framework import DjangoFilterBackend
+
+from core.pagination import StandardResultsSetPagination
+from ..goals_models import LearningGoal, LearningMilestone
+from ..serializers.goals import (
+    LearningGoalSerializer,
+    LearningGoalListSerializer,
+    reflection_summary_annotations,
+)
+
+
+class LearningGoalViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    API endpoint for learning goals.
+
+    Milestone counts, per-milestone support/reflection counts and the
+    reflection summary come from annotations and prefetches, so a list page
+    costs a count plus one query and a goal's detail costs three queries,
+    however many milestones and reflections it has. ``?fields=`` and
+    ``?expand=`` drop the columns, annotations and prefetches behind any
+    field the client leaves out.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = StandardResultsSetPagination
+    filter_backends = [filters.SearchFilter, DjangoFilterBackend]
+    filterset_fields = ['student', 'programme', 'term', 'status']
+    search_fields = ['title', 'description']
+    staff_roles = {'lecturer', 'records', 'admin', 'superadmin'}
+
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return LearningGoalListSerializer
+        return LearningGoalSerializer
+
+    def get_queryset(self):
+        goals = self._scoped(LearningGoal.objects.all())
+        serializer = self.get_serializer()
+        if self.action == 'list':
+            if serializer.wants('milestone_count'):
+                goals = goals.annotate(milestone_total=Count('milestones', distinct=True))
+            if serializer.wants('completed_milestone_count'):
+                goals = goals.annotate(
+                    milestone_done=Count('milestones', filter=Q(milestones__completed=True), distinct=True)
+                )
+            return serializer.prepare_queryset(goals).order_by('-created_at', '-id')
+
+        if serializer.wants('reflection_summary'):
+            goals = goals.annotate(**reflection_summary_annotations())
+        milestones = (
+            LearningMilestone.objects.select_related('verified_by')
+            .annotate(
+                support_total=Count('support_records', distinct=True),
+                reflection_total=Count('reflections', distinct=True),
+            )
+            .prefetch_related('required_resources')
+            .order_by('order', 'id')
+        )
+        return serializer.prepare_queryset(goals, prefetches={'milestones': Prefetch('milestones', queryset=milestones)})
+
+    def _scoped(self, goals):
+        user = self.request.user
+        if user.is_staff or user.is_superuser or user.role in self.staff_roles:
+            return goals
+        if user.role == 'student':
+            return goals.filter(student_id=user.id)
+        if user.role == 'parent':
+            return goals.filter(student__parent_links__parent_id=user.id)
+        if user.role == 'hod':
+            return goals.filter(programme__department__hod__user_id=user.id)
+        return goals.none()
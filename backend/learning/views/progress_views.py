@@ -1,16 +1,31 @@
+import csv
+
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import permissions, status
+from django.db.models import Avg, Count, Exists, F, Max, OuterRef, Q, Sum
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 
+from core.mixins import ConditionalGetMixin
+from core.pagination import StandardResultsSetPagination
 from users.models import Student
-from learning.models import Registration, Submission, CurriculumUnit
+from learning.models import Registration, UnitProgressSnapshot
+
+class ProgressSummaryView(ConditionalGetMixin, APIView):
+    """
+    Serves a student's unit progress from UnitProgressSnapshot rows.
 
-class ProgressSummaryView(APIView):
+    Responses carry ETag/Last-Modified validators derived from the snapshot
+    table and the live unit and programme rows, so unchanged dashboards get a
+    304 after a single aggregate query.
+    """
     permission_classes = [permissions.IsAuthenticated]
+    # Unit codes/titles and programme names are read live, so their edits must change the validators too.
+    last_modified_related = ('unit__updated_at', 'unit__programme__updated_at')
 
     def get(self, request, student_id):
-        student = get_object_or_404(Student, pk=student_id)
+        student = get_object_or_404(Student.objects.select_related('user'), pk=student_id)
         user = request.user
 
         # Permission check
@@ -23,46 +38,28 @@ class ProgressSummaryView(APIView):
         elif user.role not in ['lecturer', 'hod', 'records', 'admin', 'superadmin']:
             return Response({"error": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
 
-        registrations = Registration.objects.filter(student=student, status='approved').select_related('unit__programme')
-        
+        snapshots = UnitProgressSnapshot.objects.filter(student=student, is_registered=True)
+        response = self.conditional_response(snapshots, lambda: self._summary(student, snapshots))
+        response['Cache-Control'] = 'private, no-cache'
+        return response
+
+    def _summary(self, student, snapshots):
         unit_progress = []
         completed_units = 0
-        total_units = registrations.count()
-        
-        all_submissions = Submission.objects.filter(student=student).select_related('assignment__unit')
-        
-        # Group submissions by unit
-        submissions_by_unit = {}
-        for sub in all_submissions:
-            if sub.assignment.unit.id not in submissions_by_unit:
-                submissions_by_unit[sub.assignment.unit.id] = []
-            submissions_by_unit[sub.assignment.unit.id].append(sub)
-
-        for reg in registrations:
-            unit = reg.unit
-            submissions_for_unit = submissions_by_unit.get(unit.id, [])
-            
-            grades = [float(s.grade) for s in submissions_for_unit if s.grade is not None]
-            average_grade = sum(grades) / len(grades) if grades else None
-
-            is_completed = average_grade is not None # Or some other logic
-
-            if is_completed:
+        for snapshot in snapshots.select_related('unit__programme').order_by('unit__code'):
+            unit = snapshot.unit
+            programme = unit.programme
+            if snapshot.completed:
                 completed_units += 1
-
             unit_progress.append({
                 'unit_id': unit.id,
                 'unit_code': unit.code,
                 'unit_title': unit.title,
-                'programme_id': unit.programme.id,
-                'programme_name': unit.programme.name,
-                'average_grade': average_grade,
-                'completed': is_completed,
-                'submissions': [{
-                    'assignment_id': s.assignment.id,
-                    'assignment_title': s.assignment.title,
-                    'grade': s.grade,
-                } for s in submissions_for_unit]
+                'programme_id': programme.id if programme else None,
+                'programme_name': programme.name if programme else None,
+                'average_grade': snapshot.average_grade,
+                'completed': snapshot.completed,
+                'submissions': snapshot.submissions,
             })
 
         overall_average = sum(up['average_grade'] for up in unit_progress if up['average_grade'] is not None) / completed_units if completed_units > 0 else None
@@ -75,8 +72,104 @@ class ProgressSummaryView(APIView):
             },
             "unit_progress": unit_progress,
             "completed_units": completed_units,
-            "total_units": total_units,
+            "total_units": len(unit_progress),
             "overall_average": overall_average,
         }
-        
+
         return Response(response_data)
+
+
+class _Echo:
+    """File-like object whose write() hands the row back for streaming."""
+
+    def write(self, value):
+        return value
+
+
+class CohortProgressView(APIView):
+    """
+    Per-student progress for a whole unit, programme or department in one term.
+
+    Aggregates UnitProgressSnapshot rows in the database, so a page costs a
+    count query plus one aggregate query regardless of cohort size. Pass
+    ``export=csv`` to stream the full cohort as CSV instead of paginating.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    allowed_roles = {'lecturer', 'hod', 'records', 'admin', 'superadmin'}
+    scope_filters = {
+        'unit': 'unit_id',
+        'programme': 'unit__programme_id',
+        'department': 'unit__programme__department_id',
+    }
+    csv_columns = [
+        'student_id', 'username', 'display_name', 'units', 'completed_units',
+        'completed', 'submission_count', 'graded_count', 'average_grade',
+    ]
+
+    def get(self, request):
+        user = request.user
+        if not (user.is_staff or user.is_superuser or user.role in self.allowed_roles):
+            return Response({"error": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
+
+        params = request.query_params
+        scopes = {name: params[name] for name in self.scope_filters if params.get(name)}
+        if len(scopes) != 1:
+            return Response({'detail': 'Provide exactly one of unit, programme or department.'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            academic_year = int(params['academic_year'])
+            trimester = int(params['trimester'])
+            (scope, scope_id), = scopes.items()
+            scope_id = int(scope_id)
+        except (KeyError, ValueError):
+            return Response({'detail': 'academic_year, trimester and the scope id must be integers.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        registered_in_term = Registration.objects.filter(
+            student_id=OuterRef('student_id'),
+            unit_id=OuterRef('unit_id'),
+            academic_year=academic_year,
+            trimester=trimester,
+            status=Registration.Status.APPROVED,
+        )
+        rows = (
+            UnitProgressSnapshot.objects.filter(
+                Exists(registered_in_term),
+                is_registered=True,
+                **{self.scope_filters[scope]: scope_id},
+            )
+            .values('student_id')
+            .annotate(
+                username=F('student__user__username'),
+                display_name=F('student__user__display_name'),
+                units=Count('id'),
+                completed_units=Count('id', filter=Q(completed=True)),
+                submission_count=Sum('submission_count'),
+                graded_count=Sum('graded_count'),
+                average_grade=Avg('average_grade'),
+            )
+            .order_by('username', 'student_id')
+        )
+
+        if params.get('export') == 'csv':
+            return self._stream_csv(rows, scope, scope_id, academic_year, trimester)
+
+        paginator = StandardResultsSetPagination()
+        page = paginator.paginate_queryset(rows, request, view=self)
+        return paginator.get_paginated_response([self._row(row) for row in page])
+
+    @staticmethod
+    def _row(row):
+        return {**row, 'completed': row['units'] > 0 and row['completed_units'] == row['units']}
+
+    def _stream_csv(self, rows, scope, scope_id, academic_year, trimester):
+        writer = csv.writer(_Echo())
+
+        def generate():
+            yield writer.writerow(self.csv_columns)
+            for row in rows.iterator():
+                row = self._row(row)
+                yield writer.writerow([row[column] for column in self.csv_columns])
+
+        response = StreamingHttpResponse(generate(), content_type='text/csv')
+        filename = f"cohort_{scope}_{scope_id}_{academic_year}_T{trimester}.csv"
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
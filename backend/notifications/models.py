@@ -21,6 +21,11 @@ class Notification(TimeStampedModel):
     send_at = models.DateTimeField()
     status = models.CharField(max_length=20, choices=Status.choices, default=Status.QUEUED)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "created_at"]),
+        ]
+
     def __str__(self):
         return f"Notification for {self.user.username} via {self.channel} - {self.status}"
 
@@ -14,6 +14,8 @@ class NotificationViewSet(ScopedListMixin, viewsets.ModelViewSet):
     queryset = Notification.objects.select_related("user").order_by("-created_at")
     serializer_class = NotificationSerializer
     permission_classes = [permissions.IsAuthenticated, IsSelfOrElevated]
+    page_size = 20
+    max_page_size = 100
 
     def get_queryset(self):
         qs = super().get_queryset()
@@ -5,3 +5,5 @@ class RepositoryConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "repository"
 
+    def ready(self):
+        from . import signals  # noqa: F401
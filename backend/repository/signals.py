@@ -0,0 +1,25 @@
+from django.db.models.signals import m2m_changed, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import LibraryAsset, ResourceTag
+
+
+def _touch_assets(assets) -> None:
+    # Tag links have no timestamp of their own; moving the asset's keeps its ETag honest.
+    assets.update(updated_at=timezone.now())
+
+
+@receiver(m2m_changed, sender=LibraryAsset.tags.through)
+def library_asset_tags_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse and action in ("post_add", "post_remove", "post_clear"):
+        _touch_assets(LibraryAsset.objects.filter(pk=instance.pk))
+    elif reverse and action in ("post_add", "post_remove"):
+        _touch_assets(LibraryAsset.objects.filter(pk__in=pk_set))
+    elif reverse and action == "pre_clear":
+        _touch_assets(LibraryAsset.objects.filter(tags=instance))
+
+
+@receiver(pre_delete, sender=ResourceTag)
+def resource_tag_deleted(sender, instance: ResourceTag, **kwargs):
+    _touch_assets(LibraryAsset.objects.filter(tags=instance))
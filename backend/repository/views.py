@@ -1,12 +1,15 @@
 from rest_framework import viewsets
 from django_filters.rest_framework import DjangoFilterBackend
 
+from core.mixins import ConditionalGetMixin
+
 from .models import LibraryAsset
 from .serializers import LibraryAssetSerializer
 
 
-class LibraryAssetViewSet(viewsets.ModelViewSet):
+class LibraryAssetViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = LibraryAsset.objects.all()
     serializer_class = LibraryAssetSerializer
+    last_modified_related = ('tags__updated_at',)
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['programme', 'unit', 'type', 'tags']
\ No newline at end of file
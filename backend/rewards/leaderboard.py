@@ -0,0 +1,289 @@
+"""
+Sorted-set leaderboards for merit stars and term achievement points.
+
+Boards live in Redis sorted sets when ``LEADERBOARD_REDIS_URL`` is set and the
+``redis`` package is installed, otherwise in an in-process sorted list. Either
+way top-N, a student's rank and their neighbours cost O(log n) lookups rather
+than a sort of the whole table, and equal scores are ordered by student id,
+highest first. A board is filled from the database the first time it is read
+and then kept current by ``sync_stars``/``sync_term_points``, which write
+absolute scores so replays and retries are harmless. In-process boards only
+see their own worker's writes, so they are reloaded after
+``LEADERBOARD_MEMORY_TTL`` seconds.
+"""
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+
+from django.conf import settings
+from django.db.models import Sum
+
+from learning.achievement_models import StudentAchievement
+from users.models import Student
+
+try:  # optional dependency
+    import redis
+except ImportError:  # pragma: no cover - exercised only without redis installed
+    redis = None
+
+# v2: members are zero-padded so Redis orders ties the same way as MemoryStore.
+KEY_PREFIX = "leaderboard:v2"
+MEMBER_WIDTH = 12
+
+
+class Board:
+    """One ranking: merit stars or a term's approved achievement points, optionally per programme."""
+
+    def __init__(self, kind: str, term: str | None = None, programme_id: int | None = None):
+        self.kind = kind
+        self.term = term
+        self.programme_id = programme_id
+
+    @property
+    def key(self) -> str:
+        parts = [KEY_PREFIX, self.kind]
+        if self.term:
+            parts.append(self.term)
+        if self.programme_id is not None:
+            parts.extend(["programme", str(self.programme_id)])
+        return ":".join(parts)
+
+    def load(self) -> dict:
+        """Scores for every student on the board, read from the database."""
+        if self.kind == "stars":
+            students = Student.objects.filter(stars__gt=0)
+            if self.programme_id is not None:
+                students = students.filter(programme_id=self.programme_id)
+            return dict(students.values_list("pk", "stars"))
+
+        claims = StudentAchievement.objects.filter(term=self.term, approved_by__isnull=False)
+        if self.programme_id is not None:
+            claims = claims.filter(student__student_profile__programme_id=self.programme_id)
+        return dict(
+            claims.values("student_id").annotate(points=Sum("points_earned")).order_by().values_list("student_id", "points")
+        )
+
+
+def stars_board(programme_id: int | None = None) -> Board:
+    return Board("stars", programme_id=programme_id)
+
+
+def term_board(term: str, programme_id: int | None = None) -> Board:
+    return Board("term", term=term, programme_id=programme_id)
+
+
+class MemoryStore:
+    """
+    In-process sorted sets: a list ordered by (-score, -member) plus a score
+    lookup per board. Boards count as unloaded ``ttl`` seconds after they
+    were filled, so each worker periodically picks up other workers' writes.
+    """
+
+    def __init__(self, ttl: float | None = None):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._order = {}
+        self._scores = {}
+        self._loaded_at = {}
+
+    def is_loaded(self, key):
+        loaded_at = self._loaded_at.get(key)
+        if loaded_at is None:
+            return False
+        return self.ttl is None or time.monotonic() - loaded_at < self.ttl
+
+    def replace(self, key, scores):
+        with self._lock:
+            self._scores[key] = dict(scores)
+            self._order[key] = sorted((-score, -member) for member, score in scores.items())
+            self._loaded_at[key] = time.monotonic()
+
+    def set_scores(self, key, scores):
+        with self._lock:
+            current, order = self._scores[key], self._order[key]
+            for member, score in scores.items():
+                if member in current:
+                    del order[bisect.bisect_left(order, (-current[member], -member))]
+                bisect.insort(order, (-score, -member))
+                current[member] = score
+
+    def rank(self, key, member):
+        score = self._scores[key].get(member)
+        if score is None:
+            return None
+        return bisect.bisect_left(self._order[key], (-score, -member))
+
+    def count_above(self, key, score):
+        return bisect.bisect_left(self._order[key], (-score, float("-inf")))
+
+    def score(self, key, member):
+        return self._scores[key].get(member)
+
+    def page(self, key, start, stop):
+        return [(-negative_member, -negative) for negative, negative_member in self._order[key][start:stop]]
+
+    def size(self, key):
+        return len(self._scores[key])
+
+    def clear(self):
+        with self._lock:
+            self._order.clear()
+            self._scores.clear()
+            self._loaded_at.clear()
+
+
+class RedisStore:
+    """Redis sorted sets (ZADD/ZREVRANK/ZREVRANGE); a companion key marks boards already loaded."""
+
+    def __init__(self, client):
+        self.client = client
+
+    def is_loaded(self, key):
+        return bool(self.client.exists(f"{key}:loaded"))
+
+    @staticmethod
+    def _member(member):
+        # ZREVRANGE orders ties by member descending, byte-wise; padding makes that numeric.
+        return str(member).zfill(MEMBER_WIDTH)
+
+    def replace(self, key, scores):
+        pipe = self.client.pipeline()
+        pipe.delete(key)
+        if scores:
+            pipe.zadd(key, {self._member(member): score for member, score in scores.items()})
+        pipe.set(f"{key}:loaded", 1)
+        pipe.execute()
+
+    def set_scores(self, key, scores):
+        self.client.zadd(key, {self._member(member): score for member, score in scores.items()})
+
+    def rank(self, key, member):
+        return self.client.zrevrank(key, self._member(member))
+
+    def count_above(self, key, score):
+        return self.client.zcount(key, f"({score}", "+inf")
+
+    def score(self, key, member):
+        score = self.client.zscore(key, self._member(member))
+        return None if score is None else int(score)
+
+    def page(self, key, start, stop):
+        if stop <= start:
+            return []
+        return [(int(member), int(score)) for member, score in self.client.zrevrange(key, start, stop - 1, withscores=True)]
+
+    def size(self, key):
+        return self.client.zcard(key)
+
+    def clear(self):
+        for key in self.client.scan_iter(f"{KEY_PREFIX}:*"):
+            self.client.delete(key)
+
+
+_store = None
+
+
+def get_store():
+    global _store
+    if _store is None:
+        url = getattr(settings, "LEADERBOARD_REDIS_URL", "")
+        if url and redis is not None:
+            _store = RedisStore(redis.Redis.from_url(url))
+        else:
+            _store = MemoryStore(ttl=getattr(settings, "LEADERBOARD_MEMORY_TTL", 60))
+    return _store
+
+
+def _ensure_loaded(board: Board):
+    store = get_store()
+    if not store.is_loaded(board.key):
+        store.replace(board.key, board.load())
+    return store
+
+
+def _entries(rows, first_rank):
+    return [
+        {"student_id": member, "score": score, "rank": first_rank + offset}
+        for offset, (member, score) in enumerate(rows)
+    ]
+
+
+def top(board: Board, limit: int = 10) -> list:
+    """The first ``limit`` entries as ``{"student_id", "score", "rank"}`` dicts (rank is 1-based)."""
+    store = _ensure_loaded(board)
+    return _entries(store.page(board.key, 0, limit), 1)
+
+
+def standing(board: Board, student_id: int, radius: int = 2) -> dict:
+    """
+    A student's rank and score plus up to ``radius`` entries either side.
+    Students without a score (boards only hold positive scores) rank after
+    everyone who has one, with a score of 0 and the last ranked entries as
+    neighbours.
+    """
+    store = _ensure_loaded(board)
+    rank = store.rank(board.key, student_id)
+    if rank is None:
+        rank = store.count_above(board.key, 0)
+        start = max(rank - radius, 0)
+        return {
+            "student_id": student_id,
+            "rank": rank + 1,
+            "score": 0,
+            "total": store.size(board.key),
+            "neighbours": _entries(store.page(board.key, start, rank), start + 1),
+        }
+    start = max(rank - radius, 0)
+    return {
+        "student_id": student_id,
+        "rank": rank + 1,
+        "score": store.score(board.key, student_id),
+        "total": store.size(board.key),
+        "neighbours": _entries(store.page(board.key, start, rank + radius + 1), start + 1),
+    }
+
+
+def _apply(boards_scores):
+    store = get_store()
+    for board, scores in boards_scores:
+        # Unloaded boards pick the change up from the database on first read.
+        if scores and store.is_loaded(board.key):
+            store.set_scores(board.key, scores)
+
+
+def sync_stars(student_ids) -> None:
+    """Writes the students' current ``Student.stars`` to the global and programme star boards."""
+    rows = Student.objects.filter(pk__in=student_ids).values_list("pk", "programme_id", "stars")
+    updates = [(stars_board(), {})]
+    for student_id, programme_id, stars in rows:
+        updates[0][1][student_id] = stars
+        if programme_id is not None:
+            updates.append((stars_board(programme_id), {student_id: stars}))
+    _apply(updates)
+
+
+def sync_term_points(student_ids, term: str) -> None:
+    """Writes the students' approved achievement points for ``term`` to the term boards."""
+    student_ids = set(student_ids)
+    points = dict(
+        StudentAchievement.objects.filter(student_id__in=student_ids, term=term, approved_by__isnull=False)
+        .values("student_id")
+        .annotate(points=Sum("points_earned"))
+        .order_by()
+        .values_list("student_id", "points")
+    )
+    programmes = dict(Student.objects.filter(pk__in=student_ids).values_list("pk", "programme_id"))
+    updates = [(term_board(term), {})]
+    for student_id in student_ids:
+        score = points.get(student_id, 0)
+        updates[0][1][student_id] = score
+        if programmes.get(student_id) is not None:
+            updates.append((term_board(term, programmes[student_id]), {student_id: score}))
+    _apply(updates)
+
+
+def reset_leaderboards() -> None:
+    """Drops every board so each is reloaded from the database on its next read."""
+    get_store().clear()
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from rewards import leaderboard
+
+
+class Command(BaseCommand):
+    help = "Drop cached leaderboards so they are reloaded from the database, optionally warming some."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--term", action="append", default=[], help="Also warm this term's points board (repeatable).")
+
+    def handle(self, *args, **options):
+        leaderboard.reset_leaderboards()
+        boards = [leaderboard.stars_board()] + [leaderboard.term_board(term) for term in options["term"]]
+        for board in boards:
+            leaderboard.top(board, 1)
+        self.stdout.write(self.style.SUCCESS(f"Reset leaderboards and warmed {len(boards)} board(s)."))
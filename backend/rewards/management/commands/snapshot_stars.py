@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from rewards.services import snapshot_stars
+
+
+class Command(BaseCommand):
+    help = "Write daily star balance snapshots up to a day (default yesterday); backfills any missing days."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--through", help="Last day to snapshot (YYYY-MM-DD).")
+
+    def handle(self, *args, **options):
+        through = None
+        if options["through"]:
+            through = parse_date(options["through"])
+            if through is None:
+                raise CommandError("--through must be a date (YYYY-MM-DD).")
+        written = snapshot_stars(through)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} star snapshot(s)."))
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:33
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rewards', '0001_initial'),
+        ('users', '0002_student_stars'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StarSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('earned', models.IntegerField(help_text='Stars awarded on this day')),
+                ('balance', models.IntegerField(help_text='Stars awarded up to and including this day')),
+            ],
+            options={
+                'ordering': ['student', 'day'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='merit',
+            index=models.Index(fields=['student', 'created_at'], name='rewards_mer_student_974de0_idx'),
+        ),
+        migrations.AddField(
+            model_name='starsnapshot',
+            name='student',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='star_snapshots', to='users.student'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='starsnapshot',
+            unique_together={('student', 'day')},
+        ),
+    ]
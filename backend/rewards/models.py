@@ -2,11 +2,62 @@ from django.db import models
 from core.models import TimeStampedModel
 from users.models import Student, User
 
+class MeritBatch(TimeStampedModel):
+    """
+    One class-wide award: the merits it created point back here, and a retry
+    by the same awarder carrying the same ``idempotency_key`` returns this
+    batch instead of awarding the stars again.
+    """
+    awarded_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='merit_batches')
+    stars = models.IntegerField()
+    reason = models.TextField()
+    student_count = models.IntegerField(default=0)
+    idempotency_key = models.CharField(max_length=64, null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['awarded_by', 'idempotency_key'],
+                condition=models.Q(idempotency_key__isnull=False),
+                name='rewards_meritbatch_awarded_by_idempotency_key',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.stars} stars for {self.student_count} students"
+
 class Merit(TimeStampedModel):
     student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='merits')
     awarded_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='awarded_merits')
     stars = models.IntegerField()
     reason = models.TextField()
+    batch = models.ForeignKey(MeritBatch, on_delete=models.SET_NULL, null=True, blank=True, related_name='merits')
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['student', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.stars} stars for {self.student.user.username}"
+
+class StarSnapshot(models.Model):
+    """
+    A student's star balance at the end of a day on which they received merits.
+
+    Rows are written nightly by ``snapshot_stars`` only for days with merits,
+    so the balance on any date is the latest snapshot on or before it, and
+    weekly/monthly totals sum ``earned`` over a handful of rows instead of
+    scanning the merit history.
+    """
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='star_snapshots')
+    day = models.DateField()
+    earned = models.IntegerField(help_text="Stars awarded on this day")
+    balance = models.IntegerField(help_text="Stars awarded up to and including this day")
+
+    class Meta:
+        unique_together = ('student', 'day')
+        ordering = ['student', 'day']
 
     def __str__(self):
-        return f"{self.stars} stars for {self.student.user.username}"
\ No newline at end of file
+        return f"{self.student_id} on {self.day}: {self.balance}"
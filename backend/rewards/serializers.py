@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import Merit
+from .models import Merit, MeritBatch
 from users.serializers import UserSerializer
 from users.models import Student
 
@@ -19,3 +19,33 @@ class AwardMeritSerializer(serializers.Serializer):
         # The 'awarded_by' will be added in the view from request.user
         merit = Merit.objects.create(**validated_data)
         return merit
+
+class BatchAwardMeritSerializer(serializers.Serializer):
+    MAX_STUDENTS = 1000
+
+    stars = serializers.IntegerField(min_value=1)
+    reason = serializers.CharField(max_length=500)
+    students = serializers.ListField(child=serializers.IntegerField(), required=False, max_length=MAX_STUDENTS)
+    unit = serializers.IntegerField(required=False)
+    academic_year = serializers.IntegerField(required=False)
+    trimester = serializers.IntegerField(required=False)
+    session = serializers.IntegerField(required=False)
+    idempotency_key = serializers.CharField(max_length=64, required=False)
+
+    def validate(self, attrs):
+        sources = [name for name in ('students', 'unit', 'session') if attrs.get(name)]
+        if len(sources) != 1:
+            raise serializers.ValidationError("Provide exactly one of students, unit or session.")
+        if attrs.get('unit') and (attrs.get('academic_year') is None or attrs.get('trimester') is None):
+            raise serializers.ValidationError("unit requires academic_year and trimester.")
+        return attrs
+
+class MeritBatchSerializer(serializers.ModelSerializer):
+    students = serializers.SerializerMethodField()
+
+    class Meta:
+        model = MeritBatch
+        fields = ['id', 'stars', 'reason', 'student_count', 'students', 'awarded_by', 'created_at']
+
+    def get_students(self, obj):
+        return list(obj.merits.order_by('student_id').values_list('student_id', flat=True))
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date, timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Max, OuterRef, Subquery, Sum
+from django.db.models.functions import TruncDate, TruncMonth, TruncWeek
+from django.utils import timezone
+
+from core.services import notify_users
+from users.models import Student, User
+
+from . import leaderboard
+from .models import Merit, MeritBatch, StarSnapshot
+
+PERIODS = {"week": TruncWeek, "month": TruncMonth}
+
+
+class IdempotencyKeyReused(ValueError):
+    """Raised when an idempotency key is replayed with a different award than the one it recorded."""
+
+
+def _replayed_batch(awarded_by, idempotency_key, stars, reason):
+    """The awarder's batch recorded under ``idempotency_key``, checked against the retried award."""
+    existing = MeritBatch.objects.filter(awarded_by=awarded_by, idempotency_key=idempotency_key).first()
+    if existing is not None and (existing.stars, existing.reason) != (stars, reason):
+        raise IdempotencyKeyReused("Idempotency-Key was already used for a different award.")
+    return existing
+
+
+def award_merits(student_ids, stars: int, reason: str, awarded_by, idempotency_key: str = None):
+    """
+    Awards ``stars`` to every student in ``student_ids`` as one MeritBatch.
+
+    All merits go in with one bulk insert and every balance moves with one
+    ``UPDATE ... SET stars = stars + n``, so a class of any size costs the
+    same handful of queries. After commit the leaderboard is synced and each
+    student gets a single notification for the batch. Unknown ids are
+    skipped. Returns ``(batch, created)``; when ``idempotency_key`` matches
+    an earlier batch by the same awarder, that batch is returned with
+    ``created=False``, or IdempotencyKeyReused is raised if it differs.
+    """
+    if idempotency_key:
+        existing = _replayed_batch(awarded_by, idempotency_key, stars, reason)
+        if existing is not None:
+            return existing, False
+
+    student_ids = list(
+        Student.objects.filter(pk__in=set(student_ids)).order_by("pk").values_list("pk", flat=True)
+    )
+    try:
+        with transaction.atomic():
+            batch = MeritBatch.objects.create(
+                awarded_by=awarded_by,
+                stars=stars,
+                reason=reason,
+                student_count=len(student_ids),
+                idempotency_key=idempotency_key or None,
+            )
+            Merit.objects.bulk_create(
+                [
+                    Merit(student_id=student_id, awarded_by=awarded_by, stars=stars, reason=reason, batch=batch)
+                    for student_id in student_ids
+                ],
+                batch_size=1000,
+            )
+            Student.objects.filter(pk__in=student_ids).update(stars=F("stars") + stars)
+    except IntegrityError:
+        if idempotency_key:
+            existing = _replayed_batch(awarded_by, idempotency_key, stars, reason)
+            if existing is not None:
+                return existing, False
+        raise
+
+    def after_commit():
+        leaderboard.sync_stars(student_ids)
+        notify_users(
+            User.objects.filter(pk__in=student_ids).only("id"),
+            "You earned stars!",
+            f"You were awarded {stars} star{'s' if stars != 1 else ''}: {reason}",
+            kind="merit",
+            data={"batch": batch.pk, "stars": stars},
+        )
+
+    transaction.on_commit(after_commit)
+    return batch, True
+
+
+def snapshotted_through() -> date | None:
+    """Last day covered by ``snapshot_stars`` (every merit on or before it is in a snapshot)."""
+    return StarSnapshot.objects.aggregate(last=Max("day"))["last"]
+
+
+def snapshot_stars(through: date | None = None) -> int:
+    """
+    Writes StarSnapshot rows for every day after the last snapshotted day up
+    to ``through`` (default yesterday). Merits are grouped per student and day
+    in one query and balances carried forward from each student's previous
+    snapshot, so a nightly run or a full backfill costs the same few queries.
+    Returns the number of snapshots written.
+    """
+    through = through or timezone.localdate() - timedelta(days=1)
+    last = snapshotted_through()
+    merits = Merit.objects.annotate(day=TruncDate("created_at")).filter(day__lte=through)
+    if last is not None:
+        merits = merits.filter(day__gt=last)
+    daily = list(
+        merits.values("student_id", "day").annotate(earned=Sum("stars")).order_by("student_id", "day")
+    )
+    if not daily:
+        return 0
+
+    balances = _latest_balances({row["student_id"] for row in daily}, through)
+    snapshots = []
+    for row in daily:
+        balance = balances.get(row["student_id"], 0) + row["earned"]
+        balances[row["student_id"]] = balance
+        snapshots.append(StarSnapshot(student_id=row["student_id"], day=row["day"], earned=row["earned"], balance=balance))
+
+    with transaction.atomic():
+        StarSnapshot.objects.bulk_create(snapshots, batch_size=1000, ignore_conflicts=True)
+    return len(snapshots)
+
+
+def _latest_balances(student_ids, on_or_before: date) -> dict:
+    """``{student_id: balance}`` from each student's latest snapshot on or before the day."""
+    latest_day = (
+        StarSnapshot.objects.filter(student_id=OuterRef("student_id"), day__lte=on_or_before)
+        .order_by("-day")
+        .values("day")[:1]
+    )
+    return dict(
+        StarSnapshot.objects.filter(student_id__in=student_ids, day=Subquery(latest_day)).values_list("student_id", "balance")
+    )
+
+
+def stars_as_of(student_ids, day: date) -> dict:
+    """
+    ``{student_id: stars}`` awarded up to and including ``day``: the latest
+    snapshot balance plus merits newer than the snapshotted range. Two
+    queries however many students are asked for.
+    """
+    student_ids = set(student_ids)
+    last = snapshotted_through()
+    covered = min(day, last) if last is not None else None
+    totals = _latest_balances(student_ids, covered) if covered is not None else {}
+    totals = {student_id: totals.get(student_id, 0) for student_id in student_ids}
+
+    tail = Merit.objects.annotate(day=TruncDate("created_at")).filter(student_id__in=student_ids, day__lte=day)
+    if last is not None:
+        tail = tail.filter(day__gt=last)
+    for student_id, stars in tail.values("student_id").annotate(stars=Sum("stars")).order_by().values_list("student_id", "stars"):
+        totals[student_id] += stars
+    return totals
+
+
+def star_totals(student_id, period: str, start: date, end: date) -> list:
+    """
+    Stars awarded per week or month between ``start`` and ``end`` (inclusive),
+    summed from snapshots plus any merits not yet snapshotted.
+    """
+    trunc = PERIODS[period]
+    totals = defaultdict(int)
+    for bucket, earned in (
+        StarSnapshot.objects.filter(student_id=student_id, day__gte=start, day__lte=end)
+        .annotate(bucket=trunc("day"))
+        .values("bucket")
+        .annotate(earned=Sum("earned"))
+        .order_by()
+        .values_list("bucket", "earned")
+    ):
+        totals[bucket] += earned
+
+    last = snapshotted_through()
+    tail = Merit.objects.annotate(day=TruncDate("created_at")).filter(student_id=student_id, day__gte=start, day__lte=end)
+    if last is not None:
+        tail = tail.filter(day__gt=last)
+    for bucket, earned in (
+        tail.annotate(bucket=trunc("day")).values("bucket").annotate(earned=Sum("stars")).order_by().values_list("bucket", "earned")
+    ):
+        totals[bucket] += earned
+
+    return [{"period_start": bucket, "stars": totals[bucket]} for bucket in sorted(totals)]
@@ -0,0 +1,16 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from learning.achievement_models import StudentAchievement
+
+from . import leaderboard
+
+
+@receiver(post_save, sender=StudentAchievement)
+@receiver(post_delete, sender=StudentAchievement)
+def student_achievement_changed(sender, instance: StudentAchievement, created=False, **kwargs):
+    # Pending claims carry no points, so only approvals, edits and removals move the term boards.
+    if created and instance.approved_by_id is None:
+        return
+    transaction.on_commit(lambda: leaderboard.sync_term_points([instance.student_id], instance.term))
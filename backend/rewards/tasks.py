@@ -0,0 +1,8 @@
+from celery import shared_task
+
+from .services import snapshot_stars
+
+
+@shared_task
+def snapshot_star_balances():
+    return snapshot_stars()
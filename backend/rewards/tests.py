@@ -1,3 +1,348 @@
+from datetime import date, datetime, timezone as dt_timezone
+from unittest import mock
+
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from learning.achievement_models import Achievement, AchievementCategory, StudentAchievement, TermProgress
+from learning.models import CurriculumUnit, Department, Programme, Registration
+from learning.services.points import approve_achievement_claims
+from notifications.models import Notification
+from users.models import Guardian, ParentStudentLink, User, Student
+
+from . import leaderboard
+from .models import Merit, MeritBatch, StarSnapshot
+from .services import snapshot_stars, star_totals, stars_as_of
+
+
+class MemoryStoreTests(TestCase):
+
+    def test_rank_and_pages_follow_score_updates(self):
+        store = leaderboard.MemoryStore()
+        store.replace('board', {1: 10, 2: 30, 3: 20})
+        self.assertEqual(store.page('board', 0, 3), [(2, 30), (3, 20), (1, 10)])
+        store.set_scores('board', {1: 40, 4: 5})
+        self.assertEqual(store.rank('board', 1), 0)
+        self.assertEqual(store.rank('board', 4), 3)
+        self.assertIsNone(store.rank('board', 99))
+        self.assertEqual(store.page('board', 1, 3), [(2, 30), (3, 20)])
+
+    def test_ties_rank_higher_student_ids_first(self):
+        # Matches ZREVRANGE over the zero-padded members RedisStore writes.
+        store = leaderboard.MemoryStore()
+        store.replace('board', {3: 10, 12: 10, 7: 20})
+        self.assertEqual(store.page('board', 0, 3), [(7, 20), (12, 10), (3, 10)])
+        self.assertEqual(store.count_above('board', 10), 1)
+
+    def test_loaded_boards_expire(self):
+        store = leaderboard.MemoryStore(ttl=60)
+        store.replace('board', {1: 10})
+        self.assertTrue(store.is_loaded('board'))
+        with mock.patch.object(leaderboard.time, 'monotonic', return_value=leaderboard.time.monotonic() + 61):
+            self.assertFalse(store.is_loaded('board'))
+
+
+class LeaderboardTests(TestCase):
+
+    def setUp(self):
+        leaderboard.reset_leaderboards()
+        department = Department.objects.create(name='Test Department', code='TD')
+        self.programme = Programme.objects.create(
+            department=department,
+            name='Test Programme',
+            code='TP',
+            award_level='Diploma',
+            duration_years=2,
+            trimesters_per_year=3
+        )
+        self.students = []
+        for index, stars in enumerate([5, 40, 20, 10]):
+            user = User.objects.create_user(username=f'student{index}', role=User.Roles.STUDENT, display_name=f'Student {index}')
+            self.students.append(Student.objects.create(
+                user=user,
+                programme=self.programme,
+                year=1,
+                trimester=1,
+                trimester_label='T1',
+                cohort_year=2025,
+                stars=stars,
+            ))
+        self.lecturer = User.objects.create_user(username='lecturer', role=User.Roles.LECTURER)
+        self.client = APIClient()
+
+    def test_leaderboard_lists_top_students_by_stars(self):
+        self.client.force_authenticate(self.students[0].user)
+        response = self.client.get('/api/rewards/leaderboard/', {'limit': 3})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['stars'] for row in response.data], [40, 20, 10])
+        self.assertEqual([row['rank'] for row in response.data], [1, 2, 3])
+
+    def test_merit_award_moves_student_up(self):
+        self.client.force_authenticate(self.lecturer)
+        self.client.get('/api/rewards/leaderboard/')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                '/api/rewards/award/', {'student': self.students[0].pk, 'stars': 50, 'reason': 'Helped a classmate'}
+            )
+        self.assertEqual(response.status_code, 201)
+
+        self.client.force_authenticate(self.students[0].user)
+        response = self.client.get('/api/rewards/leaderboard/standing/', {'radius': 1})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['rank'], response.data['score']), (1, 55))
+        self.assertEqual(
+            [(entry['rank'], entry['display_name']) for entry in response.data['neighbours']],
+            [(1, 'Student 0'), (2, 'Student 1')],
+        )
+
+    def test_achievement_approval_updates_term_board(self):
+        category = AchievementCategory.objects.create(name='Attendance', icon='calendar')
+        achievement = Achievement.objects.create(category=category, name='Badge', description='', icon='star', voice_message='Well done')
+        claims = [
+            StudentAchievement.objects.create(student=student.user, achievement=achievement, points_earned=points, term='2025-1')
+            for student, points in zip(self.students[:2], [5, 8])
+        ]
+        board = leaderboard.term_board('2025-1')
+        self.assertEqual(leaderboard.top(board), [])
+
+        for claim in claims:
+            claim.approved_by = self.lecturer
+            claim.approved_at = timezone.now()
+            with self.captureOnCommitCallbacks(execute=True):
+                claim.save()
+        self.assertEqual([entry['score'] for entry in leaderboard.top(board)], [8, 5])
+        self.assertEqual(leaderboard.standing(board, self.students[0].pk)['rank'], 2)
+
+    def test_deleting_an_approved_claim_lowers_both_term_boards(self):
+        category = AchievementCategory.objects.create(name='Attendance', icon='calendar')
+        achievement = Achievement.objects.create(category=category, name='Badge', description='', icon='star', voice_message='Well done')
+        claims = [
+            StudentAchievement.objects.create(student=student.user, achievement=achievement, points_earned=points, term='2025-1')
+            for student, points in zip(self.students[:2], [5, 8])
+        ]
+        with self.captureOnCommitCallbacks(execute=True):
+            approve_achievement_claims(StudentAchievement.objects.all(), self.lecturer)
+        boards = [leaderboard.term_board('2025-1'), leaderboard.term_board('2025-1', self.programme.pk)]
+        for board in boards:
+            self.assertEqual([entry['score'] for entry in leaderboard.top(board)], [8, 5])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            claims[1].delete()
+
+        for board in boards:
+            self.assertEqual(
+                [(entry['student_id'], entry['score']) for entry in leaderboard.top(board)],
+                [(self.students[0].pk, 5), (self.students[1].pk, 0)],
+            )
+        self.assertEqual(TermProgress.objects.get(student=self.students[1].user, term='2025-1').total_points_earned, 0)
+
+    def test_student_without_stars_gets_a_zero_standing(self):
+        user = User.objects.create_user(username='newcomer', role=User.Roles.STUDENT)
+        Student.objects.create(
+            user=user, programme=self.programme, year=1, trimester=1, trimester_label='T1', cohort_year=2025,
+        )
+        self.client.force_authenticate(user)
+        response = self.client.get('/api/rewards/leaderboard/standing/', {'radius': 1})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['rank'], response.data['score'], response.data['total']), (5, 0, 4))
+        self.assertEqual([entry['rank'] for entry in response.data['neighbours']], [4])
+
+    def test_students_cannot_view_other_students_standing(self):
+        self.client.force_authenticate(self.students[0].user)
+        response = self.client.get('/api/rewards/leaderboard/standing/', {'student': self.students[1].pk})
+        self.assertEqual(response.status_code, 403)
+
+
+class MeritHistoryTests(TestCase):
+
+    def setUp(self):
+        department = Department.objects.create(name='Test Department', code='TD')
+        programme = Programme.objects.create(
+            department=department,
+            name='Test Programme',
+            code='TP',
+            award_level='Diploma',
+            duration_years=2,
+            trimesters_per_year=3
+        )
+        self.students = []
+        for index in range(2):
+            user = User.objects.create_user(username=f'student{index}', role=User.Roles.STUDENT, display_name=f'Student {index}')
+            self.students.append(Student.objects.create(
+                user=user,
+                programme=programme,
+                year=1,
+                trimester=1,
+                trimester_label='T1',
+                cohort_year=2025
+            ))
+        self.parent = User.objects.create_user(username='parent', role=User.Roles.PARENT)
+        guardian = Guardian.objects.create(user=self.parent)
+        for student in self.students:
+            ParentStudentLink.objects.create(parent=guardian, student=student)
+        self.client = APIClient()
+
+    def _merit(self, student, stars, day):
+        merit = Merit.objects.create(student=student, stars=stars, reason='Good work')
+        Merit.objects.filter(pk=merit.pk).update(created_at=datetime(day.year, day.month, day.day, 10, tzinfo=dt_timezone.utc))
+        student.stars += stars
+        student.save(update_fields=['stars'])
+        return merit
+
+    def test_snapshots_carry_balances_and_answer_as_of(self):
+        first, second = self.students
+        self._merit(first, 3, date(2025, 3, 3))
+        self._merit(first, 2, date(2025, 3, 3))
+        self._merit(second, 4, date(2025, 3, 4))
+        self.assertEqual(snapshot_stars(date(2025, 3, 4)), 2)
+        self._merit(first, 5, date(2025, 3, 10))
+        self.assertEqual(snapshot_stars(date(2025, 3, 10)), 1)
+        self.assertEqual(snapshot_stars(date(2025, 3, 10)), 0)
+        self.assertEqual(StarSnapshot.objects.get(student=first, day=date(2025, 3, 10)).balance, 10)
+
+        # Merits after the snapshotted range are added on top.
+        self._merit(first, 1, date(2025, 3, 12))
+        with self.assertNumQueries(3):
+            totals = stars_as_of([first.pk, second.pk], date(2025, 3, 12))
+        self.assertEqual(totals, {first.pk: 11, second.pk: 4})
+        self.assertEqual(stars_as_of([first.pk], date(2025, 3, 5)), {first.pk: 5})
+        self.assertEqual(stars_as_of([first.pk], date(2025, 3, 1)), {first.pk: 0})
+
+        self.assertEqual(
+            star_totals(first.pk, 'week', date(2025, 3, 1), date(2025, 3, 31)),
+            [{'period_start': date(2025, 3, 3), 'stars': 5}, {'period_start': date(2025, 3, 10), 'stars': 6}],
+        )
+
+    def test_history_is_cursor_paginated(self):
+        student = self.students[0]
+        merits = [self._merit(student, 1, date(2025, 3, day)) for day in range(1, 6)]
+        self.client.force_authenticate(student.user)
+
+        response = self.client.get(f'/api/rewards/student/{student.pk}/', {'page_size': 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['stars'], 5)
+        self.assertEqual([row['id'] for row in response.data['history']], [merits[4].pk, merits[3].pk])
+        response = self.client.get(response.data['next'])
+        self.assertEqual([row['id'] for row in response.data['history']], [merits[2].pk, merits[1].pk])
+
+        snapshot_stars(date(2025, 3, 5))
+        response = self.client.get(f'/api/rewards/student/{student.pk}/', {'as_of': '2025-03-02'})
+        self.assertEqual(response.data['stars'], 2)
+
+    def test_star_totals_endpoint(self):
+        student = self.students[0]
+        self._merit(student, 2, date(2025, 1, 15))
+        self._merit(student, 3, date(2025, 2, 1))
+        snapshot_stars(date(2025, 1, 31))
+        self.client.force_authenticate(self.parent)
+        response = self.client.get(
+            f'/api/rewards/student/{student.pk}/totals/', {'period': 'month', 'start': '2025-01-01', 'end': '2025-02-28'}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['stars'] for row in response.data['totals']], [2, 3])
+        self.client.force_authenticate(self.students[1].user)
+        response = self.client.get(f'/api/rewards/student/{student.pk}/totals/')
+        self.assertEqual(response.status_code, 403)
+
+    def test_parent_sees_all_children_in_one_request(self):
+        for student in self.students:
+            for day in range(1, 5):
+                self._merit(student, day, date(2025, 3, day))
+        self.client.force_authenticate(self.parent)
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/rewards/children/', {'recent': 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['display_name'] for row in response.data], ['Student 0', 'Student 1'])
+        self.assertEqual([row['stars'] for row in response.data], [10, 10])
+        self.assertEqual([merit['stars'] for merit in response.data[0]['recent_merits']], [4, 3])
+
+        self.client.force_authenticate(self.students[0].user)
+        self.assertEqual(self.client.get('/api/rewards/children/').status_code, 403)
+
+
+class BatchAwardTests(TestCase):
+
+    def setUp(self):
+        leaderboard.reset_leaderboards()
+        department = Department.objects.create(name='Test Department', code='TD')
+        self.programme = Programme.objects.create(
+            department=department,
+            name='Test Programme',
+            code='TP',
+            award_level='Diploma',
+            duration_years=2,
+            trimesters_per_year=3
+        )
+        self.students = []
+        for index in range(4):
+            user = User.objects.create_user(username=f'student{index}', role=User.Roles.STUDENT)
+            self.students.append(Student.objects.create(
+                user=user,
+                programme=self.programme,
+                year=1,
+                trimester=1,
+                trimester_label='T1',
+                cohort_year=2025,
+                stars=index,
+            ))
+        self.lecturer = User.objects.create_user(username='lecturer', role=User.Roles.LECTURER)
+        self.client = APIClient()
+        self.client.force_authenticate(self.lecturer)
+
+    def _award(self, data, **headers):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post('/api/rewards/award/batch/', data, format='json', **headers)
+
+    def test_class_award_is_one_batch(self):
+        ids = [student.pk for student in self.students[:3]]
+        response = self._award({'students': ids + [999], 'stars': 2, 'reason': 'Great session'})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual((response.data['student_count'], response.data['students']), (3, ids))
+        self.assertEqual(
+            list(Student.objects.order_by('pk').values_list('stars', flat=True)), [2, 3, 4, 3]
+        )
+        self.assertEqual(Merit.objects.filter(batch_id=response.data['id']).count(), 3)
+        self.assertEqual(Notification.objects.filter(type='merit').count(), 3)
+        self.assertEqual(leaderboard.standing(leaderboard.stars_board(), ids[2])['score'], 4)
+
+    def test_award_by_unit_registration(self):
+        unit = CurriculumUnit.objects.create(programme=self.programme, code='U1', title='Unit 1', credit_hours=3)
+        for student, state in zip(self.students, ['approved', 'submitted', 'rejected']):
+            Registration.objects.create(student=student, unit=unit, academic_year=2025, trimester=1, status=state)
+        response = self._award({'unit': unit.pk, 'academic_year': 2025, 'trimester': 1, 'stars': 1, 'reason': 'Lab'})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['students'], [self.students[0].pk, self.students[1].pk])
+
+    def test_retry_with_idempotency_key_awards_once(self):
+        data = {'students': [self.students[0].pk], 'stars': 5, 'reason': 'Quiz winner'}
+        first = self._award(data, HTTP_IDEMPOTENCY_KEY='class-quiz-1')
+        second = self._award(data, HTTP_IDEMPOTENCY_KEY='class-quiz-1')
+        self.assertEqual((first.status_code, second.status_code), (201, 200))
+        self.assertEqual(second['Idempotent-Replayed'], 'true')
+        self.assertEqual(first.data['id'], second.data['id'])
+        self.assertEqual(MeritBatch.objects.count(), 1)
+        self.assertEqual(Student.objects.get(pk=self.students[0].pk).stars, 5)
+
+        changed = self._award({**data, 'stars': 3}, HTTP_IDEMPOTENCY_KEY='class-quiz-1')
+        self.assertEqual(changed.status_code, 422)
+        self.assertEqual(Student.objects.get(pk=self.students[0].pk).stars, 5)
+
+    def test_idempotency_keys_are_scoped_to_the_awarder(self):
+        data = {'students': [self.students[0].pk], 'stars': 1, 'reason': 'Helpful', 'idempotency_key': 'help-1'}
+        self.assertEqual(self._award(data).status_code, 201)
+        self.client.force_authenticate(User.objects.create_user(username='other', role=User.Roles.LECTURER))
+        self.assertEqual(self._award(data).status_code, 201)
+        self.assertEqual(MeritBatch.objects.count(), 2)
+        self.assertEqual(Student.objects.get(pk=self.students[0].pk).stars, 2)
+
+        response = self._award({**data, 'idempotency_key': ['not', 'a', 'key']})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('idempotency_key', response.data)
 
-# Create your tests here.
+    def test_requires_exactly_one_source(self):
+        response = self._award({'stars': 1, 'reason': 'x'})
+        self.assertEqual(response.status_code, 400)
+        self.client.force_authenticate(self.students[0].user)
+        response = self._award({'students': [self.students[0].pk], 'stars': 1, 'reason': 'x'})
+        self.assertEqual(response.status_code, 403)
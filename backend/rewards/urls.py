@@ -1,10 +1,22 @@
 from django.urls import path
-from .views import AwardMeritView, StudentRewardsView, LeaderboardView
+from .views import (
+    AwardMeritView,
+    BatchAwardMeritView,
+    ChildrenRewardsView,
+    LeaderboardStandingView,
+    LeaderboardView,
+    StarTotalsView,
+    StudentRewardsView,
+)
 
 app_name = 'rewards'
 
 urlpatterns = [
     path('award/', AwardMeritView.as_view(), name='award-merit'),
+    path('award/batch/', BatchAwardMeritView.as_view(), name='award-merit-batch'),
     path('student/<int:student_id>/', StudentRewardsView.as_view(), name='student-rewards'),
+    path('student/<int:student_id>/totals/', StarTotalsView.as_view(), name='student-star-totals'),
+    path('children/', ChildrenRewardsView.as_view(), name='children-rewards'),
     path('leaderboard/', LeaderboardView.as_view(), name='leaderboard'),
+    path('leaderboard/standing/', LeaderboardStandingView.as_view(), name='leaderboard-standing'),
 ]
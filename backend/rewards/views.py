@@ -1,12 +1,22 @@
+from datetime import timedelta
+
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from django.db.models import F
+from django.db import transaction
+from django.db.models import F, Prefetch
+from django.utils import timezone
+from django.utils.dateparse import parse_date
 
-from .serializers import AwardMeritSerializer, MeritSerializer
+from . import leaderboard
+from .serializers import AwardMeritSerializer, BatchAwardMeritSerializer, MeritBatchSerializer, MeritSerializer
 from .models import Merit
+from .services import PERIODS, IdempotencyKeyReused, award_merits, star_totals, stars_as_of
+from learning.models import Registration
+from learning.session_models import VoiceAttendance
 from users.models import Student
 from users.serializers import StudentSerializer
+from core.pagination import KeysetPagination
 from core.permissions import IsAdminOrLecturer
 
 class AwardMeritView(generics.CreateAPIView):
@@ -21,13 +31,73 @@ class AwardMeritView(generics.CreateAPIView):
         merit = serializer.save(awarded_by=self.request.user)
         student = merit.student
         Student.objects.filter(pk=student.pk).update(stars=F('stars') + merit.stars)
+        transaction.on_commit(lambda: leaderboard.sync_stars([student.pk]))
+
+
+class BatchAwardMeritView(APIView):
+    """
+    Awards the same stars to many students at once: an explicit ``students``
+    list, everyone registered for a ``unit`` in ``academic_year``/``trimester``,
+    or everyone marked present at a ``session``.
+
+    Clients may send an ``Idempotency-Key`` header (or ``idempotency_key`` in the
+    body); retrying with the same key returns the original batch with 200
+    instead of awarding the stars twice. Keys are scoped to the awarder, and
+    reusing one for a different award is rejected with 422.
+    """
+    permission_classes = [permissions.IsAuthenticated, IsAdminOrLecturer]
+
+    def post(self, request):
+        idempotency_key = request.headers.get('Idempotency-Key')
+        if idempotency_key and len(idempotency_key) > 64:
+            return Response({'detail': 'Idempotency-Key must be at most 64 characters.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = BatchAwardMeritSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        idempotency_key = idempotency_key or data.get('idempotency_key')
+
+        if data.get('students'):
+            student_ids = data['students']
+        elif data.get('unit'):
+            student_ids = (
+                Registration.objects.filter(
+                    unit_id=data['unit'],
+                    academic_year=data['academic_year'],
+                    trimester=data['trimester'],
+                )
+                .exclude(status=Registration.Status.REJECTED)
+                .values_list('student_id', flat=True)
+            )
+        else:
+            student_ids = VoiceAttendance.objects.filter(session_id=data['session']).values_list('student_id', flat=True)
+
+        try:
+            batch, created = award_merits(
+                student_ids, data['stars'], data['reason'], request.user, idempotency_key=idempotency_key
+            )
+        except IdempotencyKeyReused as exc:
+            return Response({'detail': str(exc)}, status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+        if not created:
+            return self._replay(batch)
+        return Response(MeritBatchSerializer(batch).data, status=status.HTTP_201_CREATED)
+
+    def _replay(self, batch):
+        response = Response(MeritBatchSerializer(batch).data, status=status.HTTP_200_OK)
+        response['Idempotent-Replayed'] = 'true'
+        return response
 
 
 class StudentRewardsView(APIView):
     """
     Retrieves a student's total stars and their reward history.
+
+    ``history`` is keyset-paginated newest first (follow ``next``/``previous``,
+    ``page_size`` up to 200). With ``as_of=YYYY-MM-DD`` ``stars`` is the total
+    awarded up to that day, read from the nightly snapshots.
     """
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
 
     def get(self, request, student_id):
         try:
@@ -42,22 +112,174 @@ class StudentRewardsView(APIView):
             if not is_parent:
                 return Response({"error": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
 
-        merits = Merit.objects.filter(student=student).order_by('-created_at')
-        student_data = StudentSerializer(student).data
-        merits_data = MeritSerializer(merits, many=True).data
+        as_of = request.query_params.get('as_of')
+        if as_of:
+            day = parse_date(as_of)
+            if day is None:
+                return Response({'detail': 'as_of must be a date (YYYY-MM-DD).'}, status=status.HTTP_400_BAD_REQUEST)
+            stars = stars_as_of([student.pk], day)[student.pk]
+        else:
+            stars = student.stars
+
+        paginator = self.pagination_class()
+        merits = Merit.objects.filter(student=student).select_related('awarded_by')
+        page = paginator.paginate_queryset(merits, request, view=self)
+
+        return Response({
+            "stars": stars,
+            "history": MeritSerializer(page, many=True).data,
+            "next": paginator.get_next_link(),
+            "previous": paginator.get_previous_link(),
+        })
+
+
+class StarTotalsView(APIView):
+    """
+    Stars a student was awarded per ``period`` (week or month) between
+    ``start`` and ``end`` (default: the last 90 days), summed from the
+    nightly snapshots rather than the merit history.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    staff_roles = {'lecturer', 'hod', 'records', 'admin', 'superadmin'}
+
+    def get(self, request, student_id):
+        user = request.user
+        if student_id != user.id and not (user.is_staff or user.role in self.staff_roles):
+            is_parent = hasattr(user, 'guardian_profile') and user.guardian_profile.linked_students.filter(student_id=student_id).exists()
+            if not is_parent:
+                return Response({"error": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
+        if not Student.objects.filter(pk=student_id).exists():
+            return Response({"error": "Student not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        params = request.query_params
+        period = params.get('period', 'week')
+        if period not in PERIODS:
+            return Response({'detail': f"period must be one of: {', '.join(PERIODS)}."}, status=status.HTTP_400_BAD_REQUEST)
+        end = parse_date(params['end']) if params.get('end') else timezone.localdate()
+        start = parse_date(params['start']) if params.get('start') else end - timedelta(days=90)
+        if start is None or end is None or start > end:
+            return Response({'detail': 'start and end must be dates (YYYY-MM-DD), start first.'}, status=status.HTTP_400_BAD_REQUEST)
 
         return Response({
-            "stars": student_data['stars'],
-            "history": merits_data
+            "student": student_id,
+            "period": period,
+            "start": start,
+            "end": end,
+            "totals": star_totals(student_id, period, start, end),
         })
 
 
-class LeaderboardView(generics.ListAPIView):
+class ChildrenRewardsView(APIView):
+    """
+    Stars and recent merits for every student linked to the requesting
+    parent, in one response: the students, their latest ``recent`` merits
+    (default 5, at most 50) and, with ``as_of``, snapshot totals are each
+    loaded with a single query however many children there are.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        guardian = getattr(request.user, 'guardian_profile', None)
+        if guardian is None:
+            return Response({"error": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
+
+        params = request.query_params
+        try:
+            recent = min(int(params.get('recent', 5)), 50)
+        except ValueError:
+            return Response({'detail': 'recent must be an integer.'}, status=status.HTTP_400_BAD_REQUEST)
+        day = None
+        if params.get('as_of'):
+            day = parse_date(params['as_of'])
+            if day is None:
+                return Response({'detail': 'as_of must be a date (YYYY-MM-DD).'}, status=status.HTTP_400_BAD_REQUEST)
+
+        recent_merits = Merit.objects.select_related('awarded_by').order_by('-created_at', '-pk')[:recent]
+        children = list(
+            Student.objects.filter(parent_links__parent=guardian)
+            .select_related('user')
+            .prefetch_related(Prefetch('merits', queryset=recent_merits, to_attr='recent_merits'))
+            .order_by('pk')
+        )
+        as_of = stars_as_of([child.pk for child in children], day) if day else {}
+
+        return Response([
+            {
+                "student": child.pk,
+                "display_name": child.user.display_name,
+                "stars": as_of.get(child.pk, child.stars),
+                "recent_merits": MeritSerializer(child.recent_merits, many=True).data,
+            }
+            for child in children
+        ])
+
+
+class LeaderboardView(APIView):
     """
     Shows a leaderboard of students with the most stars.
+    Optional ``programme`` narrows it to one programme; ``limit`` defaults to 10.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        try:
+            programme_id = _optional_int(request.query_params.get('programme'))
+            limit = min(int(request.query_params.get('limit', 10)), 100)
+        except ValueError:
+            return Response({'detail': 'programme and limit must be integers.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        entries = leaderboard.top(leaderboard.stars_board(programme_id), limit)
+        students = Student.objects.select_related('user').in_bulk([entry['student_id'] for entry in entries])
+        data = []
+        for entry in entries:
+            student = students.get(entry['student_id'])
+            if student is not None:
+                data.append({**StudentSerializer(student).data, 'rank': entry['rank']})
+        return Response(data)
+
+
+class LeaderboardStandingView(APIView):
+    """
+    A student's rank, score and nearest neighbours on the star board, or on a
+    term's achievement-points board when ``term`` is given. Students see their
+    own standing, parents their linked students', staff anyone's.
     """
-    serializer_class = StudentSerializer
     permission_classes = [permissions.IsAuthenticated]
+    staff_roles = {'lecturer', 'hod', 'records', 'admin', 'superadmin'}
+
+    def get(self, request):
+        params = request.query_params
+        try:
+            student_id = _optional_int(params.get('student')) or request.user.id
+            programme_id = _optional_int(params.get('programme'))
+            radius = min(int(params.get('radius', 2)), 10)
+        except ValueError:
+            return Response({'detail': 'student, programme and radius must be integers.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        user = request.user
+        if student_id != user.id and not (user.is_staff or user.role in self.staff_roles):
+            is_parent = hasattr(user, 'guardian_profile') and user.guardian_profile.linked_students.filter(student_id=student_id).exists()
+            if not is_parent:
+                return Response({"error": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
+
+        student_programme = Student.objects.filter(pk=student_id).values_list('programme_id', flat=True).first()
+        if student_programme is None and not Student.objects.filter(pk=student_id).exists():
+            return Response({"error": "Student not found"}, status=status.HTTP_404_NOT_FOUND)
+        if programme_id is not None and student_programme != programme_id:
+            return Response({'detail': 'Student is not on this leaderboard.'}, status=status.HTTP_404_NOT_FOUND)
+
+        term = params.get('term')
+        board = leaderboard.term_board(term, programme_id) if term else leaderboard.stars_board(programme_id)
+        result = leaderboard.standing(board, student_id, radius=radius)
+
+        names = dict(
+            Student.objects.filter(pk__in=[entry['student_id'] for entry in result['neighbours']])
+            .values_list('pk', 'user__display_name')
+        )
+        for entry in result['neighbours']:
+            entry['display_name'] = names.get(entry['student_id'], '')
+        return Response(result)
+
 
-    def get_queryset(self):
-        return Student.objects.order_by('-stars')[:10]
\ No newline at end of file
+def _optional_int(value):
+    return int(value) if value not in (None, '') else None
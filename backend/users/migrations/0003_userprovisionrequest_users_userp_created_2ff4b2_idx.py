@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-19 08:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_student_stars'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='userprovisionrequest',
+            index=models.Index(fields=['created_at'], name='users_userp_created_2ff4b2_idx'),
+        ),
+    ]
@@ -198,6 +198,7 @@ class UserProvisionRequest(TimeStampedModel):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [models.Index(fields=["created_at"])]
         unique_together = ("username", "status")
 
     def __str__(self):
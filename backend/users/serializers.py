@@ -3,6 +3,7 @@ from django.contrib.auth.validators import UnicodeUsernameValidator
 from django.core.exceptions import ValidationError as DjangoValidationError
 from django.db import IntegrityError, transaction
 from rest_framework import serializers
+from core.serializers import SparseFieldsMixin
 # TODO: Refactor to use Programme instead of Course
 # from learning.models import Programme
 from .models import User, ParentStudentLink, UserProvisionRequest, FamilyEnrollmentIntent, Student, Guardian, Lecturer
@@ -78,7 +79,7 @@ class GuardianSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
-class StudentSerializer(serializers.ModelSerializer):
+class StudentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
 
     class Meta:
@@ -93,6 +94,8 @@ class StudentSerializer(serializers.ModelSerializer):
             'current_status',
             'stars'
         ]
+        expandable_fields = {'user': 'select'}
+        default_expand = ['user']
 
 
 class LecturerSerializer(serializers.ModelSerializer):
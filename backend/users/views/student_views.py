@@ -2,13 +2,15 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from core.mixins import SparseFieldsViewMixin
 from users.models import Student
 from users.serializers import StudentSerializer
 from learning.models import Registration, CurriculumUnit, TermOffering
 from learning.serializers import RegistrationSerializer
+from learning.services.curriculum import validate_registrations
 
 
-class StudentViewSet(viewsets.ReadOnlyModelViewSet):
+class StudentViewSet(SparseFieldsViewMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Student.objects.all()
     serializer_class = StudentSerializer
 
@@ -43,14 +45,10 @@ class StudentViewSet(viewsets.ReadOnlyModelViewSet):
             if not term_offering:
                 return Response({'detail': f'Unit {unit.code} is not offered in this term.'}, status=status.HTTP_400_BAD_REQUEST)
 
-            if unit.has_prereq and unit.prereq_unit:
-                prereq_completed = Registration.objects.filter(
-                    student=student,
-                    unit=unit.prereq_unit,
-                    status=Registration.Status.APPROVED
-                ).exists()
-                if not prereq_completed:
-                    return Response({'detail': f'Prerequisite {unit.prereq_unit.code} for unit {unit.code} not met.'}, status=status.HTTP_400_BAD_REQUEST)
+        unmet = validate_registrations((student.pk, unit.pk) for unit in units)
+        if unmet:
+            error = unmet[0]
+            return Response({'detail': f"Prerequisite {error['missing'][0]} for unit {error['unit_code']} not met."}, status=status.HTTP_400_BAD_REQUEST)
 
         registrations = []
         for unit in units:
@@ -324,7 +324,8 @@ export const NotificationProvider: React.FC<{ children: React.ReactNode }> = ({
       const threadRoute = THREAD_ROUTES[role];
       if (threadRoute) {
         try {
-          const data = await fetchThreads(token);
+          // Only the newest page can carry unseen activity.
+          const { results: data } = await fetchThreads(token);
           if (!cancelled) {
             ingestThreads(data, threadRoute);
           }
@@ -344,7 +345,7 @@ export const NotificationProvider: React.FC<{ children: React.ReactNode }> = ({
       const resourceRoute = RESOURCE_ROUTES[role];
       if (resourceRoute) {
         try {
-          const resourcesLatest = await fetchResources(token);
+          const { results: resourcesLatest } = await fetchResources(token);
           if (!cancelled) {
             ingestResources(resourcesLatest, resourceRoute);
           }
@@ -5,8 +5,7 @@ import { palette, spacing, typography } from '@theme/index';
 import { VoiceButton } from '@components/index';
 import { useAuth } from '@context/AuthContext';
 import {
-  fetchJson,
-  endpoints,
+  fetchUsers,
   type ApiUser,
   fetchProvisionRequests,
   type ApiProvisionRequest,
@@ -57,10 +56,14 @@ export const AdminUsersScreen: React.FC = () => {
   const isSuperAdmin = state.user?.role === 'superadmin';
   const canReviewRequests = ['admin', 'hod', 'superadmin'].includes(state.user?.role ?? '');
   const [users, setUsers] = useState<ApiUser[]>([]);
+  const [usersNext, setUsersNext] = useState<string | null>(null);
+  const [loadingMoreUsers, setLoadingMoreUsers] = useState(false);
   const [loading, setLoading] = useState<boolean>(true);
   const [error, setError] = useState<string | null>(null);
   const [processingId, setProcessingId] = useState<number | null>(null);
   const [requests, setRequests] = useState<ApiProvisionRequest[]>([]);
+  const [requestsNext, setRequestsNext] = useState<string | null>(null);
+  const [loadingMoreRequests, setLoadingMoreRequests] = useState(false);
   const [loadingRequests, setLoadingRequests] = useState(false);
   const [processingRequestId, setProcessingRequestId] = useState<number | null>(null);
   const [emailingRequestId, setEmailingRequestId] = useState<number | null>(null);
@@ -73,8 +76,9 @@ export const AdminUsersScreen: React.FC = () => {
     try {
       setLoading(true);
       setError(null);
-      const data = await fetchJson<ApiUser[]>(endpoints.usersList(), accessToken);
-      setUsers(data);
+      const page = await fetchUsers(accessToken);
+      setUsers(page.results);
+      setUsersNext(page.next);
     } catch (err: any) {
       console.warn('Failed to load users', err);
       setError(err?.message ?? 'Unable to load users.');
@@ -83,6 +87,23 @@ export const AdminUsersScreen: React.FC = () => {
     }
   }, [accessToken]);
 
+  const loadMoreUsers = useCallback(async () => {
+    if (!accessToken || !usersNext) {
+      return;
+    }
+    try {
+      setLoadingMoreUsers(true);
+      const page = await fetchUsers(accessToken, usersNext);
+      setUsers((prev) => [...prev, ...page.results]);
+      setUsersNext(page.next);
+    } catch (err: any) {
+      console.warn('Failed to load more users', err);
+      Alert.alert('Load failed', err?.message ?? 'Unable to load more users.');
+    } finally {
+      setLoadingMoreUsers(false);
+    }
+  }, [accessToken, usersNext]);
+
   useEffect(() => {
     loadUsers();
   }, [loadUsers]);
@@ -112,8 +133,9 @@ export const AdminUsersScreen: React.FC = () => {
     try {
       setLoadingRequests(true);
       setRequestError(null);
-      const data = await fetchProvisionRequests(accessToken);
-      setRequests(data);
+      const page = await fetchProvisionRequests(accessToken);
+      setRequests(page.results);
+      setRequestsNext(page.next);
     } catch (err: any) {
       console.warn('Failed to load provision requests', err);
       setRequestError(err?.message ?? 'Unable to load provisioning requests.');
@@ -122,6 +144,23 @@ export const AdminUsersScreen: React.FC = () => {
     }
   }, [accessToken, canReviewRequests]);
 
+  const loadMoreRequests = useCallback(async () => {
+    if (!accessToken || !requestsNext) {
+      return;
+    }
+    try {
+      setLoadingMoreRequests(true);
+      const page = await fetchProvisionRequests(accessToken, requestsNext);
+      setRequests((prev) => [...prev, ...page.results]);
+      setRequestsNext(page.next);
+    } catch (err: any) {
+      console.warn('Failed to load more provision requests', err);
+      Alert.alert('Load failed', err?.message ?? 'Unable to load more requests.');
+    } finally {
+      setLoadingMoreRequests(false);
+    }
+  }, [accessToken, requestsNext]);
+
   useEffect(() => {
     loadRequests();
   }, [loadRequests]);
@@ -330,6 +369,13 @@ export const AdminUsersScreen: React.FC = () => {
               <Text style={styles.helper}>No staff accounts found yet.</Text>
             )}
           </View>
+          {usersNext ? (
+            <VoiceButton
+              label={loadingMoreUsers ? 'Loading...' : 'Load more users'}
+              onPress={loadingMoreUsers ? undefined : loadMoreUsers}
+              accessibilityHint='Load the next page of accounts'
+            />
+          ) : null}
         </>
       )}
       {canReviewRequests ? (
@@ -398,6 +444,13 @@ export const AdminUsersScreen: React.FC = () => {
                 </View>
               ))
             )}
+            {requestsNext ? (
+              <VoiceButton
+                label={loadingMoreRequests ? 'Loading...' : 'Load more requests'}
+                onPress={loadingMoreRequests ? undefined : loadMoreRequests}
+                accessibilityHint='Load the next page of provisioning requests'
+              />
+            ) : null}
           </View>
         </>
       ) : null}
@@ -108,6 +108,8 @@ export const VoiceThreadScreen: React.FC<VoiceThreadScreenProps> = ({
   const [threads, setThreads] = useState<ApiThread[]>([]);
   const [loadingThreads, setLoadingThreads] = useState(true);
   const [threadError, setThreadError] = useState<string | null>(null);
+  const [threadsNext, setThreadsNext] = useState<string | null>(null);
+  const [loadingMoreThreads, setLoadingMoreThreads] = useState(false);
   const [selectedThreadId, setSelectedThreadId] = useState<number | null>(null);
 
   const [recordingUri, setRecordingUri] = useState<string | null>(null);
@@ -160,8 +162,10 @@ const selectedThread = useMemo(
         setLoadingThreads(true);
       }
       try {
-        const data = await fetchThreads(token);
+        const page = await fetchThreads(token);
+        const data = page.results;
         setThreads(data);
+        setThreadsNext(page.next);
         setThreadError(null);
         ingestThreads(data, notificationRoute);
         setSelectedThreadId((prev) => {
@@ -185,6 +189,23 @@ const selectedThread = useMemo(
     [ingestThreads, notificationRoute, token, params?.threadId]
   );
 
+  const loadMoreThreads = useCallback(async () => {
+    if (!token || !threadsNext) {
+      return;
+    }
+    setLoadingMoreThreads(true);
+    try {
+      const page = await fetchThreads(token, threadsNext);
+      setThreads((prev) => [...prev, ...page.results]);
+      setThreadsNext(page.next);
+    } catch (error: any) {
+      console.warn('Failed to load more threads', error);
+      setThreadError(error?.message ?? 'Unable to load more conversations.');
+    } finally {
+      setLoadingMoreThreads(false);
+    }
+  }, [threadsNext, token]);
+
   useEffect(() => {
     loadThreads(true);
   }, [loadThreads]);
@@ -389,6 +410,13 @@ const selectedThread = useMemo(
               onPress={setSelectedThreadId}
             />
           ))}
+          {threadsNext ? (
+            <VoiceButton
+              label={loadingMoreThreads ? 'Loading...' : 'Older conversations'}
+              onPress={loadingMoreThreads ? undefined : loadMoreThreads}
+              accessibilityHint='Load the next page of conversations'
+            />
+          ) : null}
         </View>
       ) : !loadingThreads ? (
         <Text style={[styles.helper, styles.sectionSpacing]}>{emptyPlaceholder}</Text>
@@ -188,7 +188,7 @@ export const SearchScreen: React.FC = () => {
     }
     setLoadingResources(true);
     try {
-      const data = await fetchResources(token);
+      const { results: data } = await fetchResources(token);
       setResources(data);
       ingestResources(data, { name: 'Search' });
       return data;
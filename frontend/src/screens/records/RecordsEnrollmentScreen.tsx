@@ -17,7 +17,8 @@ import {
   fetchCourses,
   fetchGuardianLinks,
   fetchProvisionRequests,
-  fetchUsers,
+  endpoints,
+  fetchAll,
   quickEnrollStudent,
   enrollFamily,
   type ApiCourse,
@@ -175,7 +176,8 @@ export const RecordsEnrollmentScreen: React.FC = () => {
     }
     try {
       setLoadingLists(true);
-      const data = await fetchUsers(token);
+      // The username pickers search every account, so this lookup loads all pages.
+      const data = await fetchAll<ApiUser>(endpoints.usersList(), token);
       setUsers(data);
     } catch (error: any) {
       console.warn('Failed to fetch users', error);
@@ -204,8 +206,9 @@ export const RecordsEnrollmentScreen: React.FC = () => {
     }
     try {
       setLoadingRequests(true);
-      const data = await fetchProvisionRequests(token);
-      setRequests(data);
+      // Only the most recent requests are shown here.
+      const page = await fetchProvisionRequests(token);
+      setRequests(page.results);
     } catch (error: any) {
       console.warn('Failed to fetch provision requests', error);
       Alert.alert('Unable to load requests', error?.message ?? 'Please try again.');
@@ -39,6 +39,8 @@ export const StudentLibraryScreen: React.FC = () => {
   const [resources, setResources] = useState<ApiResource[]>([]);
   const [loading, setLoading] = useState<boolean>(false);
   const [error, setError] = useState<string | null>(null);
+  const [nextPage, setNextPage] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState<boolean>(false);
   const fileHost = useMemo(() => {
     try {
       const parsed = new URL(API_BASE);
@@ -56,8 +58,9 @@ export const StudentLibraryScreen: React.FC = () => {
     try {
       setLoading(true);
       setError(null);
-      const data = await fetchResources(token);
-      setResources(data);
+      const page = await fetchResources(token);
+      setResources(page.results);
+      setNextPage(page.next);
     } catch (err: any) {
       console.warn('Failed to load library resources', err);
       setError(err?.message ?? 'Unable to load library resources.');
@@ -66,6 +69,23 @@ export const StudentLibraryScreen: React.FC = () => {
     }
   }, [token]);
 
+  const loadMore = useCallback(async () => {
+    if (!token || !nextPage) {
+      return;
+    }
+    try {
+      setLoadingMore(true);
+      const page = await fetchResources(token, nextPage);
+      setResources((prev) => [...prev, ...page.results]);
+      setNextPage(page.next);
+    } catch (err: any) {
+      console.warn('Failed to load more library resources', err);
+      Alert.alert('Load failed', err?.message ?? 'Unable to load more resources.');
+    } finally {
+      setLoadingMore(false);
+    }
+  }, [nextPage, token]);
+
   useEffect(() => {
     loadResources();
   }, [loadResources]);
@@ -179,6 +199,13 @@ export const StudentLibraryScreen: React.FC = () => {
         Browse curated materials mapped to your travel and tourism units.
       </Text>
       {content}
+      {!loading && !error && nextPage ? (
+        <VoiceButton
+          label={loadingMore ? 'Loading...' : 'Load more resources'}
+          onPress={loadingMore ? undefined : loadMore}
+          accessibilityHint='Load the next page of library materials'
+        />
+      ) : null}
     </ScrollView>
   );
 };
@@ -280,6 +280,37 @@ export const fetchJson = async <T>(url: string, token?: string): Promise<T> => {
   return response.json();
 };
 
+type Paginated<T> = {
+  next: string | null;
+  previous: string | null;
+  results: T[];
+};
+
+export type Page<T> = {
+  results: T[];
+  next: string | null;
+};
+
+// One keyset page of a list endpoint; pass `next` back in to load the following page.
+// Endpoints that opt out of pagination return a bare array, which comes back as a single page.
+export const fetchPage = async <T>(url: string, token?: string): Promise<Page<T>> => {
+  const data = await fetchJson<T[] | Paginated<T>>(url, token);
+  return Array.isArray(data) ? { results: data, next: null } : { results: data.results, next: data.next };
+};
+
+// Every row of a list endpoint, following `next` to the end. Only for small lookup lists
+// (courses, guardian links, a calendar range) that a screen genuinely needs in full.
+export const fetchAll = async <T>(url: string, token?: string): Promise<T[]> => {
+  const items: T[] = [];
+  let next: string | null = url;
+  while (next) {
+    const page: Page<T> = await fetchPage<T>(next, token);
+    items.push(...page.results);
+    next = page.next;
+  }
+  return items;
+};
+
 export const fetchCalendarEvents = (
   token: string,
   range: { from: string; to: string },
@@ -291,7 +322,7 @@ export const fetchCalendarEvents = (
     owner,
   });
   const url = `${endpoints.calendarEvents()}?${params.toString()}`;
-  return fetchJson<ApiCalendarEvent[]>(url, token);
+  return fetchAll<ApiCalendarEvent>(url, token);
 };
 
 export const fetchAssignments = (token: string, options: { unitId?: number } = {}) => {
@@ -301,7 +332,7 @@ export const fetchAssignments = (token: string, options: { unitId?: number } = {
   }
   const qs = params.toString();
   const url = qs ? `${endpoints.assignments()}?${qs}` : endpoints.assignments();
-  return fetchJson<ApiAssignmentSummary[]>(url, token);
+  return fetchAll<ApiAssignmentSummary>(url, token);
 };
 
 export const loginRequest = async ({
@@ -437,10 +468,11 @@ export type ApiThread = {
   updated_at: string;
 };
 
-export const fetchThreads = (token: string) => fetchJson<ApiThread[]>(endpoints.threads(), token);
+export const fetchThreads = (token: string, cursor?: string | null) =>
+  fetchPage<ApiThread>(cursor ?? endpoints.threads(), token);
 
-export const fetchResources = (token: string) =>
-  fetchJson<ApiResource[]>(endpoints.resources(), token);
+export const fetchResources = (token: string, cursor?: string | null) =>
+  fetchPage<ApiResource>(cursor ?? endpoints.resources(), token);
 
 export type CreateThreadPayload = {
   student: number;
@@ -467,16 +499,17 @@ export const fetchCourses = (
           }, {}),
         ).toString()}`
       : '';
-  return fetchJson<ApiCourse[]>(`${endpoints.courses()}${search}`, token);
+  return fetchAll<ApiCourse>(`${endpoints.courses()}${search}`, token);
 };
 
-export const fetchUsers = (token: string) => fetchJson<ApiUser[]>(endpoints.usersList(), token);
+export const fetchUsers = (token: string, cursor?: string | null) =>
+  fetchPage<ApiUser>(cursor ?? endpoints.usersList(), token);
 
 export const fetchGuardianLinks = (token: string) =>
-  fetchJson<ApiGuardianLink[]>(endpoints.parentLinks(), token);
+  fetchAll<ApiGuardianLink>(endpoints.parentLinks(), token);
 
-export const fetchProvisionRequests = (token: string) =>
-  fetchJson<ApiProvisionRequest[]>(endpoints.provisionRequests(), token);
+export const fetchProvisionRequests = (token: string, cursor?: string | null) =>
+  fetchPage<ApiProvisionRequest>(cursor ?? endpoints.provisionRequests(), token);
 
 export type CreateUserPayload = {
   username: string;